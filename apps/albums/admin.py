@@ -0,0 +1,32 @@
+"""
+Admin Customization For Album App.
+"""
+
+from django.contrib import admin
+
+from apps.core.models import Album
+from apps.core.pagination import EstimatedCountPaginator
+
+
+class AlbumAdmin(admin.ModelAdmin):
+    """Admin setup for albums; they are created and linked by database triggers."""
+
+    list_display = (
+        "title",
+        "created",
+        "modified",
+    )
+    search_fields = ("title",)
+    ordering = ("title",)
+    readonly_fields = ("title",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def has_add_permission(self, request) -> bool:
+        return False
+
+    def has_delete_permission(self, request, obj=None) -> bool:
+        return False
+
+
+admin.site.register(Album, AlbumAdmin)
@@ -0,0 +1,139 @@
+"""
+Collapse case and whitespace variants of album names onto one spelling per album.
+
+An album is keyed by its normalized title and primary artist, so variants are
+only merged within one artist's album.
+"""
+
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.core.cache import ARTIST_MUSICS_KEY, bump_generation, invalidate
+
+# Tracks filed under an album whose title or primary artist no longer matches their own key.
+MISFILED_SQL = """
+UPDATE core_music m SET album_id = core_album_for_title(m.album_name, m.artist_ids[1])
+FROM core_album a
+WHERE a.id = m.album_id AND m.album_id = ANY(%s::uuid[])
+  AND (a.normalized_title IS DISTINCT FROM core_normalize_album_title(m.album_name)
+       OR a.primary_artist_id IS DISTINCT FROM m.artist_ids[1])
+RETURNING m.artist_ids;
+"""
+
+# Most common whitespace-collapsed spelling among each album's tracks.
+CANONICAL_SQL = """
+SELECT a.id, a.title, s.spelling
+FROM core_album a
+INNER JOIN LATERAL (
+    SELECT mode() WITHIN GROUP (ORDER BY btrim(regexp_replace(m.album_name, '\\s+', ' ', 'g'))) AS spelling
+    FROM core_music m
+    WHERE m.album_id = a.id
+) AS s ON s.spelling IS NOT NULL
+WHERE a.id = ANY(%s::uuid[]);
+"""
+
+
+class Command(BaseCommand):
+    help = (
+        "Move tracks to the album of their title and primary artist, give every album its most common spelling, "
+        "rewrite variant album names on tracks and drop empty albums."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report variants without changing anything.")
+        parser.add_argument("--batch-size", type=int, default=1_000, help="Albums handled per transaction.")
+
+    def handle(self, *args, **options):
+        renamed = rewritten = relinked = checked = 0
+        last_id = uuid.UUID(int=0)
+
+        while True:
+            with transaction.atomic(), connection.cursor() as c:
+                c.execute("SELECT id FROM core_album WHERE id > %s ORDER BY id LIMIT %s;", [last_id, options["batch_size"]])
+                batch = [row[0] for row in c.fetchall()]
+
+                if not batch:
+                    break
+
+                if options["dry_run"]:
+                    c.execute(
+                        "SELECT count(*) FROM core_music m INNER JOIN core_album a ON a.id = m.album_id "
+                        "WHERE m.album_id = ANY(%s::uuid[]) AND (a.normalized_title IS DISTINCT FROM "
+                        "core_normalize_album_title(m.album_name) OR a.primary_artist_id IS DISTINCT FROM m.artist_ids[1]);",
+                        [batch],
+                    )
+                    misfiled = c.fetchone()[0]
+                else:
+                    c.execute(MISFILED_SQL, [batch])
+                    moved = c.fetchall()
+                    misfiled = len(moved)
+                    invalidate(ARTIST_MUSICS_KEY.format(artist_id) for row in moved for artist_id in row[0])
+
+                    if misfiled:
+                        bump_generation("core_music", "core_album")
+
+                c.execute(CANONICAL_SQL, [batch])
+                albums = c.fetchall()
+                renames = [(id, spelling) for id, title, spelling in albums if title != spelling]
+
+                c.execute(
+                    "SELECT count(*) FROM core_music m INNER JOIN core_album a ON a.id = m.album_id "
+                    "WHERE m.album_id = ANY(%s::uuid[]) AND m.album_name IS DISTINCT FROM a.title;",
+                    [batch],
+                )
+                variants = c.fetchone()[0]
+
+                if not options["dry_run"]:
+                    if renames:
+                        c.execute(
+                            "UPDATE core_album a SET title = r.title, modified = now() "
+                            "FROM unnest(%s::uuid[], %s::varchar[]) AS r(id, title) WHERE a.id = r.id;",
+                            [[id for id, _ in renames], [spelling for _, spelling in renames]],
+                        )
+
+                    # The album trigger maps the new spelling back to the same album.
+                    c.execute(
+                        "UPDATE core_music m SET album_name = a.title, modified = now() FROM core_album a "
+                        "WHERE a.id = m.album_id AND m.album_id = ANY(%s::uuid[]) AND m.album_name IS DISTINCT FROM a.title "
+                        "RETURNING m.artist_ids;",
+                        [batch],
+                    )
+                    artist_ids = {artist_id for row in c.fetchall() for artist_id in row[0]}
+                    invalidate(ARTIST_MUSICS_KEY.format(artist_id) for artist_id in artist_ids)
+
+                    if variants:
+                        bump_generation("core_music")
+                    if renames:
+                        bump_generation("core_album")
+
+            renamed += len(renames)
+            rewritten += variants
+            relinked += misfiled
+            checked += len(batch)
+            last_id = batch[-1]
+
+        empty_sql = "FROM core_album a WHERE NOT EXISTS (SELECT 1 FROM core_music m WHERE m.album_id = a.id);"
+
+        if options["dry_run"]:
+            with connection.cursor() as c:
+                c.execute(f"SELECT count(*) {empty_sql}")  # noqa: S608
+                empty = c.fetchone()[0]
+
+            self.stdout.write(
+                f"Checked {checked} albums: {relinked} tracks to move, {renamed} to rename, "
+                f"{rewritten} track names to rewrite, {empty} empty."
+            )
+            return
+
+        with connection.cursor() as c:
+            c.execute(f"DELETE {empty_sql}")  # noqa: S608
+            empty = c.rowcount
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {checked} albums: moved {relinked} tracks, renamed {renamed}, "
+                f"rewrote {rewritten} track names, removed {empty} empty."
+            )
+        )
@@ -0,0 +1,50 @@
+"""
+Tests For Album App.
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.core.models import Album, ArtistProfile
+
+
+@pytest.fixture
+def client(db) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(get_user_model().objects.create_user(email="album@example.com", password="Album#Test123"))
+
+    return client
+
+
+def create_music(client, title: str, album_name: str, artist: ArtistProfile):
+    response = client.post(
+        "/musics/create_music/",
+        {
+            "title": title,
+            "album_name": album_name,
+            "release_date": "2020-01-01",
+            "genre": "rock",
+            "artist_ids": [str(artist.id)],
+        },
+        format="json",
+    )
+    assert response.status_code == 201
+
+
+def test_albums_with_the_same_title_stay_apart_per_artist(client):
+    first = ArtistProfile.objects.create(name="First")
+    second = ArtistProfile.objects.create(name="Second")
+
+    create_music(client, "One", "Greatest Hits", first)
+    create_music(client, "Two", "greatest  hits", first)
+    create_music(client, "Three", "Greatest Hits", second)
+
+    albums = {album.primary_artist_id: album for album in Album.objects.all()}
+    assert set(albums) == {first.id, second.id}
+
+    response = client.get(f"/albums/{albums[first.id].id}/tracks/")
+    assert [track["title"] for track in response.data["results"]] == ["One", "Two"]
+
+    response = client.get(f"/albums/by_artist/{second.id}")
+    assert [album["id"] for album in response.data["results"]] == [albums[second.id].id]
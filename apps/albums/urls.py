@@ -0,0 +1,12 @@
+"""
+URLs For Album API.
+"""
+
+from django.urls import path
+
+from .views import get_album_tracks, get_albums_by_artist
+
+urlpatterns = [
+    path("<uuid:id>/tracks/", get_album_tracks, name="get_album_tracks"),
+    path("by_artist/<uuid:artist_id>", get_albums_by_artist, name="get_albums_by_artist"),
+]
@@ -0,0 +1,133 @@
+"""
+API Views For Album App.
+"""
+
+from django.db import connection
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from apps.core.decorators import admission_control, statement_timeout
+from apps.core.pagination import SQLPagination
+
+# Served by the index on core_music.album_id.
+ALBUM_TRACKS_SQL = (
+    "SELECT id, title, release_date, album_name, genre, artist_names AS artists FROM core_music "
+    "WHERE album_id = %s ORDER BY release_date NULLS LAST, title, id"
+)
+# Served by the index on core_album_artists.artistprofile_id.
+ARTIST_ALBUMS_SQL = (
+    "SELECT a.id, a.title, (SELECT count(*) FROM core_music m WHERE m.album_id = a.id) AS tracks "
+    "FROM core_album_artists aa INNER JOIN core_album a ON a.id = aa.album_id "
+    "WHERE aa.artistprofile_id = %s ORDER BY a.title, a.id"
+)
+
+
+@extend_schema(
+    operation_id="get_album_tracks",
+    parameters=[
+        OpenApiParameter("id", OpenApiTypes.UUID, OpenApiParameter.PATH),
+    ],
+    responses={
+        (200, "application/json"): {
+            "example": {
+                "count": 2,
+                "next": None,
+                "previous": None,
+                "album": {"id": "21321-dsa123-1d1d13-54ts34", "title": "Album 1"},
+                "results": [
+                    {
+                        "id": "21321-dsa123-1d1d13-54ts34",
+                        "title": "Music",
+                        "release_date": 1987,
+                        "album_name": "Album 1",
+                        "genre": "rnb",
+                        "artists": ["Artist 1"],
+                    },
+                    {
+                        "id": "21321-dsa123-1d1d13-54ts34",
+                        "title": "Another Music",
+                        "release_date": 1987,
+                        "album_name": "album 1",
+                        "genre": "rnb",
+                        "artists": ["Artist 1", "Artist 2"],
+                    },
+                ],
+            }
+        },
+        (404, "application/json"): {"example": {"message": "Album not found."}},
+        (405, "application/json"): {"example": {"message": "Invalid request method."}},
+    },
+)
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@admission_control("search")
+@statement_timeout("read")
+def get_album_tracks(request: Request, id: str):
+    """Get the tracks of an album page by page."""
+
+    if request.method == "GET":
+        paginator = SQLPagination()
+
+        with connection.cursor() as c:
+            c.execute("SELECT id, title FROM core_album WHERE id = %s;", [id])
+            album = c.fetchone()
+
+            if album is None:
+                return Response({"message": "Album not found."}, status=status.HTTP_404_NOT_FOUND)
+
+            page = paginator.paginate_sql(request, c, ALBUM_TRACKS_SQL, [id])
+
+        response = paginator.get_paginated_response(page)
+        response.data["album"] = {"id": album[0], "title": album[1]}
+
+        return response
+
+    return Response(
+        {"message": "Invaid request method."},
+        status=status.HTTP_405_METHOD_NOT_ALLOWED,
+    )
+
+
+@extend_schema(
+    operation_id="get_albums_by_artist",
+    parameters=[
+        OpenApiParameter("artist_id", OpenApiTypes.UUID, OpenApiParameter.PATH),
+    ],
+    responses={
+        (200, "application/json"): {
+            "example": {
+                "count": 2,
+                "next": None,
+                "previous": None,
+                "results": [
+                    {"id": "21321-dsa123-1d1d13-54ts34", "title": "Album 1", "tracks": 12},
+                    {"id": "21321-dsa123-1d1d13-54ts34", "title": "Album 2", "tracks": 9},
+                ],
+            }
+        },
+        (405, "application/json"): {"example": {"message": "Invalid request method."}},
+    },
+)
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@admission_control("search")
+@statement_timeout("read")
+def get_albums_by_artist(request: Request, artist_id: str):
+    """Get the albums an artist has tracks on, page by page."""
+
+    if request.method == "GET":
+        paginator = SQLPagination()
+
+        with connection.cursor() as c:
+            page = paginator.paginate_sql(request, c, ARTIST_ALBUMS_SQL, [artist_id])
+
+        return paginator.get_paginated_response(page)
+
+    return Response(
+        {"message": "Invaid request method."},
+        status=status.HTTP_405_METHOD_NOT_ALLOWED,
+    )
@@ -5,6 +5,7 @@ Admin Customization For Artist Profile App.
 from django.contrib import admin
 
 from apps.core.models import ArtistProfile
+from apps.core.pagination import EstimatedCountPaginator
 
 
 class ArtistProfileAdmin(admin.ModelAdmin):
@@ -23,6 +24,8 @@ class ArtistProfileAdmin(admin.ModelAdmin):
     search_fields = ("name",)
     ordering = ("name",)
     list_filter = ("gender", "first_release_year")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 admin.site.register(ArtistProfile, ArtistProfileAdmin)
@@ -0,0 +1,58 @@
+"""
+Background Jobs For Artist Profiles.
+"""
+
+from django.db import connection, transaction
+
+from apps.core.cache import ARTIST_KEY, ARTIST_MUSICS_KEY, bump_generation, invalidate
+from apps.core.changes import record_tombstone
+from apps.core.models import Tombstone
+from apps.jobs.queue import register
+
+DELETE_BATCH_SIZE = 5_000
+
+
+@register("delete_artist")
+def delete_artist(payload: dict, report_progress) -> dict:
+    """Delete an artist's links in batches, then the artist itself."""
+
+    artist_id = payload["artist_id"]
+
+    with connection.cursor() as c:
+        c.execute("SELECT count(*) FROM core_music_artists WHERE artistprofile_id = %s;", [artist_id])
+        total = c.fetchone()[0]
+
+    deleted = 0
+    while True:
+        # Each batch commits on its own so no lock is held for the whole delete.
+        with transaction.atomic(using=connection.alias), connection.cursor() as c:
+            c.execute(
+                "DELETE FROM core_music_artists WHERE id IN (SELECT id FROM core_music_artists WHERE artistprofile_id = %s LIMIT %s);",
+                [artist_id, DELETE_BATCH_SIZE],
+            )
+            batch = c.rowcount
+
+        if not batch:
+            break
+
+        deleted += batch
+        report_progress(deleted * 99 // total if total else 99)
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as c:
+        c.execute(
+            "DELETE FROM core_music_artists WHERE artistprofile_id = %s;",
+            [artist_id],
+        )
+        deleted += c.rowcount
+
+        c.execute(
+            "DELETE FROM core_artistprofile WHERE id = %s;",
+            [artist_id],
+        )
+        artist_deleted = c.rowcount == 1
+        if artist_deleted:
+            record_tombstone(c, Tombstone.KIND_CHOICES.artist, artist_id)
+        invalidate([ARTIST_KEY.format(artist_id), ARTIST_MUSICS_KEY.format(artist_id)])
+        bump_generation("core_artistprofile", "core_music_artists")
+
+    return {"artist_id": artist_id, "deleted": artist_deleted, "links_deleted": deleted}
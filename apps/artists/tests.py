@@ -0,0 +1,32 @@
+"""
+Tests For Artist App.
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.core.models import ArtistProfile
+
+
+@pytest.fixture
+def client(db) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(get_user_model().objects.create_user(email="artist@example.com", password="Artist#Test123"))
+
+    return client
+
+
+def test_bulk_update_reports_malformed_date_per_row(client):
+    good = ArtistProfile.objects.create(name="Good")
+    bad = ArtistProfile.objects.create(name="Bad")
+
+    response = client.patch(
+        "/artists/bulk/",
+        [{"id": str(good.id), "address": "Kathmandu"}, {"id": str(bad.id), "date_of_birth": "31/02/1990"}],
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert response.data["updated"] == 1
+    assert {row["id"]: row["status"] for row in response.data["results"]} == {str(good.id): "updated", str(bad.id): "invalid"}
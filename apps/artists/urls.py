@@ -4,12 +4,24 @@ URLs For Artist Profile.
 
 from django.urls import path
 
-from .views import create_artist, delete_artist, get_artist, get_artists, update_artist
+from .views import (
+    bulk_update_artists,
+    create_artist,
+    delete_artist,
+    get_artist,
+    get_artist_changes,
+    get_artist_discography,
+    get_artists,
+    update_artist,
+)
 
 urlpatterns = [
     path("", get_artists, name="get_artists"),
+    path("changes/", get_artist_changes, name="get_artist_changes"),
     path("<uuid:id>/", get_artist, name="get_artist"),
+    path("<uuid:id>/discography/", get_artist_discography, name="get_artist_discography"),
     path("create_artist/", create_artist, name="create_artist"),
     path("update_artist/<uuid:id>/", update_artist, name="update_artist"),
+    path("bulk/", bulk_update_artists, name="bulk_update_artists"),
     path("delete_artist/<uuid:id>/", delete_artist, name="delete_artist"),
 ]
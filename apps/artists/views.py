@@ -2,18 +2,106 @@
 Artist Profile Views.
 """
 
-import uuid
-
+from django.conf import settings
 from django.db import connection, transaction
+from django.http import HttpResponse
 from django.utils import timezone
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from rest_framework import permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from apps.core.cache import (
+    ARTIST_DISCOGRAPHY_KEY,
+    ARTIST_KEY,
+    ARTIST_MUSICS_KEY,
+    bump_generation,
+    cached_list_page,
+    generations,
+    get_or_compute,
+    invalidate,
+)
+from apps.core.changes import change_feed, record_tombstone
+from apps.core.decorators import admission_control, statement_timeout
+from apps.core.models import Tombstone
+from apps.core.queries import (
+    BULK_UPDATE_MAX_ROWS,
+    build_partial_update,
+    finish_bulk_results,
+    prepare_bulk_updates,
+    provided_fields,
+    run_bulk_update,
+)
+from apps.core.utils import uuid7
 from apps.core.validations import date_validation, integer_validation
+from apps.jobs.queue import enqueue
+
+ARTIST_COLUMN_TYPES = {
+    "name": "varchar",
+    "first_release_year": "integer",
+    "no_of_albums_released": "integer",
+    "date_of_birth": "timestamptz",
+    "gender": "varchar",
+    "address": "varchar",
+}
+ARTIST_COLUMNS = tuple(ARTIST_COLUMN_TYPES)
+# Tables the discography reads; their generations are part of its cache key.
+DISCOGRAPHY_TABLES = ("core_music", "core_artistprofile", "core_album")
+# Tracks grouped by album and release year, built into one JSON document by Postgres.
+DISCOGRAPHY_SQL = """
+WITH tracks AS (
+    SELECT id, title, release_date, genre, album_id, artist_ids, artist_names, EXTRACT(YEAR FROM release_date)::int AS year
+    FROM core_music
+    WHERE artist_ids @> ARRAY[%(id)s]::uuid[]
+),
+groups AS (
+    SELECT album_id, year, count(*) AS tracks,
+        json_agg(
+            json_build_object('id', id, 'title', title, 'release_date', release_date, 'genre', genre)
+            ORDER BY release_date, title, id
+        ) AS musics
+    FROM tracks
+    GROUP BY album_id, year
+),
+collaborators AS (
+    SELECT t.album_id, t.year, x.id, max(x.name) AS name, count(*) AS tracks
+    FROM tracks t, unnest(t.artist_ids, t.artist_names) AS x(id, name)
+    WHERE x.id <> %(id)s::uuid
+    GROUP BY t.album_id, t.year, x.id
+)
+SELECT json_build_object(
+    'artist', json_build_object('id', a.id, 'name', a.name),
+    'tracks', (SELECT count(*) FROM tracks),
+    'groups', COALESCE((
+        SELECT json_agg(
+            json_build_object(
+                'album', CASE WHEN al.id IS NOT NULL THEN json_build_object('id', al.id, 'title', al.title) END,
+                'year', g.year,
+                'tracks', g.tracks,
+                'collaborators', COALESCE(c.collaborators, '[]'),
+                'musics', g.musics
+            )
+            ORDER BY g.year NULLS LAST, al.title NULLS LAST
+        )
+        FROM groups g
+        LEFT JOIN core_album al ON al.id = g.album_id
+        LEFT JOIN LATERAL (
+            SELECT json_agg(json_build_object('id', c.id, 'name', c.name, 'tracks', c.tracks) ORDER BY c.tracks DESC, c.name) AS collaborators
+            FROM collaborators c
+            WHERE c.album_id IS NOT DISTINCT FROM g.album_id AND c.year IS NOT DISTINCT FROM g.year
+        ) AS c ON true
+    ), '[]')
+)::text
+FROM core_artistprofile a
+WHERE a.id = %(id)s;
+"""
+ARTIST_RETURNING = ("id", *ARTIST_COLUMNS)
+ARTIST_CHANGE_COLUMNS = (
+    "id, name, first_release_year, no_of_albums_released, DATE(date_of_birth) as date_of_birth, gender, address, modified"
+)
 
 
 class ArtistsPagination(PageNumberPagination):
@@ -22,6 +110,20 @@ class ArtistsPagination(PageNumberPagination):
     max_page_size = 100
 
 
+def fetch_artists() -> list[dict]:
+    """Read every artist from the database."""
+
+    with connection.cursor() as c:
+        c.execute(
+            "SELECT id, name, first_release_year, no_of_albums_released, DATE(date_of_birth) as date_of_birth, gender, address FROM core_artistprofile;"
+        )
+
+        columns = [col[0] for col in c.description]
+        artist_data = c.fetchall()
+
+    return [dict(zip(columns, row)) for row in artist_data]
+
+
 @extend_schema(
     operation_id="get_artists",
     responses={
@@ -57,24 +159,20 @@ class ArtistsPagination(PageNumberPagination):
 )
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("search")
+@statement_timeout("read")
 def get_artists(request: Request):
     """Get all artists."""
     paginator = ArtistsPagination()
 
     if request.method == "GET":
-        with connection.cursor() as c:
-            c.execute(
-                "SELECT id, name, first_release_year, no_of_albums_released, DATE(date_of_birth) as date_of_birth, gender, address FROM core_artistprofile;"
-            )
 
-            columns = [col[0] for col in c.description]
-            artist_data = c.fetchall()
+        def render():
+            page = paginator.paginate_queryset(fetch_artists(), request)
 
-        result = [dict(zip(columns, row)) for row in artist_data]
+            return paginator.get_paginated_response(page).data
 
-        page = paginator.paginate_queryset(result, request)
-
-        return paginator.get_paginated_response(page)
+        return Response(cached_list_page(request, "artists", ("core_artistprofile",), render))
 
     return Response(
         {"message": "Invaid request method."},
@@ -82,6 +180,20 @@ def get_artists(request: Request):
     )
 
 
+def fetch_artist(id: str) -> dict | None:
+    """Read one artist from the database."""
+
+    with connection.cursor() as c:
+        c.execute(
+            "SELECT id, name, first_release_year, no_of_albums_released, DATE(date_of_birth) as date_of_birth, gender, address FROM core_artistprofile WHERE id = %s;",
+            [id],
+        )
+        columns = [col[0] for col in c.description]
+        row = c.fetchone()
+
+    return dict(zip(columns, row)) if row else None
+
+
 @extend_schema(
     operation_id="get_artist",
     responses={
@@ -105,22 +217,93 @@ def get_artists(request: Request):
 )
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("crud")
+@statement_timeout("read")
 def get_artist(request: Request, id: str):
     """Get artist with id."""
 
     if request.method == "GET":
-        with connection.cursor() as c:
-            c.execute(
-                "SELECT id, name, first_release_year, no_of_albums_released, DATE(date_of_birth) as date_of_birth, gender, address FROM core_artistprofile WHERE id = %s;",
-                [id],
-            )
+        artist = get_or_compute(ARTIST_KEY.format(id), lambda: fetch_artist(id), settings.RECORD_CACHE_TIMEOUT, "artist")
+
+        if not artist:
+            return Response({"message": "Artist not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(artist)
+
+    return Response(
+        {"message": "Invaid request method."},
+        status=status.HTTP_405_METHOD_NOT_ALLOWED,
+    )
+
+
+def fetch_discography(id: str) -> str | None:
+    """Read an artist's discography as a JSON document, without building it in Python."""
+
+    with connection.cursor() as c:
+        c.execute(DISCOGRAPHY_SQL, {"id": id})
+        row = c.fetchone()
+
+    return row[0] if row else None
+
+
+@extend_schema(
+    operation_id="get_artist_discography",
+    parameters=[
+        OpenApiParameter("id", OpenApiTypes.UUID, OpenApiParameter.PATH),
+    ],
+    responses={
+        (200, "application/json"): {
+            "example": {
+                "artist": {"id": "21321-dsa123-1d1d13-54ts34", "name": "Artist"},
+                "tracks": 2,
+                "groups": [
+                    {
+                        "album": {"id": "21321-dsa123-1d1d13-54ts34", "title": "Album 1"},
+                        "year": 1987,
+                        "tracks": 2,
+                        "collaborators": [{"id": "46512q-8q8qf4-845aq3-q4d021", "name": "Artist 2", "tracks": 1}],
+                        "musics": [
+                            {
+                                "id": "21321-dsa123-1d1d13-54ts34",
+                                "title": "Music",
+                                "release_date": "1987-05-01T00:00:00+00:00",
+                                "genre": "rnb",
+                            },
+                            {
+                                "id": "21321-dsa123-1d1d13-54ts34",
+                                "title": "Another Music",
+                                "release_date": "1987-05-01T00:00:00+00:00",
+                                "genre": "rnb",
+                            },
+                        ],
+                    },
+                ],
+            }
+        },
+        (404, "application/json"): {"example": {"message": "Artist not found."}},
+        (405, "application/json"): {"example": {"message": "Invalid request method."}},
+    },
+)
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@admission_control("search")
+@statement_timeout("read")
+def get_artist_discography(request: Request, id: str):
+    """Get an artist's tracks grouped by album and year, with counts and collaborators."""
 
-            columns = [col[0] for col in c.description]
-            artist_data = c.fetchall()
+    if request.method == "GET":
+        discography = get_or_compute(
+            ARTIST_DISCOGRAPHY_KEY.format(generations(DISCOGRAPHY_TABLES), id),
+            lambda: fetch_discography(id),
+            settings.DISCOGRAPHY_CACHE_TIMEOUT,
+            "artist_discography",
+        )
 
-        result = [dict(zip(columns, row)) for row in artist_data]
+        if discography is None:
+            return Response({"message": "Artist not found."}, status=status.HTTP_404_NOT_FOUND)
 
-        return Response(result[0])
+        # Already JSON; skip DRF's parse-and-render round trip.
+        return HttpResponse(discography, content_type="application/json")
 
     return Response(
         {"message": "Invaid request method."},
@@ -161,12 +344,14 @@ def get_artist(request: Request, id: str):
 )
 @api_view(["POST"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("crud")
+@statement_timeout("write")
 def create_artist(request: Request):
     """Add new artist."""
     if request.method == "POST":
         try:
             data = request.data
-            id = str(uuid.uuid4())
+            id = str(uuid7())
             name = data.get("name")
             first_release_year = int(data.get("first_release_year"))
             no_of_albums_released = int(data.get("no_of_albums_released"))
@@ -204,6 +389,7 @@ def create_artist(request: Request):
                 )
 
                 created_artist = c.fetchone()
+                bump_generation("core_artistprofile")
 
             if created_artist:
                 (
@@ -271,107 +457,155 @@ def create_artist(request: Request):
             }
         },
         (400, "application/json"): {"example": {"message": "Failed to update artist."}},
+        (404, "application/json"): {"example": {"message": "Artist not found."}},
     },
 )
 @api_view(["PUT", "PATCH"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("crud")
+@statement_timeout("write")
 def update_artist(request: Request, id: str):
     """Update existing artist."""
 
     if request.method == "PUT" or request.method == "PATCH":
         try:
             data = request.data
-            name = data.get("name")
-            first_release_year = data.get("first_release_year")
-            no_of_albums_released = data.get("no_of_albums_released")
-            date_of_birth = data.get("date_of_birth")
-            gender = data.get("gender")
-            address = data.get("address")
-            modified = timezone.now()
+            fields = provided_fields(data, ARTIST_COLUMNS)
+            first_release_year = fields.get("first_release_year")
+            no_of_albums_released = fields.get("no_of_albums_released")
+            date_of_birth = fields.get("date_of_birth")
+
+            # Validate integers
+            if first_release_year and not integer_validation(first_release_year):
+                return Response({"message": "Please enter a valid release year"})
+
+            if no_of_albums_released and not integer_validation(no_of_albums_released):
+                return Response({"message": "Please enter a valid number of albums released."})
+
+            # Validate date of birth
+            if date_of_birth and not date_validation(date_of_birth):
+                return Response({"message": "Date of birth must not be greater than present date."})
+
+            sql, params = build_partial_update("core_artistprofile", id, fields, ARTIST_RETURNING)
 
             with connection.cursor() as c:
-                # Validate integers
-                if first_release_year and not integer_validation(first_release_year):
-                    return Response({"message": "Please enter a valid release year"})
+                c.execute(sql, params)
+                updated_artist = c.fetchone()
 
-                if no_of_albums_released and not integer_validation(no_of_albums_released):
-                    return Response({"message": "Please enter a valid number of albums released."})
+            if not updated_artist:
+                return Response({"message": "Artist not found."}, status=status.HTTP_404_NOT_FOUND)
+
+            invalidate([ARTIST_KEY.format(id)])
+            bump_generation("core_artistprofile")
+
+            (
+                id,
+                name,
+                first_release_year,
+                no_of_albums_released,
+                date_of_birth,
+                gender,
+                address,
+            ) = updated_artist
+
+            return Response(
+                {
+                    "message": "Artist updated successfully",
+                    "artist": {
+                        "id": id,
+                        "name": name,
+                        "first_release_year": first_release_year,
+                        "no_of_albums_released": no_of_albums_released,
+                        "date_of_birth": date_of_birth,
+                        "gender": gender,
+                        "address": address,
+                    },
+                }
+            )
+        except Exception as e:
+            return Response({"message": str(e)})
 
-                # Validate date of birth
-                if date_of_birth and not date_validation(date_of_birth):
-                    return Response({"message": "Date of birth must not be greater than present date."})
+    return Response(
+        {"message": "Invaid request method."},
+        status=status.HTTP_405_METHOD_NOT_ALLOWED,
+    )
 
-                # Get stored data
-                c.execute(
-                    "SELECT name, first_release_year, no_of_albums_released, date_of_birth, gender, address FROM core_artistprofile WHERE id = %s;",
-                    [id],
-                )
-                artist_data = c.fetchone()
-
-                if artist_data:
-                    (
-                        stored_name,
-                        stored_first_release_year,
-                        stored_no_of_albums_released,
-                        stored_date_of_birth,
-                        stored_gender,
-                        stored_address,
-                    ) = artist_data
-
-                    new_name = name if name else stored_name
-                    new_first_release_year = first_release_year if first_release_year else stored_first_release_year
-                    new_no_of_albums_released = (
-                        no_of_albums_released if no_of_albums_released else stored_no_of_albums_released
-                    )
-                    new_date_of_birth = date_of_birth if date_of_birth else stored_date_of_birth
-                    new_gender = gender if gender else stored_gender
-                    new_address = address if address else stored_address
 
-                c.execute(
-                    "UPDATE core_artistprofile SET name = %s, first_release_year = %s, no_of_albums_released = %s, date_of_birth = %s, gender = %s, address = %s, modified = %s WHERE id = %s RETURNING id, name, first_release_year, no_of_albums_released, date_of_birth, gender, address;",
-                    [
-                        new_name,
-                        new_first_release_year,
-                        new_no_of_albums_released,
-                        new_date_of_birth,
-                        new_gender,
-                        new_address,
-                        modified,
-                        id,
-                    ],
-                )
+def validate_artist_fields(fields: dict) -> str | None:
+    """Return an error message for invalid artist fields."""
 
-                updated_artist = c.fetchone()
+    try:
+        if "first_release_year" in fields and not integer_validation(fields["first_release_year"]):
+            return "Please enter a valid release year"
 
-            if updated_artist:
-                (
-                    id,
-                    name,
-                    first_release_year,
-                    no_of_albums_released,
-                    date_of_birth,
-                    gender,
-                    address,
-                ) = updated_artist
+        if "no_of_albums_released" in fields and not integer_validation(fields["no_of_albums_released"]):
+            return "Please enter a valid number of albums released."
 
-                return Response(
-                    {
-                        "message": "Artist updated successfully",
-                        "artist": {
-                            "id": id,
-                            "name": name,
-                            "first_release_year": first_release_year,
-                            "no_of_albums_released": no_of_albums_released,
-                            "date_of_birth": date_of_birth,
-                            "gender": gender,
-                            "address": address,
-                        },
-                    }
-                )
+        if "date_of_birth" in fields and not date_validation(fields["date_of_birth"]):
+            return "Date of birth must not be greater than present date."
+    except (TypeError, ValueError):
+        return "Please enter valid values."
+
+    return None
+
+
+@extend_schema(
+    operation_id="bulk_update_artists",
+    request={
+        "application/json": {
+            "example": [
+                {"id": "21321-dsa123-1d1d13-54ts34", "no_of_albums_released": 26},
+                {"id": "21321-dsa123-1d1d13-54ts35", "address": "London, UK"},
+            ]
+        }
+    },
+    responses={
+        (200, "application/json"): {
+            "example": {
+                "message": "Artists updated.",
+                "updated": 1,
+                "results": [
+                    {"id": "21321-dsa123-1d1d13-54ts34", "status": "updated"},
+                    {"id": "21321-dsa123-1d1d13-54ts35", "status": "not_found"},
+                ],
+            }
+        },
+        (400, "application/json"): {"example": {"message": "Send a list of at most 10000 updates."}},
+    },
+)
+@api_view(["PATCH"])
+@permission_classes([permissions.IsAuthenticated])
+@admission_control("bulk")
+@statement_timeout("bulk")
+def bulk_update_artists(request: Request):
+    """Apply partial updates to many artists in one transaction."""
+
+    if request.method == "PATCH":
+        data = request.data
+
+        if not isinstance(data, list) or len(data) > BULK_UPDATE_MAX_ROWS:
+            return Response(
+                {"message": f"Send a list of at most {BULK_UPDATE_MAX_ROWS} updates."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results, updates = prepare_bulk_updates(data, ARTIST_COLUMNS, validate_artist_fields)
 
-            return Response({"message": "Failed to update artist"})
+        try:
+            with transaction.atomic(using=connection.alias), connection.cursor() as c:
+                updated = run_bulk_update(c, "core_artistprofile", ARTIST_COLUMN_TYPES, updates)
+                invalidate(ARTIST_KEY.format(id) for id in updated)
+                bump_generation("core_artistprofile")
         except Exception as e:
-            return Response({"message": str(e)})
+            return Response({"message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "message": "Artists updated.",
+                "updated": len(updated),
+                "results": finish_bulk_results(results, updated),
+            }
+        )
 
     return Response(
         {"message": "Invaid request method."},
@@ -381,17 +615,34 @@ def update_artist(request: Request, id: str):
 
 @extend_schema(
     request=None,
+    parameters=[
+        OpenApiParameter("background", OpenApiTypes.BOOL, OpenApiParameter.QUERY, description="Delete in a background job."),
+    ],
     responses={
         (200, "application/json"): {"example": {"message": "Artist deleted successfully"}},
+        (202, "application/json"): {
+            "example": {"message": "Artist deletion queued.", "job_id": "01a1515b-81eb-791f-96c8-f7f733d8827a"}
+        },
         (405, "application/json"): {"example": {"message": "Invalid request method"}},
     },
 )
 @api_view(["DELETE"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("bulk")
+@statement_timeout("bulk")
 def delete_artist(request: Request, id: str):
     """Delete existing artist."""
 
     if request.method == "DELETE":
+        # Artists with many links are deleted in batches by a job worker.
+        if request.query_params.get("background") in ("1", "true"):
+            job_id = enqueue("delete_artist", {"artist_id": str(id)}, user_id=request.user.id)
+
+            return Response(
+                {"message": "Artist deletion queued.", "job_id": job_id},
+                status=status.HTTP_202_ACCEPTED,
+            )
+
         with transaction.atomic(using=connection.alias), connection.cursor() as c:
             try:
                 # Delete artist record from intermediatary table.
@@ -405,6 +656,10 @@ def delete_artist(request: Request, id: str):
                     "DELETE FROM core_artistprofile WHERE id = %s;",
                     [id],
                 )
+                if c.rowcount:
+                    record_tombstone(c, Tombstone.KIND_CHOICES.artist, id)
+                invalidate([ARTIST_KEY.format(id), ARTIST_MUSICS_KEY.format(id)])
+                bump_generation("core_artistprofile", "core_music_artists")
 
                 return Response(
                     {
@@ -419,3 +674,57 @@ def delete_artist(request: Request, id: str):
         {"message": "Invaid request method."},
         status=status.HTTP_405_METHOD_NOT_ALLOWED,
     )
+
+
+@extend_schema(
+    operation_id="get_artist_changes",
+    parameters=[
+        OpenApiParameter("since", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Cursor from the previous response."),
+        OpenApiParameter("limit", OpenApiTypes.INT, OpenApiParameter.QUERY, description="Changes per page."),
+    ],
+    responses={
+        (200, "application/json"): {
+            "example": {
+                "results": [
+                    {
+                        "id": "01a1515b-7f2e-7c4a-9d61-0b6a4f1e2c33",
+                        "name": "Artist",
+                        "first_release_year": 1987,
+                        "no_of_albums_released": 25,
+                        "date_of_birth": "1965-03-12",
+                        "gender": "male",
+                        "address": "New York, USA",
+                        "modified": "2024-03-01T10:00:00.123456Z",
+                        "deleted": False,
+                    },
+                    {
+                        "id": "01a1515b-8a10-7b5e-8f0c-3d2e1a9b7c55",
+                        "modified": "2024-03-01T10:05:00.654321Z",
+                        "deleted": True,
+                    },
+                ],
+                "since": "MjAyNC0wMy0wMVQxMDowNTowMC42NTQzMjErMDA6MDB8MDFhMTUxNWItOGExMC03YjVlLThmMGMtM2QyZTFhOWI3YzU1",
+                "has_more": False,
+            }
+        },
+        (400, "application/json"): {"example": {"message": "Invalid cursor or limit."}},
+        (410, "application/json"): {"example": {"message": "Cursor expired. Sync again from the start by leaving out since."}},
+    },
+)
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@admission_control("search")
+@statement_timeout("read")
+def get_artist_changes(request: Request):
+    """List artists changed or deleted after the ``since`` cursor.
+
+    Links from musics to a deleted artist are gone as well.
+    """
+
+    if request.method == "GET":
+        return change_feed(request, "core_artistprofile", Tombstone.KIND_CHOICES.artist, ARTIST_CHANGE_COLUMNS)
+
+    return Response(
+        {"message": "Invaid request method."},
+        status=status.HTTP_405_METHOD_NOT_ALLOWED,
+    )
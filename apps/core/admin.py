@@ -7,6 +7,7 @@ from django.contrib.auth.admin import UserAdmin
 
 from .forms import CustomUserChangeForm, CustomUserCreationForm
 from .models import User
+from .pagination import EstimatedCountPaginator
 
 
 class CustomUserAdmin(UserAdmin):
@@ -64,6 +65,8 @@ class CustomUserAdmin(UserAdmin):
 
     search_fields = ("email",)
     ordering = ("email",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 admin.site.register(User, CustomUserAdmin)
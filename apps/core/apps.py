@@ -1,6 +1,17 @@
 from django.apps import AppConfig
+from django.conf import settings
 
 
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.core"
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        if settings.SLOW_QUERY_MS:
+            from django.db.backends.signals import connection_created
+
+            from .slow_queries import install_slow_query_log
+
+            connection_created.connect(install_slow_query_log)
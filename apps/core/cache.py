@@ -0,0 +1,233 @@
+"""
+Read-Through Caching With Single-Flight Misses.
+
+When a hot key expires, only one request recomputes it. Other threads in the
+same process wait for that result, and other processes wait on a lock key in
+the shared cache. Waiters that time out read from the database directly.
+
+List pages are cached per query string and per generation of the tables they
+read. Write views bump a table's generation, which moves readers to new keys.
+A page past its soft TTL is still served while one background thread refreshes it.
+
+With ``CACHE_INVALIDATION_BUS`` on, invalidations are also sent to other
+processes through apps.core.invalidation.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import close_old_connections, connection, transaction
+
+from .invalidation import ensure_listener, publish
+from .metrics import record_cache_lookup
+
+ARTIST_KEY = "artist:{}"
+ARTIST_MUSICS_KEY = "artist_musics:{}"
+ARTIST_DISCOGRAPHY_KEY = "artist_discography:{}:{}"
+GENERATION_KEY = "generation:{}"
+LIST_PAGE_KEY = "list:{}:{}:{}"
+
+MISSING = object()
+
+logger = logging.getLogger(__name__)
+
+
+class _Flight:
+    """The in-process computation of one key that other threads can wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = MISSING
+
+
+_flights: dict[str, _Flight] = {}
+_flights_lock = threading.Lock()
+
+_refresher: ThreadPoolExecutor | None = None
+_refresher_lock = threading.Lock()
+
+
+def _reset_refresher():
+    global _refresher, _refresher_lock
+
+    _refresher = None
+    _refresher_lock = threading.Lock()
+
+
+# Threads do not survive a fork, so each worker process starts its own refresh pool.
+os.register_at_fork(after_in_child=_reset_refresher)
+
+
+def get_or_compute(key: str, compute: Callable, timeout: int, name: str):
+    """Return the cached value of ``key``, letting a single caller compute it on a miss.
+
+    ``compute`` may return None; that result is cached as well.
+    """
+
+    ensure_listener()
+
+    value = cache.get(key, MISSING)
+    record_cache_lookup(name, value is not MISSING)
+
+    if value is not MISSING:
+        return value
+
+    return _single_flight(key, compute, timeout)
+
+
+def _single_flight(key: str, compute: Callable, timeout: int):
+    """Compute a missing key once per process; other threads wait for the leader."""
+
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+
+    if not leader:
+        if flight.done.wait(settings.SINGLE_FLIGHT_WAIT) and flight.value is not MISSING:
+            return flight.value
+
+        return compute()
+
+    try:
+        flight.value = _compute_once(key, compute, timeout)
+
+        return flight.value
+    finally:
+        with _flights_lock:
+            _flights.pop(key, None)
+        flight.done.set()
+
+
+def _compute_once(key: str, compute: Callable, timeout: int):
+    """Compute under a cache lock so only one process queries the database for ``key``."""
+
+    lock_key = f"{key}:lock"
+
+    if cache.add(lock_key, 1, settings.SINGLE_FLIGHT_LOCK_TIMEOUT):
+        try:
+            value = compute()
+            cache.set(key, value, timeout)
+
+            return value
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + settings.SINGLE_FLIGHT_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(settings.SINGLE_FLIGHT_POLL_INTERVAL)
+        value = cache.get(key, MISSING)
+
+        if value is not MISSING:
+            return value
+
+    return compute()
+
+
+def invalidate(keys: Iterable[str]):
+    """Drop cached keys once the current transaction commits."""
+
+    keys = list(keys)
+
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
+        publish(keys)
+
+
+def generations(tables: Iterable[str]) -> str:
+    """Current generation of each table, joined into one key fragment."""
+
+    keys = [GENERATION_KEY.format(table) for table in tables]
+    found = cache.get_many(keys)
+
+    for key in keys:
+        if key not in found:
+            # Start from the clock so an evicted counter never returns to a number already used.
+            cache.add(key, time.time_ns(), None)
+            found[key] = cache.get(key)
+
+    return ".".join(str(found[key]) for key in keys)
+
+
+def bump_generation(*tables: str):
+    """Move readers of ``tables`` to fresh list pages once the current transaction commits."""
+
+    def bump():
+        for table in tables:
+            try:
+                cache.incr(GENERATION_KEY.format(table))
+            except ValueError:
+                cache.add(GENERATION_KEY.format(table), time.time_ns(), None)
+
+    transaction.on_commit(bump)
+    # Other processes drop their counter and restart it from the clock.
+    publish(GENERATION_KEY.format(table) for table in tables)
+
+
+def cached_list_page(request, name: str, tables: Iterable[str], render: Callable) -> dict:
+    """Return the list page ``render`` builds for this request, cached with stale-while-revalidate.
+
+    Pages are fresh for ``LIST_CACHE_FRESH`` seconds and are kept for
+    ``LIST_CACHE_MAX_AGE``. In between, the stale page is returned and one
+    background refresh is started.
+    """
+
+    ensure_listener()
+
+    query = urlencode(sorted(request.query_params.lists()), doseq=True)
+    digest = hashlib.sha256(f"{request.get_host()}?{query}".encode()).hexdigest()
+    key = LIST_PAGE_KEY.format(name, generations(tables), digest)
+
+    def compute():
+        return time.time() + settings.LIST_CACHE_FRESH, render()
+
+    entry = cache.get(key, MISSING)
+
+    if entry is MISSING:
+        record_cache_lookup(name, False)
+
+        return _single_flight(key, compute, settings.LIST_CACHE_MAX_AGE)[1]
+
+    fresh_until, data = entry
+    stale = time.time() > fresh_until
+    record_cache_lookup(name, True, stale)
+
+    if stale and cache.add(f"{key}:refresh", 1, settings.SINGLE_FLIGHT_LOCK_TIMEOUT):
+        _refresh_pool().submit(_refresh, key, compute)
+
+    return data
+
+
+def _refresh_pool() -> ThreadPoolExecutor:
+    global _refresher
+
+    with _refresher_lock:
+        if _refresher is None:
+            _refresher = ThreadPoolExecutor(settings.LIST_CACHE_REFRESH_WORKERS, thread_name_prefix="list-refresh")
+
+        return _refresher
+
+
+def _refresh(key: str, compute: Callable):
+    """Recompute a stale page off the request thread, under the read statement timeout."""
+
+    try:
+        with transaction.atomic(), connection.cursor() as c:
+            c.execute("SELECT set_config('statement_timeout', %s, true);", [str(settings.STATEMENT_TIMEOUTS["read"])])
+            value = compute()
+
+        cache.set(key, value, settings.LIST_CACHE_MAX_AGE)
+    except Exception:
+        logger.exception("Refreshing cached list page %s failed.", key)
+    finally:
+        cache.delete(f"{key}:refresh")
+        close_old_connections()
@@ -0,0 +1,135 @@
+"""
+View Decorators.
+"""
+
+import threading
+from functools import wraps
+
+from django.conf import settings
+from django.db import DatabaseError, connection, transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+from .metrics import ADMISSION_REJECTIONS, STATEMENT_TIMEOUTS
+
+# SQLSTATE Postgres reports when statement_timeout cancels a query.
+QUERY_CANCELED = "57014"
+
+
+# One semaphore per endpoint class, shared by every view of that class in this process.
+_admission_slots: dict[str, threading.BoundedSemaphore] = {}
+_admission_lock = threading.Lock()
+
+
+def is_query_canceled(exc: BaseException) -> bool:
+    return getattr(exc.__cause__, "sqlstate", None) == QUERY_CANCELED
+
+
+def set_statement_timeout(timeout_ms: int):
+    """Limit the statements that follow to ``timeout_ms``.
+
+    Inside a transaction the limit is set with ``SET LOCAL`` semantics and ends
+    with it. Otherwise it is set for the session, and skipped when the
+    connection already has it, so most requests pay at most one round trip.
+    """
+
+    if connection.in_atomic_block:
+        with connection.cursor() as c:
+            c.execute("SELECT set_config('statement_timeout', %s, true);", [str(timeout_ms)])
+        return
+
+    connection.ensure_connection()
+    # Keyed by the driver connection, so a reconnect sets the limit again.
+    if getattr(connection, "statement_timeout", None) == (connection.connection, timeout_ms):
+        return
+
+    with connection.cursor() as c:
+        c.execute("SELECT set_config('statement_timeout', %s, false);", [str(timeout_ms)])
+
+    connection.statement_timeout = (connection.connection, timeout_ms)
+
+
+def statement_timeout(endpoint_class: str):
+    """Limit the view's statements to ``STATEMENT_TIMEOUTS[endpoint_class]``.
+
+    A cancelled query turns into a 503 with ``Retry-After``, even when the view
+    catches the database error itself. A database error inside one of the
+    view's transactions marks it for rollback, so it is never committed half
+    done and its on_commit callbacks are dropped.
+    """
+
+    timeout_ms = settings.STATEMENT_TIMEOUTS[endpoint_class]
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            canceled = []
+
+            def detect_errors(execute, sql, params, many, context):
+                try:
+                    return execute(sql, params, many, context)
+                except DatabaseError as exc:
+                    if is_query_canceled(exc):
+                        canceled.append(sql)
+                    if connection.in_atomic_block:
+                        transaction.set_rollback(True)
+                    raise
+
+            try:
+                with connection.execute_wrapper(detect_errors):
+                    set_statement_timeout(timeout_ms)
+                    response = view(request, *args, **kwargs)
+            except DatabaseError:
+                if not canceled:
+                    raise
+
+            if canceled:
+                STATEMENT_TIMEOUTS.labels(view.__name__, endpoint_class).inc()
+
+                return Response(
+                    {"message": "The request took too long. Please try again later."},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    headers={"Retry-After": str(settings.STATEMENT_TIMEOUT_RETRY_AFTER)},
+                )
+
+            return response
+
+        return wrapped
+
+    return decorator
+
+
+def admission_control(endpoint_class: str):
+    """Let at most ``ADMISSION_LIMITS[endpoint_class]`` requests of a class run at once in this process.
+
+    Requests wait up to ``ADMISSION_QUEUE_TIMEOUT`` seconds for a slot and are
+    then shed with a 503 and ``Retry-After``. Apply it above ``statement_timeout``
+    so waiting requests do not open a database connection.
+    """
+
+    with _admission_lock:
+        if endpoint_class not in _admission_slots:
+            _admission_slots[endpoint_class] = threading.BoundedSemaphore(settings.ADMISSION_LIMITS[endpoint_class])
+
+    slots = _admission_slots[endpoint_class]
+
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if not slots.acquire(timeout=settings.ADMISSION_QUEUE_TIMEOUT):
+                ADMISSION_REJECTIONS.labels(view.__name__, endpoint_class).inc()
+
+                return Response(
+                    {"message": "The server is busy. Please try again later."},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                    headers={"Retry-After": str(settings.ADMISSION_RETRY_AFTER)},
+                )
+
+            try:
+                return view(request, *args, **kwargs)
+            finally:
+                slots.release()
+
+        return wrapped
+
+    return decorator
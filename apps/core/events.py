@@ -0,0 +1,253 @@
+"""
+Server-Sent Events Stream Of Catalog Changes.
+
+Statement-level triggers on core_artistprofile and core_music send one
+``pg_notify`` per insert, update or delete statement. The notification lists
+the ids the statement touched, in chunks of up to 100. Postgres delivers them
+only for committed writes, whichever code path made them. Each process runs one
+listener on its own async connection and fans events out to its SSE clients.
+
+Every client has a bounded buffer. When a slow client fills it, its buffered
+events are dropped and replaced by one ``resync`` event. Statements that touch
+more than 1000 rows also send ``resync`` instead of their ids. The client should
+then catch up through the change feeds (musics/changes/, artists/changes/).
+"""
+
+import asyncio
+import json
+import logging
+from http.cookies import SimpleCookie
+from importlib import import_module
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+from psycopg import AsyncConnection, sql
+
+# Must match the channel used by the triggers in migration 0010_catalog_change_notify.
+CHANNEL = "catalog_changes"
+
+RESOURCES = {"core_artistprofile": "artist", "core_music": "music"}
+ACTIONS = {"insert": "created", "update": "updated", "delete": "deleted"}
+RESYNC = ("resync", "{}")
+
+logger = logging.getLogger(__name__)
+
+
+def format_event(name: str, data: str) -> bytes:
+    return f"event: {name}\ndata: {data}\n\n".encode()
+
+
+def to_event(payload: str) -> tuple[str, str] | None:
+    """Turn a trigger payload into an SSE event name and data."""
+
+    try:
+        change = json.loads(payload)
+        name = f"{RESOURCES[change['table']]}.{ACTIONS[change['op']]}"
+    except (ValueError, KeyError, TypeError):
+        logger.warning("Ignoring malformed catalog change %r.", payload[:200])
+        return None
+
+    # Too many rows to list; the trigger only sent a count.
+    if "ids" not in change:
+        return RESYNC
+
+    return name, json.dumps({"ids": change["ids"]})
+
+
+class Subscriber:
+    """One connected client and its bounded buffer of pending events."""
+
+    def __init__(self):
+        self.queue = asyncio.Queue(settings.EVENTS_CLIENT_BUFFER)
+
+    def put(self, event: tuple[str, str]):
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # The client cannot keep up; drop its backlog rather than grow memory or stall others.
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+
+class Broadcaster:
+    """One LISTEN connection per process, shared by every subscriber."""
+
+    def __init__(self):
+        self.subscribers: set[Subscriber] = set()
+        self.task: asyncio.Task | None = None
+
+    def subscribe(self) -> Subscriber | None:
+        if len(self.subscribers) >= settings.EVENTS_MAX_CLIENTS:
+            return None
+
+        if self.task is None or self.task.done():
+            self.task = asyncio.get_running_loop().create_task(self.listen())
+
+        subscriber = Subscriber()
+        self.subscribers.add(subscriber)
+
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self.subscribers.discard(subscriber)
+
+    def publish(self, event: tuple[str, str]):
+        for subscriber in self.subscribers:
+            subscriber.put(event)
+
+    async def listen(self):
+        """Fan out notifications until the loop stops, reconnecting when the connection drops."""
+
+        reconnecting = False
+
+        while True:
+            try:
+                params = connections[DEFAULT_DB_ALIAS].get_connection_params()
+                # Django's cursor factory and adapters are for sync connections.
+                params.pop("cursor_factory", None)
+                params.pop("context", None)
+
+                async with await AsyncConnection.connect(**params, autocommit=True) as conn:
+                    await conn.execute(sql.SQL("LISTEN {};").format(sql.Identifier(CHANNEL)))
+
+                    # Changes made while we were disconnected are lost.
+                    if reconnecting:
+                        self.publish(RESYNC)
+
+                    async for notify in conn.notifies():
+                        if event := to_event(notify.payload):
+                            self.publish(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Catalog event listener lost its connection; reconnecting.", exc_info=True)
+
+            reconnecting = True
+            await asyncio.sleep(settings.EVENTS_RECONNECT_DELAY)
+
+
+broadcaster = Broadcaster()
+
+
+def authenticate(headers: dict[bytes, bytes]) -> bool:
+    """Accept a knox ``Authorization: Token`` header or a logged-in session cookie."""
+
+    from django.contrib.auth import get_user_model
+    from knox.auth import TokenAuthentication
+    from rest_framework.exceptions import AuthenticationFailed
+
+    auth = headers.get(b"authorization", b"").split()
+
+    if len(auth) == 2 and auth[0].lower() == b"token":
+        try:
+            user, _ = TokenAuthentication().authenticate_credentials(auth[1])
+        except AuthenticationFailed:
+            return False
+
+        return user.is_active
+
+    cookies = SimpleCookie(headers.get(b"cookie", b"").decode("latin-1"))
+    session_key = cookies.get(settings.SESSION_COOKIE_NAME)
+
+    if not session_key:
+        return False
+
+    user_id = import_module(settings.SESSION_ENGINE).SessionStore(session_key.value).get("_auth_user_id")
+
+    return bool(user_id) and get_user_model().objects.filter(pk=user_id, is_active=True).exists()
+
+
+async def respond(send, status: int, message: str):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", b"application/json")],
+        }
+    )
+    await send({"type": "http.response.body", "body": json.dumps({"message": message}).encode()})
+
+
+class EventStreamRouter:
+    """ASGI app that serves ``EVENTS_PATH`` itself and passes everything else to Django."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"] != settings.EVENTS_PATH:
+            return await self.app(scope, receive, send)
+
+        if scope["method"] != "GET":
+            return await respond(send, 405, "Invalid request method.")
+
+        authenticated = await sync_to_async(authenticate)(dict(scope["headers"]))
+
+        if not authenticated:
+            return await respond(send, 401, "Authentication credentials were not provided.")
+
+        subscriber = broadcaster.subscribe()
+
+        if subscriber is None:
+            return await respond(send, 503, "Too many event stream clients. Please try again later.")
+
+        try:
+            await self.stream(subscriber, receive, send)
+        finally:
+            broadcaster.unsubscribe(subscriber)
+
+    async def stream(self, subscriber: Subscriber, receive, send):
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [
+                    (b"content-type", b"text/event-stream"),
+                    (b"cache-control", b"no-cache"),
+                    (b"x-accel-buffering", b"no"),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": b"retry: 3000\n\n", "more_body": True})
+
+        disconnected = asyncio.ensure_future(self.wait_for_disconnect(receive))
+        # Kept across heartbeats; cancelling a get that already took an event would lose it.
+        event = None
+
+        try:
+            while True:
+                if event is None:
+                    event = asyncio.ensure_future(subscriber.queue.get())
+
+                done, _ = await asyncio.wait(
+                    {event, disconnected}, timeout=settings.EVENTS_HEARTBEAT, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if disconnected in done:
+                    return
+
+                if event in done:
+                    events = [event.result()]
+                    event = None
+
+                    # Send everything already buffered in one write.
+                    while not subscriber.queue.empty():
+                        events.append(subscriber.queue.get_nowait())
+
+                    body = b"".join(format_event(*item) for item in events)
+                else:
+                    # Comments keep proxies from closing an idle stream.
+                    body = b": keep-alive\n\n"
+
+                await send({"type": "http.response.body", "body": body, "more_body": True})
+        finally:
+            disconnected.cancel()
+
+            if event is not None:
+                event.cancel()
+
+    async def wait_for_disconnect(self, receive):
+        while (await receive())["type"] != "http.disconnect":
+            pass
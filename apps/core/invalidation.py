@@ -0,0 +1,120 @@
+"""
+Cross-Process Cache Invalidation Over Postgres LISTEN/NOTIFY.
+
+Write paths publish the cache keys they change with ``pg_notify`` inside their
+transaction, so Postgres delivers the message only if it commits. Every process
+that reads from the cache runs one listener thread on its own connection and
+evicts the keys other processes announce from its local cache.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, connection, connections
+from psycopg import sql
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more.
+MAX_PAYLOAD_BYTES = 7_900
+
+# Identifies this process so the listener skips what it published itself.
+SENDER = uuid.uuid4().hex
+
+logger = logging.getLogger(__name__)
+
+_listener_pid = None
+_listener_lock = threading.Lock()
+
+
+def _reset_sender():
+    global SENDER
+
+    SENDER = uuid.uuid4().hex
+
+
+# A worker forked from a preloaded parent must not share its sender id, or it would skip its siblings' messages.
+os.register_at_fork(after_in_child=_reset_sender)
+
+
+def payloads(keys: list[str]) -> Iterable[str]:
+    """Split keys into JSON messages that fit in one notification."""
+
+    batch = []
+    for key in keys:
+        if batch and len(json.dumps({"sender": SENDER, "keys": [*batch, key]}).encode()) > MAX_PAYLOAD_BYTES:
+            yield json.dumps({"sender": SENDER, "keys": batch})
+            batch = []
+        batch.append(key)
+
+    if batch:
+        yield json.dumps({"sender": SENDER, "keys": batch})
+
+
+def publish(keys: Iterable[str]):
+    """Announce changed keys to other processes when the current transaction commits."""
+
+    keys = list(keys)
+
+    if not settings.CACHE_INVALIDATION_BUS or not keys:
+        return
+
+    with connection.cursor() as c:
+        for payload in payloads(keys):
+            c.execute("SELECT pg_notify(%s, %s);", [settings.CACHE_INVALIDATION_CHANNEL, payload])
+
+
+def ensure_listener():
+    """Start this process's listener thread once; forked workers start their own."""
+
+    global _listener_pid
+
+    if not settings.CACHE_INVALIDATION_BUS or _listener_pid == os.getpid():
+        return
+
+    with _listener_lock:
+        if _listener_pid != os.getpid():
+            threading.Thread(target=listen, name="cache-invalidation", daemon=True).start()
+            _listener_pid = os.getpid()
+
+
+def evict(payload: str):
+    try:
+        message = json.loads(payload)
+    except ValueError:
+        logger.warning("Ignoring malformed cache invalidation message %r.", payload[:200])
+        return
+
+    if message.get("sender") != SENDER:
+        cache.delete_many(message.get("keys") or [])
+
+
+def listen():
+    """Evict announced keys until the process exits, reconnecting when the connection drops."""
+
+    reconnecting = False
+
+    while True:
+        try:
+            db = connections[DEFAULT_DB_ALIAS]
+            params = {**db.get_connection_params(), "keepalives": 1, "keepalives_idle": 30}
+            with db.get_new_connection(params) as conn:
+                conn.autocommit = True
+                conn.execute(sql.SQL("LISTEN {};").format(sql.Identifier(settings.CACHE_INVALIDATION_CHANNEL)))
+
+                # Messages sent while we were disconnected are lost, so start from an empty cache.
+                if reconnecting:
+                    cache.clear()
+
+                for notify in conn.notifies():
+                    evict(notify.payload)
+        except Exception:
+            logger.warning("Cache invalidation listener lost its connection; reconnecting.", exc_info=True)
+
+        reconnecting = True
+        time.sleep(settings.CACHE_INVALIDATION_RECONNECT_DELAY)
@@ -0,0 +1,28 @@
+"""
+Background Jobs For Shared Tables.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+
+from apps.jobs.queue import register
+
+from .models import Tombstone
+
+
+@register("purge_tombstones")
+def purge_tombstones(payload: dict, report_progress) -> dict:
+    """Remove tombstones older than the change feed retention window."""
+
+    cutoff = timezone.now() - timedelta(days=settings.TOMBSTONE_RETENTION_DAYS)
+    deleted = 0
+
+    with connection.cursor() as c:
+        for kind, _ in Tombstone.KIND_CHOICES:
+            c.execute("DELETE FROM core_tombstone WHERE kind = %s AND deleted < %s;", [kind, cutoff])
+            deleted += c.rowcount
+
+    return {"deleted": deleted}
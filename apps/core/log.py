@@ -0,0 +1,125 @@
+"""
+Queued Logging Handlers.
+
+Request threads only put records on a bounded in-memory queue. A listener
+thread formats them as JSON and writes them out, so slow disks or pipes never
+add latency to a request.
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import sys
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+
+# Attributes every LogRecord has; anything else was passed through ``extra``.
+RECORD_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {"message", "asctime"}
+
+
+class JSONFormatter(logging.Formatter):
+    """Format records as one JSON object per line, including ``extra`` fields."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "process": record.process,
+            "thread": record.threadName,
+        }
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+
+        entry.update({key: value for key, value in record.__dict__.items() if key not in RECORD_ATTRS})
+
+        return json.dumps(entry, default=str)
+
+
+class QueuedHandler(QueueHandler):
+    """Queue records for a background thread that writes JSON lines to a file and stderr.
+
+    The queue holds at most ``maxsize`` records. When it is full new records are
+    dropped, and the number dropped is logged once there is room again.
+    """
+
+    def __init__(self, filename: str, maxsize: int = 10_000, console: bool = True):
+        super().__init__(queue.Queue(maxsize))
+        self.maxsize = maxsize
+        self.dropped = 0
+        self.listener = None
+
+        formatter = JSONFormatter()
+        self.targets = [logging.FileHandler(filename, delay=True)]
+        if console:
+            self.targets.append(logging.StreamHandler(sys.stderr))
+        for target in self.targets:
+            target.setFormatter(formatter)
+
+        # Threads do not survive a fork, so each worker process starts its own listener.
+        os.register_at_fork(after_in_child=self._reset_listener)
+        atexit.register(self._stop_listener)
+
+    def _start_listener(self):
+        self.queue = queue.Queue(self.maxsize)
+        self.listener = QueueListener(self.queue, *self.targets)
+        self.listener.start()
+
+    def _reset_listener(self):
+        self.listener = None
+
+    def _stop_listener(self):
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Resolve the message and traceback now, but leave JSON formatting to the listener.
+
+        Works on a copy, as other handlers of the same logger still need the original record.
+        """
+
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        # Called with the handler lock held, so only one thread starts the listener.
+        if self.listener is None:
+            self._start_listener()
+
+        if self.dropped:
+            try:
+                self.queue.put_nowait(
+                    logging.LogRecord(
+                        __name__,
+                        logging.WARNING,
+                        __file__,
+                        0,
+                        "Dropped %d log records, the log queue was full.",
+                        (self.dropped,),
+                        None,
+                    )
+                )
+            except queue.Full:
+                self.dropped += 1
+                return
+            self.dropped = 0
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
@@ -0,0 +1,78 @@
+"""
+Compare insert throughput and index size of random and time-ordered UUID keys.
+"""
+
+import time
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from apps.core.utils import uuid7
+
+GENERATORS = {
+    "uuid4": uuid.uuid4,
+    "uuid7": uuid7,
+}
+
+
+class Command(BaseCommand):
+    help = "Load scratch tables keyed by uuid4 and uuid7 and report insert throughput and index sizes."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000_000, help="Rows to load per key type.")
+        parser.add_argument("--batch-size", type=int, default=50_000, help="Rows per COPY batch.")
+        parser.add_argument("--keep", action="store_true", help="Keep the scratch tables after the run.")
+
+    def handle(self, *args, **options):
+        rows = options["rows"]
+        batch_size = options["batch_size"]
+
+        results = [self._load(name, generator, rows, batch_size, options["keep"]) for name, generator in GENERATORS.items()]
+
+        self.stdout.write(f"{'keys':<8}{'rows/s':>12}{'seconds':>10}{'pkey MB':>10}{'fk idx MB':>11}{'table MB':>10}")
+        for result in results:
+            self.stdout.write(
+                f"{result['name']:<8}{result['rate']:>12,.0f}{result['seconds']:>10.1f}"
+                f"{result['pkey'] / 2**20:>10.1f}{result['fk'] / 2**20:>11.1f}{result['table'] / 2**20:>10.1f}"
+            )
+
+    def _load(self, name: str, generator, rows: int, batch_size: int, keep: bool) -> dict:
+        """Load one scratch table shaped like core_music_artists and measure it."""
+
+        table = f"bench_keys_{name}"
+
+        with connection.cursor() as c:
+            c.execute(f"DROP TABLE IF EXISTS {table};")
+            c.execute(f"CREATE TABLE {table} (id uuid CONSTRAINT {table}_pkey PRIMARY KEY, music_id uuid NOT NULL);")
+            c.execute(f"CREATE INDEX {table}_music_id_idx ON {table} (music_id);")
+
+            started = time.perf_counter()
+            loaded = 0
+            while loaded < rows:
+                count = min(batch_size, rows - loaded)
+                with c.copy(f"COPY {table} (id, music_id) FROM STDIN") as copy:
+                    for _ in range(count):
+                        copy.write_row((generator(), generator()))
+                loaded += count
+                self.stdout.write(f"{name}: {loaded:,}/{rows:,}", ending="\r")
+            seconds = time.perf_counter() - started
+            self.stdout.write("")
+
+            c.execute(
+                "SELECT pg_relation_size(%s::regclass), pg_relation_size(%s::regclass), pg_relation_size(%s::regclass);",
+                [f"{table}_pkey", f"{table}_music_id_idx", table],
+            )
+            pkey, fk, table_size = c.fetchone()
+
+            if not keep:
+                c.execute(f"DROP TABLE {table};")
+
+        return {
+            "name": name,
+            "seconds": seconds,
+            "rate": rows / seconds if seconds else 0,
+            "pkey": pkey,
+            "fk": fk,
+            "table": table_size,
+        }
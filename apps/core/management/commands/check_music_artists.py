@@ -0,0 +1,64 @@
+"""
+Find and repair musics whose denormalized artist_ids/artist_names differ from their links.
+"""
+
+import uuid
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+DRIFT_SQL = """
+SELECT m.id
+FROM core_music m
+LEFT JOIN LATERAL (
+    SELECT COALESCE(array_agg(a.id ORDER BY ma.id), '{}') AS ids, COALESCE(array_agg(a.name ORDER BY ma.id), '{}') AS names
+    FROM core_music_artists ma
+    INNER JOIN core_artistprofile a ON a.id = ma.artistprofile_id
+    WHERE ma.music_id = m.id
+) AS l ON true
+WHERE m.id = ANY(%s::uuid[]) AND (m.artist_ids, m.artist_names) IS DISTINCT FROM (l.ids, l.names)
+ORDER BY m.id;
+"""
+
+
+class Command(BaseCommand):
+    help = "Compare core_music.artist_ids/artist_names with core_music_artists and optionally repair drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repair", action="store_true", help="Rewrite the arrays of drifted musics.")
+        parser.add_argument("--batch-size", type=int, default=5_000, help="Musics checked per query.")
+        parser.add_argument("--show", type=int, default=10, help="Drifted ids to print.")
+
+    def handle(self, *args, **options):
+        drifted = []
+        checked = 0
+        last_id = uuid.UUID(int=0)
+
+        while True:
+            with connection.cursor() as c:
+                c.execute("SELECT id FROM core_music WHERE id > %s ORDER BY id LIMIT %s;", [last_id, options["batch_size"]])
+                batch = [row[0] for row in c.fetchall()]
+
+                if not batch:
+                    break
+
+                c.execute(DRIFT_SQL, [batch])
+                ids = [row[0] for row in c.fetchall()]
+
+            if ids and options["repair"]:
+                with transaction.atomic(), connection.cursor() as c:
+                    c.execute("SELECT core_music_refresh_artists(%s::uuid[]);", [ids])
+
+            drifted += ids
+            checked += len(batch)
+            last_id = batch[-1]
+
+        self.stdout.write(f"Checked {checked} musics, {len(drifted)} drifted.")
+
+        for id in drifted[: options["show"]]:
+            self.stdout.write(f"  {id}")
+
+        if drifted and options["repair"]:
+            self.stdout.write(self.style.SUCCESS(f"Repaired {len(drifted)} musics."))
+        elif drifted:
+            self.stdout.write("Run again with --repair to fix them.")
@@ -0,0 +1,428 @@
+"""
+Drive running servers with a mixed API workload and report latency percentiles per endpoint.
+
+Each virtual user registers its own account, so logins never evict another
+user's knox token. The mix covers the interactive routes of every app. It
+leaves out routes whose cost is not request latency: the export and import
+jobs and their polling and downloads, and the staff-only and credential routes
+under /users/ (listing, deleting, password changes and logout).
+"""
+
+import http.client
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from collections import defaultdict
+from urllib.parse import urlsplit
+
+from django.core.management.base import BaseCommand, CommandError
+
+DEFAULT_MIX = "login=1,register=1,list=6,detail=8,albums=2,discography=2,changes=2,create=2,update=2,bulk=1,delete=1"
+OPERATIONS = {
+    "login": "login",
+    "register": "register",
+    "list": "browse_list",
+    "detail": "read_detail",
+    "albums": "browse_albums",
+    "discography": "read_discography",
+    "changes": "follow_changes",
+    "create": "create",
+    "update": "update",
+    "bulk": "bulk_update",
+    "delete": "delete",
+}
+LIST_ROUTES = {
+    "get_artists": "/artists/",
+    "get_musics": "/musics/",
+    "get_profiles": "/user_profiles/",
+}
+CHANGE_FEEDS = {
+    "get_artist_changes": "/artists/changes/",
+    "get_music_changes": "/musics/changes/",
+}
+PAGE_SIZE = 10
+BULK_ROWS = 20
+GENRES = ("rnb", "country", "classic", "rock", "jazz", "pop")
+
+# Workload randomness only; nothing here needs to be unpredictable.
+rng = random.Random()  # noqa: S311
+
+
+def new_account() -> tuple[str, str]:
+    """Email and password for a throwaway account that passes the registration checks."""
+
+    suffix = uuid.uuid4().hex[:12]
+
+    return f"loadtest-{suffix}@example.com", f"Load#Test{suffix}"
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Nearest-rank percentile of sorted values."""
+
+    if not values:
+        return 0.0
+
+    return values[min(len(values) - 1, max(0, math.ceil(fraction * len(values)) - 1))]
+
+
+class Target:
+    """Shared state for one server under test: known ids and collected samples."""
+
+    def __init__(self, name: str, url: str, timeout: float):
+        parts = urlsplit(url)
+        self.name = name
+        self.host = parts.hostname
+        self.port = parts.port or (443 if parts.scheme == "https" else 80)
+        self.https = parts.scheme == "https"
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.ids = defaultdict(list)
+        self.pages = dict.fromkeys(LIST_ROUTES, 1)
+        self.samples = defaultdict(list)
+        self.errors = defaultdict(int)
+
+    def remember(self, kind: str, ids: list[str]):
+        with self.lock:
+            known = self.ids[kind]
+            known.extend(ids)
+            del known[:-1000]
+
+    def pick(self, kind: str) -> str | None:
+        with self.lock:
+            return rng.choice(self.ids[kind]) if self.ids[kind] else None
+
+    def sample(self, kind: str, count: int) -> list[str]:
+        with self.lock:
+            return rng.sample(self.ids[kind], min(count, len(self.ids[kind])))
+
+    def forget(self, kind: str, id: str):
+        with self.lock:
+            if id in self.ids[kind]:
+                self.ids[kind].remove(id)
+
+    def record(self, endpoint: str, seconds: float, ok: bool):
+        with self.lock:
+            self.samples[endpoint].append(seconds)
+            if not ok:
+                self.errors[endpoint] += 1
+
+
+class Worker:
+    """One virtual user with its own account, keep-alive connection and knox token."""
+
+    def __init__(self, target: Target, email: str, password: str):
+        self.target = target
+        self.email = email
+        self.password = password
+        self.connection = None
+        self.token = None
+        self.cursors = {}
+        self.created = defaultdict(list)
+
+    def request(self, endpoint: str, method: str, path: str, body=None, record: bool = True):
+        headers = {"Content-Type": "application/json", "Accept": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Token {self.token}"
+
+        started = time.perf_counter()
+        try:
+            if self.connection is None:
+                connection_class = http.client.HTTPSConnection if self.target.https else http.client.HTTPConnection
+                self.connection = connection_class(self.target.host, self.target.port, timeout=self.target.timeout)
+            self.connection.request(method, path, body=json.dumps(body) if body is not None else None, headers=headers)
+            response = self.connection.getresponse()
+            payload = response.read()
+            status = response.status
+        except (OSError, http.client.HTTPException):
+            if self.connection:
+                self.connection.close()
+            self.connection = None
+            status, payload = 0, b""
+
+        if record:
+            self.target.record(endpoint, time.perf_counter() - started, 0 < status < 400)
+
+        try:
+            return status, json.loads(payload) if payload else None
+        except ValueError:
+            return status, None
+
+    def call(self, endpoint: str, method: str, path: str, body=None):
+        """Send an authenticated request without recording it, logging in again once on 401."""
+
+        status, data = self.request(endpoint, method, path, body, record=False)
+
+        if status == 401:
+            self.login(record=False)
+            status, data = self.request(endpoint, method, path, body, record=False)
+
+        return status, data
+
+    def login(self, record: bool = True):
+        self.token = None
+        status, data = self.request("login", "POST", "/users/login/", {"email": self.email, "password": self.password}, record)
+
+        if status == 200 and data and data.get("token"):
+            self.token = data["token"]
+
+    def timed(self, endpoint: str, method: str, path: str, body=None):
+        """Send and record an authenticated request. A login forced by a 401 is recorded on its own."""
+
+        started = time.perf_counter()
+        status, data = self.request(endpoint, method, path, body, record=False)
+
+        if status == 401:
+            self.login()
+            started = time.perf_counter()
+            status, data = self.request(endpoint, method, path, body, record=False)
+
+        self.target.record(endpoint, time.perf_counter() - started, 0 < status < 400)
+
+        return status, data
+
+    def browse_list(self):
+        endpoint = rng.choice(list(LIST_ROUTES))
+        page = rng.randint(1, self.target.pages[endpoint])
+        status, data = self.timed(endpoint, "GET", f"{LIST_ROUTES[endpoint]}?page={page}")
+
+        if status == 200 and isinstance(data, dict):
+            self.target.pages[endpoint] = max(1, math.ceil((data.get("count") or 0) / PAGE_SIZE))
+            self.target.remember(endpoint, [row["id"] for row in data.get("results") or [] if "id" in row])
+
+    def read_detail(self):
+        choices = [
+            ("get_artist", "get_artists", "/artists/{}/"),
+            ("get_music", "get_musics", "/musics/{}/"),
+            ("get_music_by_artist", "get_artists", "/musics/by_artist/{}"),
+            ("get_profile", "get_profiles", "/user_profiles/{}/"),
+        ]
+        endpoint, kind, path = rng.choice(choices)
+        id = self.target.pick(kind)
+
+        if id:
+            self.timed(endpoint, "GET", path.format(id))
+        else:
+            self.timed("get_current_user", "GET", "/users/me/")
+
+    def register(self):
+        email, password = new_account()
+        self.timed(
+            "user_register",
+            "POST",
+            "/users/user_register/",
+            {"email": email, "password": password, "confirm_password": password},
+        )
+
+    def browse_albums(self):
+        album_id = self.target.pick("get_albums_by_artist")
+
+        if album_id and rng.random() < 0.5:
+            self.timed("get_album_tracks", "GET", f"/albums/{album_id}/tracks/")
+        elif artist_id := self.target.pick("get_artists"):
+            status, data = self.timed("get_albums_by_artist", "GET", f"/albums/by_artist/{artist_id}")
+            if status == 200 and isinstance(data, dict):
+                self.target.remember("get_albums_by_artist", [row["id"] for row in data.get("results") or []])
+
+    def read_discography(self):
+        if artist_id := self.target.pick("get_artists"):
+            self.timed("get_artist_discography", "GET", f"/artists/{artist_id}/discography/")
+
+    def follow_changes(self):
+        """Poll a change feed from this user's last cursor, like a syncing client."""
+
+        endpoint = rng.choice(list(CHANGE_FEEDS))
+        since = self.cursors.get(endpoint)
+        path = f"{CHANGE_FEEDS[endpoint]}?limit=100" + (f"&since={since}" if since else "")
+        status, data = self.timed(endpoint, "GET", path)
+
+        if status == 200 and isinstance(data, dict):
+            self.cursors[endpoint] = data.get("since")
+        elif status == 410:
+            self.cursors.pop(endpoint, None)
+
+    def create(self):
+        suffix = uuid.uuid4().hex[:8]
+
+        if rng.random() < 0.5 or not self.target.pick("get_artists"):
+            status, data = self.timed(
+                "create_artist",
+                "POST",
+                "/artists/create_artist/",
+                {
+                    "name": f"Load Test Artist {suffix}",
+                    "first_release_year": rng.randint(1960, 2023),
+                    "no_of_albums_released": rng.randint(0, 30),
+                    "date_of_birth": "1980-01-01",
+                    "gender": rng.choice(("male", "female", "others")),
+                    "address": "Load Test",
+                },
+            )
+            if status == 201 and data:
+                self.target.remember("get_artists", [data["artist"]["id"]])
+                self.created["get_artists"].append(data["artist"]["id"])
+        else:
+            status, data = self.timed(
+                "create_music",
+                "POST",
+                "/musics/create_music/",
+                {
+                    "title": f"Load Test Song {suffix}",
+                    "release_date": "2020-01-01",
+                    "album_name": "Load Test",
+                    "genre": rng.choice(GENRES),
+                    "artist_ids": [self.target.pick("get_artists")],
+                },
+            )
+            if status == 201 and data and "music" in data:
+                self.target.remember("get_musics", [data["music"]["id"]])
+                self.created["get_musics"].append(data["music"]["id"])
+
+    def update(self):
+        artist_id = self.target.pick("get_artists")
+        music_id = self.target.pick("get_musics")
+
+        if music_id and (rng.random() < 0.5 or not artist_id):
+            self.timed(
+                "update_music", "PATCH", f"/musics/update/{music_id}", {"album_name": f"Load Test {rng.randint(1, 99)}"}
+            )
+        elif artist_id:
+            self.timed(
+                "update_artist",
+                "PATCH",
+                f"/artists/update_artist/{artist_id}/",
+                {"address": f"Load Test {rng.randint(1, 99)}"},
+            )
+
+    def bulk_update(self):
+        if rng.random() < 0.5:
+            rows = [{"id": id, "genre": rng.choice(GENRES)} for id in self.target.sample("get_musics", BULK_ROWS)]
+            if rows:
+                self.timed("bulk_update_musics", "PATCH", "/musics/bulk/", rows)
+        else:
+            rows = [
+                {"id": id, "address": f"Load Test {rng.randint(1, 99)}"} for id in self.target.sample("get_artists", BULK_ROWS)
+            ]
+            if rows:
+                self.timed("bulk_update_artists", "PATCH", "/artists/bulk/", rows)
+
+    def delete(self):
+        """Delete a music or artist this user created, so the data set stays the same size."""
+
+        if self.created["get_musics"]:
+            music_id = self.created["get_musics"].pop()
+            self.target.forget("get_musics", music_id)
+            self.timed("delete_music", "DELETE", f"/musics/delete/{music_id}/")
+        elif self.created["get_artists"]:
+            artist_id = self.created["get_artists"].pop()
+            self.target.forget("get_artists", artist_id)
+            self.timed("delete_artist", "DELETE", f"/artists/delete_artist/{artist_id}/")
+
+    def run(self, operations: list, weights: list[int], deadline: float):
+        while time.monotonic() < deadline:
+            operation = rng.choices(operations, weights)[0]
+            if operation == "login":
+                self.login()
+            else:
+                getattr(self, operation)()
+
+        if self.connection:
+            self.connection.close()
+
+
+class Command(BaseCommand):
+    help = "Run a mixed workload over the API routes against one or more running servers."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--target",
+            action="append",
+            metavar="NAME=URL",
+            help="Server to test, e.g. wsgi=http://127.0.0.1:8000. Repeat to compare servers (WSGI vs ASGI, pool sizes).",
+        )
+        parser.add_argument("--concurrency", type=int, default=20, help="Virtual users per target.")
+        parser.add_argument("--duration", type=float, default=30, help="Seconds to run against each target.")
+        parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Weights per operation (default {DEFAULT_MIX}).")
+        parser.add_argument("--timeout", type=float, default=10, help="Per-request timeout in seconds.")
+
+    def handle(self, *args, **options):
+        try:
+            mix = {name: int(weight) for name, weight in (item.split("=") for item in options["mix"].split(","))}
+        except ValueError:
+            raise CommandError(f"--mix must look like {DEFAULT_MIX}.") from None
+
+        if unknown := set(mix) - set(OPERATIONS):
+            raise CommandError(f"Unknown operations in --mix: {', '.join(sorted(unknown))}.")
+
+        targets = [
+            Target(*(item.split("=", 1) if "=" in item else (item, item)), options["timeout"])
+            for item in options["target"] or ["local=http://127.0.0.1:8000"]
+        ]
+        operations = [OPERATIONS[name] for name in mix]
+        weights = list(mix.values())
+
+        for target in targets:
+            workers = self._seed(target, options["concurrency"])
+            deadline = time.monotonic() + options["duration"]
+            threads = [threading.Thread(target=worker.run, args=(operations, weights, deadline)) for worker in workers]
+
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            self._report(target, options["duration"])
+
+        if len(targets) > 1:
+            self.stdout.write(f"\n{'target':<16}{'req/s':>10}{'errors':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+            for target in targets:
+                samples = sorted(s for values in target.samples.values() for s in values)
+                errors = sum(target.errors.values())
+                self.stdout.write(
+                    f"{target.name:<16}{len(samples) / options['duration']:>10.1f}{errors / max(len(samples), 1):>9.1%}"
+                    f"{percentile(samples, 0.5) * 1000:>9.1f}{percentile(samples, 0.95) * 1000:>9.1f}{percentile(samples, 0.99) * 1000:>9.1f}"
+                )
+
+    def _seed(self, target: Target, concurrency: int) -> list[Worker]:
+        """Register and log in one account per virtual user and learn list sizes and some ids.
+
+        None of it counts towards the results.
+        """
+
+        workers = []
+        for _ in range(concurrency):
+            worker = Worker(target, *new_account())
+            worker.request(
+                "user_register",
+                "POST",
+                "/users/user_register/",
+                {"email": worker.email, "password": worker.password, "confirm_password": worker.password},
+                record=False,
+            )
+            worker.login(record=False)
+
+            if not worker.token:
+                raise CommandError(f"Could not register and log in a load test account on {target.name}.")
+
+            workers.append(worker)
+
+        for endpoint, path in LIST_ROUTES.items():
+            status, data = workers[0].call(endpoint, "GET", path)
+            if status == 200 and isinstance(data, dict):
+                target.pages[endpoint] = max(1, math.ceil((data.get("count") or 0) / PAGE_SIZE))
+                target.remember(endpoint, [row["id"] for row in data.get("results") or [] if "id" in row])
+
+        return workers
+
+    def _report(self, target: Target, duration: float):
+        self.stdout.write(f"\n{target.name} ({target.host}:{target.port})")
+        self.stdout.write(f"{'endpoint':<22}{'requests':>9}{'req/s':>9}{'errors':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+
+        for endpoint in sorted(target.samples):
+            samples = sorted(target.samples[endpoint])
+            self.stdout.write(
+                f"{endpoint:<22}{len(samples):>9}{len(samples) / duration:>9.1f}{target.errors[endpoint] / len(samples):>9.1%}"
+                f"{percentile(samples, 0.5) * 1000:>9.1f}{percentile(samples, 0.95) * 1000:>9.1f}{percentile(samples, 0.99) * 1000:>9.1f}"
+            )
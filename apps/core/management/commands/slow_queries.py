@@ -0,0 +1,65 @@
+"""
+Aggregate the slow query log by normalized statement.
+"""
+
+import json
+import re
+from collections import Counter, defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+VALUE_LISTS = re.compile(
+    r"\(\s*(?:%s|\?)(?:\s*(?:::\w+(?:\[\])?)?\s*,\s*(?:%s|\?))*\s*(?:::\w+(?:\[\])?)?\s*\)(?:\s*,\s*\(\s*[^()]*\))*"
+)
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+WHITESPACE = re.compile(r"\s+")
+
+
+def normalize(sql: str) -> str:
+    """Collapse literals, placeholder lists and whitespace so repeated statements group together."""
+
+    sql = LITERALS.sub("?", sql)
+    sql = VALUE_LISTS.sub("(...)", sql)
+
+    return WHITESPACE.sub(" ", sql).strip().rstrip(";")
+
+
+class Command(BaseCommand):
+    help = "Summarize the slow query log: count, total and worst duration per normalized statement."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", default=str(settings.SLOW_QUERY_LOG), help="Slow query log to read.")
+        parser.add_argument("--limit", type=int, default=20, help="Statements to show.")
+        parser.add_argument("--sort", choices=("total", "count", "max"), default="total", help="Ranking order.")
+
+    def handle(self, *args, **options):
+        stats = defaultdict(lambda: {"count": 0, "total": 0.0, "max": 0.0, "callers": Counter()})
+
+        try:
+            with open(options["file"]) as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue
+
+                    if "sql" not in entry:
+                        continue
+
+                    stat = stats[normalize(entry["sql"])]
+                    stat["count"] += 1
+                    stat["total"] += entry["duration_ms"]
+                    stat["max"] = max(stat["max"], entry["duration_ms"])
+                    stat["callers"][entry.get("caller", "unknown")] += 1
+        except FileNotFoundError:
+            raise CommandError(f"No slow query log at {options['file']}.") from None
+
+        ranked = sorted(stats.items(), key=lambda item: item[1][options["sort"]], reverse=True)[: options["limit"]]
+
+        self.stdout.write(f"{'count':>7}{'total ms':>12}{'mean ms':>10}{'max ms':>10}  statement")
+        for sql, stat in ranked:
+            self.stdout.write(
+                f"{stat['count']:>7}{stat['total']:>12,.0f}{stat['total'] / stat['count']:>10,.1f}{stat['max']:>10,.0f}  {sql[:160]}"
+            )
+            self.stdout.write(f"{'':>41}  from {stat['callers'].most_common(1)[0][0]}")
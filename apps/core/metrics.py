@@ -0,0 +1,135 @@
+"""
+Prometheus Metrics.
+
+Set ``PROMETHEUS_MULTIPROC_DIR`` to an empty directory before the server starts
+to aggregate metrics across worker processes; each process then writes its
+samples to memory-mapped files in that directory and ``/metrics`` merges them.
+"""
+
+import os
+import time
+
+from django.db import connection
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest, multiprocess
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import REGISTRY
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+REQUESTS = Counter("http_requests_total", "HTTP requests by URL name, method and status.", ["view", "method", "status"])
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds", "HTTP request latency by URL name.", ["view", "method"], buckets=LATENCY_BUCKETS
+)
+DB_QUERIES = Counter("db_queries_total", "Database queries by URL name.", ["view"])
+DB_QUERY_LATENCY = Histogram(
+    "db_query_duration_seconds", "Database query latency by URL name.", ["view"], buckets=LATENCY_BUCKETS
+)
+STATEMENT_TIMEOUTS = Counter(
+    "db_statement_timeouts_total",
+    "Requests answered with 503 after statement_timeout cancelled a query.",
+    ["view", "endpoint_class"],
+)
+ADMISSION_REJECTIONS = Counter(
+    "admission_rejections_total", "Requests shed because their endpoint class had no free slot.", ["view", "endpoint_class"]
+)
+CACHE_REQUESTS = Counter("cache_requests_total", "Application cache lookups by cache and result.", ["cache", "result"])
+
+
+def record_cache_lookup(cache: str, hit: bool, stale: bool = False):
+    """Count one cache lookup as a hit, a stale hit or a miss."""
+
+    CACHE_REQUESTS.labels(cache, ("stale" if stale else "hit") if hit else "miss").inc()
+
+
+def view_name(request) -> str:
+    """Label requests by URL name so ids in the path do not create new series."""
+
+    match = getattr(request, "resolver_match", None)
+
+    return (match.url_name or match.view_name) if match else "unmatched"
+
+
+class QueryTimer:
+    """Execute wrapper that counts and times the queries of one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.durations = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.durations.append(time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    """Record latency, status and database usage of every request by URL name."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        timer = QueryTimer()
+        started = time.perf_counter()
+
+        with connection.execute_wrapper(timer):
+            response = self.get_response(request)
+
+        view = view_name(request)
+        REQUEST_LATENCY.labels(view, request.method).observe(time.perf_counter() - started)
+        REQUESTS.labels(view, request.method, response.status_code).inc()
+
+        if timer.count:
+            DB_QUERIES.labels(view).inc(timer.count)
+            for duration in timer.durations:
+                DB_QUERY_LATENCY.labels(view).observe(duration)
+
+        return response
+
+
+class DatabaseCollector:
+    """Read database-wide state at scrape time, once per scrape rather than once per worker."""
+
+    def collect(self):
+        with connection.cursor() as c:
+            c.execute(
+                "SELECT state, count(*) FROM pg_stat_activity WHERE datname = current_database() AND backend_type = 'client backend' GROUP BY state;"
+            )
+            connections = GaugeMetricFamily("db_connections", "Client connections to the database by state.", labels=["state"])
+            for state, count in c.fetchall():
+                connections.add_metric([state or "unknown"], count)
+            yield connections
+
+            c.execute("SELECT blks_hit, blks_read FROM pg_stat_database WHERE datname = current_database();")
+            hit, read = c.fetchone()
+            blocks = CounterMetricFamily(
+                "db_blocks", "Blocks served from the Postgres buffer cache or read from disk.", labels=["result"]
+            )
+            blocks.add_metric(["hit"], hit)
+            blocks.add_metric(["read"], read)
+            yield blocks
+
+            c.execute(
+                "SELECT reltuples::bigint, pg_total_relation_size(oid) FROM pg_class WHERE oid = 'knox_authtoken'::regclass;"
+            )
+            rows, size = c.fetchone()
+            yield GaugeMetricFamily("knox_authtoken_rows", "Estimated rows in the knox token table.", value=max(rows, 0))
+            yield GaugeMetricFamily("knox_authtoken_bytes", "Size of the knox token table and its indexes.", value=size)
+
+
+def render_metrics() -> bytes:
+    """Render all metrics in the Prometheus text format."""
+
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    database = CollectorRegistry()
+    database.register(DatabaseCollector())
+
+    return generate_latest(registry) + generate_latest(database)
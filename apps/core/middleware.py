@@ -0,0 +1,84 @@
+"""
+Custom Middleware.
+"""
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.handlers.exception import convert_exception_to_response
+from django.utils.module_loading import import_string
+
+
+def is_api_request(request) -> bool:
+    """Token-authenticated API routes never use sessions, cookies or CSRF."""
+
+    return request.path_info.startswith(settings.API_PATH_PREFIXES)
+
+
+class BrowserOnlyMiddleware:
+    """Run ``BROWSER_MIDDLEWARE`` for admin and browser pages and skip it for API routes.
+
+    The wrapped middleware are loaded the way Django's handler loads
+    ``MIDDLEWARE``, so their ``process_view``, ``process_template_response`` and
+    ``process_exception`` hooks still run for browser requests.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.view_middleware = []
+        self.template_response_middleware = []
+        self.exception_middleware = []
+
+        handler = get_response
+        for middleware_path in reversed(settings.BROWSER_MIDDLEWARE):
+            try:
+                middleware = import_string(middleware_path)(handler)
+            except MiddlewareNotUsed:
+                continue
+
+            if hasattr(middleware, "process_view"):
+                self.view_middleware.insert(0, middleware.process_view)
+            if hasattr(middleware, "process_template_response"):
+                self.template_response_middleware.append(middleware.process_template_response)
+            if hasattr(middleware, "process_exception"):
+                self.exception_middleware.append(middleware.process_exception)
+
+            handler = convert_exception_to_response(middleware)
+
+        self.browser_chain = handler
+
+    def __call__(self, request):
+        if is_api_request(request):
+            return self.get_response(request)
+
+        return self.browser_chain(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if is_api_request(request):
+            return None
+
+        for process_view in self.view_middleware:
+            response = process_view(request, view_func, view_args, view_kwargs)
+            if response is not None:
+                return response
+
+        return None
+
+    def process_template_response(self, request, response):
+        if is_api_request(request):
+            return response
+
+        for process_template_response in self.template_response_middleware:
+            response = process_template_response(request, response)
+
+        return response
+
+    def process_exception(self, request, exception):
+        if is_api_request(request):
+            return None
+
+        for process_exception in self.exception_middleware:
+            response = process_exception(request, exception)
+            if response is not None:
+                return response
+
+        return None
@@ -0,0 +1,44 @@
+# Generated by Django 5.0.3 on 2026-10-18 23:30
+
+from django.db import migrations, models
+
+import apps.core.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_music_artists'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='musicartists',
+            options={'verbose_name': 'Music Artist', 'verbose_name_plural': 'Music Artists'},
+        ),
+        migrations.AlterField(
+            model_name='artistprofile',
+            name='id',
+            field=models.UUIDField(default=apps.core.utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='music',
+            name='id',
+            field=models.UUIDField(default=apps.core.utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='musicartists',
+            name='id',
+            field=models.UUIDField(default=apps.core.utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='id',
+            field=models.UUIDField(default=apps.core.utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='userprofile',
+            name='id',
+            field=models.UUIDField(default=apps.core.utils.uuid7, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.3 on 2026-10-18 23:37
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.conf import settings
+from django.db import migrations, models
+
+import apps.core.utils
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_alter_musicartists_options_alter_artistprofile_id_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('id', models.UUIDField(default=apps.core.utils.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(max_length=50, verbose_name='Kind')),
+                ('status', models.CharField(choices=[('queued', 'queued'), ('running', 'running'), ('succeeded', 'succeeded'), ('failed', 'failed')], default='queued', max_length=10, verbose_name='Status')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='Payload')),
+                ('result', models.JSONField(blank=True, null=True, verbose_name='Result')),
+                ('error', models.TextField(blank=True, null=True, verbose_name='Error')),
+                ('progress', models.PositiveSmallIntegerField(default=0, verbose_name='Progress (%)')),
+                ('attempts', models.PositiveSmallIntegerField(default=0, verbose_name='Attempts')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Run After')),
+                ('started', models.DateTimeField(blank=True, null=True, verbose_name='Started')),
+                ('finished', models.DateTimeField(blank=True, null=True, verbose_name='Finished')),
+                ('created_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Job',
+                'indexes': [models.Index(condition=models.Q(('status', 'queued')), fields=['run_after'], name='core_job_queued_idx'), models.Index(condition=models.Q(('status', 'running')), fields=['modified'], name='core_job_running_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.0.3 on 2026-10-18 23:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_job'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['kind', 'created'], name='core_job_kind_created_idx'),
+        ),
+    ]
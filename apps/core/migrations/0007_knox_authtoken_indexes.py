@@ -0,0 +1,24 @@
+# Indexes that keep knox token expiry purges and per-user eviction cheap.
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ('core', '0006_job_core_job_kind_created_idx'),
+        ('knox', '0008_remove_authtoken_salt'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS knox_authtoken_expiry_idx ON knox_authtoken (expiry) WHERE expiry IS NOT NULL;',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS knox_authtoken_expiry_idx;',
+        ),
+        migrations.RunSQL(
+            sql='CREATE INDEX CONCURRENTLY IF NOT EXISTS knox_authtoken_user_created_idx ON knox_authtoken (user_id, created);',
+            reverse_sql='DROP INDEX CONCURRENTLY IF EXISTS knox_authtoken_user_created_idx;',
+        ),
+    ]
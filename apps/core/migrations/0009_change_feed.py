@@ -0,0 +1,79 @@
+# Generated by Django 5.0.3 on 2026-10-19 00:01
+
+import django.utils.timezone
+from django.db import migrations, models
+
+import apps.core.utils
+
+# Stamp each written row with its transaction id. pg_snapshot_xmin tells the
+# change feed which ids can no longer commit, so it never passes over a row
+# that is still in flight (see apps.core.changes).
+STAMP_FUNCTION = """
+CREATE OR REPLACE FUNCTION core_stamp_change_xid() RETURNS trigger AS $$
+BEGIN
+    NEW.change_xid := pg_current_xact_id()::text::bigint;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_user_core_user_email_lower_like_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.UUIDField(default=apps.core.utils.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('artist', 'artist'), ('music', 'music')], max_length=10, verbose_name='Kind')),
+                ('object_id', models.UUIDField(verbose_name='Object ID')),
+                ('deleted', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Deleted')),
+                ('change_xid', models.BigIntegerField(db_default=0, editable=False, verbose_name='Change Transaction')),
+            ],
+            options={
+                'verbose_name': 'Tombstone',
+            },
+        ),
+        migrations.AddField(
+            model_name='artistprofile',
+            name='change_xid',
+            field=models.BigIntegerField(db_default=0, editable=False, verbose_name='Change Transaction'),
+        ),
+        migrations.AddField(
+            model_name='music',
+            name='change_xid',
+            field=models.BigIntegerField(db_default=0, editable=False, verbose_name='Change Transaction'),
+        ),
+        migrations.AddIndex(
+            model_name='artistprofile',
+            index=models.Index(fields=['change_xid', 'id'], name='core_artist_change_xid_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='music',
+            index=models.Index(fields=['change_xid', 'id'], name='core_music_change_xid_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['kind', 'change_xid', 'object_id'], name='core_tombstone_feed_idx'),
+        ),
+        migrations.RunSQL(
+            sql=STAMP_FUNCTION,
+            reverse_sql='DROP FUNCTION IF EXISTS core_stamp_change_xid();',
+        ),
+        migrations.RunSQL(
+            sql='CREATE TRIGGER core_artistprofile_change_xid BEFORE INSERT OR UPDATE ON core_artistprofile FOR EACH ROW EXECUTE FUNCTION core_stamp_change_xid();',
+            reverse_sql='DROP TRIGGER IF EXISTS core_artistprofile_change_xid ON core_artistprofile;',
+        ),
+        migrations.RunSQL(
+            sql='CREATE TRIGGER core_music_change_xid BEFORE INSERT OR UPDATE ON core_music FOR EACH ROW EXECUTE FUNCTION core_stamp_change_xid();',
+            reverse_sql='DROP TRIGGER IF EXISTS core_music_change_xid ON core_music;',
+        ),
+        migrations.RunSQL(
+            sql='CREATE TRIGGER core_tombstone_change_xid BEFORE INSERT ON core_tombstone FOR EACH ROW EXECUTE FUNCTION core_stamp_change_xid();',
+            reverse_sql='DROP TRIGGER IF EXISTS core_tombstone_change_xid ON core_tombstone;',
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Notify the catalog_changes channel once per artist and music write statement (see apps.core.events).
+
+from django.db import migrations
+
+NOTIFY_FUNCTION = """
+CREATE OR REPLACE FUNCTION core_notify_catalog_changes() RETURNS trigger AS $$
+DECLARE
+    ids uuid[];
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        SELECT array_agg(id) INTO ids FROM old_rows;
+    ELSE
+        SELECT array_agg(id) INTO ids FROM new_rows;
+    END IF;
+
+    IF ids IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    -- Listing every id of a large statement would flood the channel; listeners resync instead.
+    IF cardinality(ids) > 1000 THEN
+        PERFORM pg_notify(
+            'catalog_changes',
+            json_build_object('table', TG_TABLE_NAME, 'op', lower(TG_OP), 'count', cardinality(ids))::text
+        );
+        RETURN NULL;
+    END IF;
+
+    -- 100 ids stay well under the 8000 byte payload limit.
+    FOR i IN 1..cardinality(ids) BY 100 LOOP
+        PERFORM pg_notify(
+            'catalog_changes',
+            json_build_object('table', TG_TABLE_NAME, 'op', lower(TG_OP), 'ids', ids[i:i + 99])::text
+        );
+    END LOOP;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+TRIGGERS = """
+CREATE TRIGGER core_artistprofile_notify_insert AFTER INSERT ON core_artistprofile
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION core_notify_catalog_changes();
+CREATE TRIGGER core_artistprofile_notify_update AFTER UPDATE ON core_artistprofile
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION core_notify_catalog_changes();
+CREATE TRIGGER core_artistprofile_notify_delete AFTER DELETE ON core_artistprofile
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION core_notify_catalog_changes();
+CREATE TRIGGER core_music_notify_insert AFTER INSERT ON core_music
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION core_notify_catalog_changes();
+CREATE TRIGGER core_music_notify_update AFTER UPDATE ON core_music
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION core_notify_catalog_changes();
+CREATE TRIGGER core_music_notify_delete AFTER DELETE ON core_music
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION core_notify_catalog_changes();
+"""
+
+DROP_TRIGGERS = """
+DROP TRIGGER IF EXISTS core_artistprofile_notify_insert ON core_artistprofile;
+DROP TRIGGER IF EXISTS core_artistprofile_notify_update ON core_artistprofile;
+DROP TRIGGER IF EXISTS core_artistprofile_notify_delete ON core_artistprofile;
+DROP TRIGGER IF EXISTS core_music_notify_insert ON core_music;
+DROP TRIGGER IF EXISTS core_music_notify_update ON core_music;
+DROP TRIGGER IF EXISTS core_music_notify_delete ON core_music;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_change_feed'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=NOTIFY_FUNCTION,
+            reverse_sql='DROP FUNCTION IF EXISTS core_notify_catalog_changes();',
+        ),
+        migrations.RunSQL(sql=TRIGGERS, reverse_sql=DROP_TRIGGERS),
+    ]
@@ -0,0 +1,138 @@
+# Generated by Django 5.0.3 on 2026-10-19 00:06
+
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+from django.db import migrations, models
+
+REFRESH_FUNCTION = """
+CREATE OR REPLACE FUNCTION core_music_refresh_artists(music_ids uuid[]) RETURNS void AS $$
+BEGIN
+    IF cardinality(music_ids) = 0 THEN
+        RETURN;
+    END IF;
+
+    -- Lock first, so the UPDATE below runs on a fresh snapshot that includes
+    -- links committed by a concurrent writer of the same musics.
+    PERFORM 1 FROM core_music WHERE id = ANY(music_ids) ORDER BY id FOR UPDATE;
+
+    UPDATE core_music m
+    SET artist_ids = l.ids, artist_names = l.names, modified = now()
+    FROM (
+        -- The linked artists of each music, in link order.
+        SELECT x.id,
+               COALESCE(array_agg(a.id ORDER BY ma.id) FILTER (WHERE a.id IS NOT NULL), '{}') AS ids,
+               COALESCE(array_agg(a.name ORDER BY ma.id) FILTER (WHERE a.id IS NOT NULL), '{}') AS names
+        FROM unnest(music_ids) AS x(id)
+        LEFT JOIN core_music_artists ma ON ma.music_id = x.id
+        LEFT JOIN core_artistprofile a ON a.id = ma.artistprofile_id
+        GROUP BY x.id
+    ) AS l
+    WHERE m.id = l.id AND (m.artist_ids, m.artist_names) IS DISTINCT FROM (l.ids, l.names);
+END;
+$$ LANGUAGE plpgsql;
+"""
+
+LINK_TRIGGERS = """
+CREATE OR REPLACE FUNCTION core_music_artists_inserted() RETURNS trigger AS $$
+BEGIN
+    PERFORM core_music_refresh_artists(ARRAY(SELECT DISTINCT music_id FROM new_links WHERE music_id IS NOT NULL));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION core_music_artists_deleted() RETURNS trigger AS $$
+BEGIN
+    PERFORM core_music_refresh_artists(ARRAY(SELECT DISTINCT music_id FROM old_links WHERE music_id IS NOT NULL));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION core_music_artists_updated() RETURNS trigger AS $$
+BEGIN
+    PERFORM core_music_refresh_artists(ARRAY(
+        SELECT music_id FROM new_links WHERE music_id IS NOT NULL
+        UNION
+        SELECT music_id FROM old_links WHERE music_id IS NOT NULL
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION core_artistprofile_renamed() RETURNS trigger AS $$
+BEGIN
+    PERFORM core_music_refresh_artists(ARRAY(
+        SELECT DISTINCT ma.music_id
+        FROM new_rows n
+        INNER JOIN old_rows o ON o.id = n.id
+        INNER JOIN core_music_artists ma ON ma.artistprofile_id = n.id
+        WHERE n.name IS DISTINCT FROM o.name AND ma.music_id IS NOT NULL
+    ));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_music_artists_inserted AFTER INSERT ON core_music_artists
+    REFERENCING NEW TABLE AS new_links FOR EACH STATEMENT EXECUTE FUNCTION core_music_artists_inserted();
+CREATE TRIGGER core_music_artists_deleted AFTER DELETE ON core_music_artists
+    REFERENCING OLD TABLE AS old_links FOR EACH STATEMENT EXECUTE FUNCTION core_music_artists_deleted();
+CREATE TRIGGER core_music_artists_updated AFTER UPDATE ON core_music_artists
+    REFERENCING OLD TABLE AS old_links NEW TABLE AS new_links FOR EACH STATEMENT EXECUTE FUNCTION core_music_artists_updated();
+CREATE TRIGGER core_artistprofile_renamed AFTER UPDATE ON core_artistprofile
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION core_artistprofile_renamed();
+"""
+
+DROP_LINK_TRIGGERS = """
+DROP TRIGGER IF EXISTS core_music_artists_inserted ON core_music_artists;
+DROP TRIGGER IF EXISTS core_music_artists_deleted ON core_music_artists;
+DROP TRIGGER IF EXISTS core_music_artists_updated ON core_music_artists;
+DROP TRIGGER IF EXISTS core_artistprofile_renamed ON core_artistprofile;
+DROP FUNCTION IF EXISTS core_music_artists_inserted();
+DROP FUNCTION IF EXISTS core_music_artists_deleted();
+DROP FUNCTION IF EXISTS core_music_artists_updated();
+DROP FUNCTION IF EXISTS core_artistprofile_renamed();
+"""
+
+# Backfill without touching modified, so change feed clients do not download every row again.
+BACKFILL = """
+UPDATE core_music m SET artist_ids = l.ids, artist_names = l.names
+FROM (
+    SELECT x.id,
+           COALESCE(array_agg(a.id ORDER BY ma.id) FILTER (WHERE a.id IS NOT NULL), '{}') AS ids,
+           COALESCE(array_agg(a.name ORDER BY ma.id) FILTER (WHERE a.id IS NOT NULL), '{}') AS names
+    FROM core_music x
+    LEFT JOIN core_music_artists ma ON ma.music_id = x.id
+    LEFT JOIN core_artistprofile a ON a.id = ma.artistprofile_id
+    GROUP BY x.id
+) AS l
+WHERE m.id = l.id;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_catalog_change_notify'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='music',
+            name='artist_ids',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.UUIDField(), db_default='{}', editable=False, size=None, verbose_name='Artist IDs'),
+        ),
+        migrations.AddField(
+            model_name='music',
+            name='artist_names',
+            field=django.contrib.postgres.fields.ArrayField(base_field=models.CharField(max_length=50, null=True), db_default='{}', editable=False, size=None, verbose_name='Artist Names'),
+        ),
+        migrations.AddIndex(
+            model_name='music',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['artist_ids'], name='core_music_artist_ids_idx'),
+        ),
+        migrations.RunSQL(
+            sql=REFRESH_FUNCTION,
+            reverse_sql='DROP FUNCTION IF EXISTS core_music_refresh_artists(uuid[]);',
+        ),
+        migrations.RunSQL(sql=LINK_TRIGGERS, reverse_sql=DROP_LINK_TRIGGERS),
+        migrations.RunSQL(sql=BACKFILL, reverse_sql=migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,239 @@
+# Generated by Django 5.0.3 on 2026-10-19 00:08
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations, models, transaction
+
+import apps.core.utils
+
+BACKFILL_BATCH_SIZE = 5_000
+
+ALBUM_FUNCTIONS = r"""
+-- Time-ordered version 7 UUID, laid out like apps.core.utils.uuid7.
+CREATE OR REPLACE FUNCTION core_uuid7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(int8send((extract(epoch FROM clock_timestamp()) * 1000)::bigint) FROM 3)
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid;
+$$ LANGUAGE sql VOLATILE;
+
+CREATE OR REPLACE FUNCTION core_normalize_album_title(title text) RETURNS text AS $$
+    SELECT NULLIF(lower(btrim(regexp_replace(title, '\s+', ' ', 'g'))), '');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Find or create the album for a title and primary artist; NULL for blank titles. Different
+-- artists' albums with the same title stay apart. The row is locked so that an album being
+-- used by an open transaction is not removed as empty.
+CREATE OR REPLACE FUNCTION core_album_for_title(title text, artist_id uuid) RETURNS uuid AS $$
+DECLARE
+    normalized text := core_normalize_album_title(title);
+    album uuid;
+BEGIN
+    IF normalized IS NULL THEN
+        RETURN NULL;
+    END IF;
+
+    LOOP
+        SELECT id INTO album FROM core_album
+        WHERE normalized_title = normalized AND primary_artist_id IS NOT DISTINCT FROM artist_id
+        FOR KEY SHARE;
+
+        IF album IS NOT NULL THEN
+            RETURN album;
+        END IF;
+
+        INSERT INTO core_album (id, title, normalized_title, primary_artist_id, created, modified)
+        VALUES (core_uuid7(), btrim(regexp_replace(title, '\s+', ' ', 'g')), normalized, artist_id, now(), now())
+        ON CONFLICT (normalized_title, primary_artist_id) DO NOTHING
+        RETURNING id INTO album;
+
+        IF album IS NOT NULL THEN
+            RETURN album;
+        END IF;
+    END LOOP;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Runs again when the first linked artist changes, as the album belongs to it.
+CREATE OR REPLACE FUNCTION core_music_set_album() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE'
+       AND core_normalize_album_title(NEW.album_name) IS NOT DISTINCT FROM core_normalize_album_title(OLD.album_name)
+       AND NEW.artist_ids[1] IS NOT DISTINCT FROM OLD.artist_ids[1] THEN
+        RETURN NEW;
+    END IF;
+
+    NEW.album_id := core_album_for_title(NEW.album_name, NEW.artist_ids[1]);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- An album lists the artists that have at least one track on it.
+CREATE OR REPLACE FUNCTION core_music_sync_album_artists() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP <> 'INSERT' AND OLD.album_id IS NOT NULL THEN
+        DELETE FROM core_album_artists aa
+        WHERE aa.album_id = OLD.album_id
+          AND aa.artistprofile_id = ANY(OLD.artist_ids)
+          AND NOT EXISTS (
+              SELECT 1 FROM core_music m WHERE m.album_id = OLD.album_id AND m.artist_ids @> ARRAY[aa.artistprofile_id]
+          );
+    END IF;
+
+    IF TG_OP <> 'DELETE' AND NEW.album_id IS NOT NULL THEN
+        INSERT INTO core_album_artists (id, album_id, artistprofile_id)
+        SELECT core_uuid7(), NEW.album_id, artist_id FROM unnest(NEW.artist_ids) AS artist_id
+        ON CONFLICT (album_id, artistprofile_id) DO NOTHING;
+    END IF;
+
+    -- A track is inserted before its artists are linked, so it passes through an album of
+    -- its title without an artist. Drop an album once its last track leaves, unless an
+    -- open transaction is adding a track to it.
+    IF TG_OP <> 'INSERT' AND OLD.album_id IS NOT NULL AND OLD.album_id IS DISTINCT FROM NEW.album_id
+       AND NOT EXISTS (SELECT 1 FROM core_music m WHERE m.album_id = OLD.album_id) THEN
+        WITH removed AS (
+            DELETE FROM core_album WHERE id IN (SELECT id FROM core_album WHERE id = OLD.album_id FOR UPDATE SKIP LOCKED)
+            RETURNING id
+        )
+        DELETE FROM core_album_artists WHERE album_id IN (SELECT id FROM removed);
+    END IF;
+
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER core_music_set_album BEFORE INSERT OR UPDATE OF album_name, artist_ids ON core_music
+    FOR EACH ROW EXECUTE FUNCTION core_music_set_album();
+CREATE TRIGGER core_music_album_artists AFTER INSERT OR DELETE ON core_music
+    FOR EACH ROW EXECUTE FUNCTION core_music_sync_album_artists();
+CREATE TRIGGER core_music_album_artists_changed AFTER UPDATE ON core_music
+    FOR EACH ROW WHEN (OLD.album_id IS DISTINCT FROM NEW.album_id OR OLD.artist_ids IS DISTINCT FROM NEW.artist_ids)
+    EXECUTE FUNCTION core_music_sync_album_artists();
+"""
+
+DROP_ALBUM_FUNCTIONS = """
+DROP TRIGGER IF EXISTS core_music_set_album ON core_music;
+DROP TRIGGER IF EXISTS core_music_album_artists ON core_music;
+DROP TRIGGER IF EXISTS core_music_album_artists_changed ON core_music;
+DROP FUNCTION IF EXISTS core_music_sync_album_artists();
+DROP FUNCTION IF EXISTS core_music_set_album();
+DROP FUNCTION IF EXISTS core_album_for_title(text, uuid);
+DROP FUNCTION IF EXISTS core_normalize_album_title(text);
+DROP FUNCTION IF EXISTS core_uuid7();
+"""
+
+
+def backfill_albums(apps, schema_editor):
+    """Create albums from the distinct album names and primary artists and link tracks, one committed batch at a time.
+
+    Case and whitespace variants by the same primary artist share one album; it takes the most common
+    spelling in the first batch that sees it. Linking a track fires the album artists trigger.
+    """
+
+    connection = schema_editor.connection
+    last_id = None
+
+    while True:
+        with transaction.atomic(using=connection.alias), connection.cursor() as c:
+            c.execute(
+                "SELECT id FROM core_music WHERE %s::uuid IS NULL OR id > %s::uuid ORDER BY id LIMIT %s;",
+                [last_id, last_id, BACKFILL_BATCH_SIZE],
+            )
+            batch = [row[0] for row in c.fetchall()]
+
+            if not batch:
+                return
+
+            c.execute(
+                r"""
+                INSERT INTO core_album (id, title, normalized_title, primary_artist_id, created, modified)
+                SELECT core_uuid7(), mode() WITHIN GROUP (ORDER BY btrim(regexp_replace(album_name, '\s+', ' ', 'g'))), normalized, artist_id, now(), now()
+                FROM (
+                    SELECT album_name, core_normalize_album_title(album_name) AS normalized, artist_ids[1] AS artist_id
+                    FROM core_music WHERE id = ANY(%s)
+                ) AS names
+                WHERE normalized IS NOT NULL
+                GROUP BY normalized, artist_id
+                ON CONFLICT (normalized_title, primary_artist_id) DO NOTHING;
+                """,
+                [batch],
+            )
+            c.execute(
+                "UPDATE core_music m SET album_id = a.id FROM core_album a "
+                "WHERE m.id = ANY(%s) AND a.normalized_title = core_normalize_album_title(m.album_name) "
+                "AND a.primary_artist_id IS NOT DISTINCT FROM m.artist_ids[1];",
+                [batch],
+            )
+
+        last_id = batch[-1]
+
+
+class Migration(migrations.Migration):
+
+    # The backfill commits each batch on its own.
+    atomic = False
+
+    dependencies = [
+        ('core', '0011_music_artist_arrays'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Album',
+            fields=[
+                ('created', model_utils.fields.AutoCreatedField(default=django.utils.timezone.now, editable=False, verbose_name='created')),
+                ('modified', model_utils.fields.AutoLastModifiedField(default=django.utils.timezone.now, editable=False, verbose_name='modified')),
+                ('id', models.UUIDField(default=apps.core.utils.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=100, verbose_name='Title')),
+                ('normalized_title', models.CharField(editable=False, max_length=100, verbose_name='Normalized Title')),
+                ('primary_artist', models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='primary_albums', to='core.artistprofile')),
+            ],
+            options={
+                'verbose_name': 'Album',
+            },
+        ),
+        migrations.AddField(
+            model_name='music',
+            name='album',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='tracks', to='core.album'),
+        ),
+        migrations.CreateModel(
+            name='AlbumArtists',
+            fields=[
+                ('id', models.UUIDField(default=apps.core.utils.uuid7, editable=False, primary_key=True, serialize=False)),
+                ('album', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.album')),
+                ('artistprofile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='core.artistprofile')),
+            ],
+            options={
+                'verbose_name': 'Album Artist',
+                'verbose_name_plural': 'Album Artists',
+                'db_table': 'core_album_artists',
+            },
+        ),
+        migrations.AddField(
+            model_name='album',
+            name='artists',
+            field=models.ManyToManyField(related_name='albums', through='core.AlbumArtists', to='core.artistprofile'),
+        ),
+        migrations.AddConstraint(
+            model_name='album',
+            constraint=models.UniqueConstraint(fields=('normalized_title', 'primary_artist'), name='core_album_title_artist_unique', nulls_distinct=False),
+        ),
+        migrations.AddConstraint(
+            model_name='albumartists',
+            constraint=models.UniqueConstraint(fields=('album', 'artistprofile'), name='core_album_artists_unique'),
+        ),
+        migrations.RunSQL(sql=ALBUM_FUNCTIONS, reverse_sql=DROP_ALBUM_FUNCTIONS),
+        migrations.RunPython(backfill_albums, migrations.RunPython.noop),
+    ]
@@ -6,15 +6,28 @@ from typing import ClassVar
 
 from django.contrib.auth import get_user_model
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.core.exceptions import ValidationError
 from django.db import models
+from django.db.models.functions import Lower
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 from model_utils.choices import Choices
-from model_utils.models import TimeStampedModel, UUIDModel
+from model_utils.models import TimeStampedModel
 
 from .managers import UserManager
+from .utils import uuid7
+
+
+class UUIDModel(models.Model):
+    """Abstract model with a time-ordered UUID primary key."""
+
+    id = models.UUIDField(primary_key=True, default=uuid7, editable=False)
+
+    class Meta:
+        abstract = True
 
 
 class User(AbstractBaseUser, PermissionsMixin, UUIDModel, TimeStampedModel):
@@ -32,6 +45,11 @@ class User(AbstractBaseUser, PermissionsMixin, UUIDModel, TimeStampedModel):
 
     class Meta:
         verbose_name = "User"
+        indexes = [
+            # Serves case-insensitive email prefix search (lower(email) LIKE 'abc%').
+            models.Index(OpClass(Lower("email"), name="text_pattern_ops"), name="core_user_email_lower_like_idx"),
+            models.Index(fields=["date_joined"], name="core_user_date_joined_idx"),
+        ]
 
     def __str__(self) -> str:
         """String representation of the model."""
@@ -93,9 +111,15 @@ class ArtistProfile(Profile):
     name = models.CharField(_("Name"), max_length=50, null=True, blank=True)
     first_release_year = models.IntegerField(_("First Release Year"), null=True, blank=True)
     no_of_albums_released = models.IntegerField(_("Number of Albums Released"), null=True, blank=True)
+    # Id of the last writing transaction, set by a trigger (migration 0009); orders the change feed.
+    change_xid = models.BigIntegerField(_("Change Transaction"), db_default=0, editable=False)
 
     class Meta:
         verbose_name = "Artist Profile"
+        indexes = [
+            # Serves the change feed's keyset scan over (change_xid, id).
+            models.Index(fields=["change_xid", "id"], name="core_artist_change_xid_id_idx"),
+        ]
 
     def __str__(self) -> str:
         """String representation of the model."""
@@ -108,6 +132,33 @@ class ArtistProfile(Profile):
         return reverse("artist_profile:detail", kwargs={"pk": self.id})
 
 
+class Album(UUIDModel, TimeStampedModel):
+    """Album that tracks are grouped into, derived from ``Music.album_name`` by database triggers.
+
+    An album is identified by its normalized title and the first linked artist of its tracks.
+    """
+
+    title = models.CharField(_("Title"), max_length=100)
+    normalized_title = models.CharField(_("Normalized Title"), max_length=100, editable=False)
+    primary_artist = models.ForeignKey(
+        ArtistProfile, null=True, on_delete=models.CASCADE, related_name="primary_albums", editable=False
+    )
+    artists = models.ManyToManyField(ArtistProfile, related_name="albums", through="AlbumArtists")
+
+    class Meta:
+        verbose_name = "Album"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["normalized_title", "primary_artist"], name="core_album_title_artist_unique", nulls_distinct=False
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """String representation of the model."""
+
+        return self.title
+
+
 class Music(UUIDModel, TimeStampedModel):
     """Database model definition for music."""
 
@@ -123,9 +174,23 @@ class Music(UUIDModel, TimeStampedModel):
     album_name = models.CharField(_("Album Name"), max_length=100, null=True, blank=True)
     release_date = models.DateTimeField(_("Release Date"), null=True, blank=True, validators=[validate_date])
     genre = models.CharField(_("Genre"), max_length=8, choices=GENRE_CHOICES, default=GENRE_CHOICES.rnb)
+    # Set from album_name and the first linked artist by a trigger (migration 0012).
+    album = models.ForeignKey(Album, null=True, blank=True, on_delete=models.SET_NULL, related_name="tracks", editable=False)
+    # Copies of the linked artists, kept in step by database triggers (migration 0011).
+    artist_ids = ArrayField(models.UUIDField(), verbose_name=_("Artist IDs"), db_default="{}", editable=False)
+    artist_names = ArrayField(
+        models.CharField(max_length=50, null=True), verbose_name=_("Artist Names"), db_default="{}", editable=False
+    )
+    # Id of the last writing transaction, set by a trigger (migration 0009); orders the change feed.
+    change_xid = models.BigIntegerField(_("Change Transaction"), db_default=0, editable=False)
 
     class Meta:
         verbose_name = "Music"
+        indexes = [
+            # Serves the change feed's keyset scan over (change_xid, id).
+            models.Index(fields=["change_xid", "id"], name="core_music_change_xid_id_idx"),
+            GinIndex(fields=["artist_ids"], name="core_music_artist_ids_idx"),
+        ]
 
     def __str__(self) -> str:
         """String representation of the model."""
@@ -148,3 +213,72 @@ class MusicArtists(UUIDModel):
         db_table = "core_music_artists"
         verbose_name = "Music Artist"
         verbose_name_plural = "Music Artists"
+
+
+class AlbumArtists(UUIDModel):
+    """Artists with at least one track on an album, kept by database triggers."""
+
+    album = models.ForeignKey("Album", on_delete=models.CASCADE)
+    artistprofile = models.ForeignKey("ArtistProfile", on_delete=models.CASCADE)
+
+    class Meta:
+        db_table = "core_album_artists"
+        verbose_name = "Album Artist"
+        verbose_name_plural = "Album Artists"
+        constraints = [
+            models.UniqueConstraint(fields=["album", "artistprofile"], name="core_album_artists_unique"),
+        ]
+
+
+class Job(UUIDModel, TimeStampedModel):
+    """Background job stored in Postgres and run by the ``run_workers`` command."""
+
+    STATUS_CHOICES = Choices("queued", "running", "succeeded", "failed")
+
+    kind = models.CharField(_("Kind"), max_length=50)
+    status = models.CharField(_("Status"), max_length=10, choices=STATUS_CHOICES, default=STATUS_CHOICES.queued)
+    payload = models.JSONField(_("Payload"), default=dict, blank=True)
+    result = models.JSONField(_("Result"), null=True, blank=True)
+    error = models.TextField(_("Error"), null=True, blank=True)
+    progress = models.PositiveSmallIntegerField(_("Progress (%)"), default=0)
+    attempts = models.PositiveSmallIntegerField(_("Attempts"), default=0)
+    run_after = models.DateTimeField(_("Run After"), default=timezone.now)
+    started = models.DateTimeField(_("Started"), null=True, blank=True)
+    finished = models.DateTimeField(_("Finished"), null=True, blank=True)
+    created_by = models.ForeignKey(get_user_model(), null=True, blank=True, on_delete=models.SET_NULL, related_name="jobs")
+
+    class Meta:
+        verbose_name = "Job"
+        indexes = [
+            models.Index(fields=["run_after"], name="core_job_queued_idx", condition=models.Q(status="queued")),
+            models.Index(fields=["modified"], name="core_job_running_idx", condition=models.Q(status="running")),
+            models.Index(fields=["kind", "created"], name="core_job_kind_created_idx"),
+        ]
+
+    def __str__(self) -> str:
+        """String representation of the model."""
+
+        return f"{self.kind} ({self.status})"
+
+
+class Tombstone(UUIDModel):
+    """Deleted artist or music, reported by the change feeds until it is purged."""
+
+    KIND_CHOICES = Choices("artist", "music")
+
+    kind = models.CharField(_("Kind"), max_length=10, choices=KIND_CHOICES)
+    object_id = models.UUIDField(_("Object ID"))
+    deleted = models.DateTimeField(_("Deleted"), default=timezone.now)
+    # Id of the deleting transaction, set by a trigger (migration 0009).
+    change_xid = models.BigIntegerField(_("Change Transaction"), db_default=0, editable=False)
+
+    class Meta:
+        verbose_name = "Tombstone"
+        indexes = [
+            models.Index(fields=["kind", "change_xid", "object_id"], name="core_tombstone_feed_idx"),
+        ]
+
+    def __str__(self) -> str:
+        """String representation of the model."""
+
+        return f"{self.kind} {self.object_id}"
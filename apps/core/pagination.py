@@ -0,0 +1,107 @@
+"""
+Pagination For Raw SQL Queries And The Admin.
+"""
+
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class SQLPagination(PageNumberPagination):
+    """Page number pagination that lets Postgres apply LIMIT and OFFSET.
+
+    Responses keep the ``count``/``next``/``previous``/``results`` shape of
+    ``PageNumberPagination``, but only one page of rows leaves the database.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+
+    def paginate_sql(self, request: Request, cursor, sql: str, params: list) -> list[dict]:
+        """Run ``sql`` (without a trailing semicolon) for the requested page and return its rows."""
+
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+
+        try:
+            self.page_number = int(request.query_params.get(self.page_query_param, 1))
+        except ValueError:
+            raise NotFound("Invalid page.") from None
+
+        if self.page_number < 1:
+            raise NotFound("Invalid page.")
+
+        cursor.execute(f"SELECT count(*) FROM ({sql}) AS counted;", params)  # noqa: S608
+        self.count = cursor.fetchone()[0]
+
+        cursor.execute(
+            f"{sql} LIMIT %s OFFSET %s;",
+            [*params, self.page_size_value, (self.page_number - 1) * self.page_size_value],
+        )
+        columns = [col[0] for col in cursor.description]
+
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def get_next_link(self):
+        if self.page_number * self.page_size_value >= self.count:
+            return None
+
+        return replace_query_param(self.request.build_absolute_uri(), self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page_number <= 1:
+            return None
+
+        url = self.request.build_absolute_uri()
+
+        if self.page_number == 2:
+            return remove_query_param(url, self.page_query_param)
+
+        return replace_query_param(url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response(self, data):
+        return Response(
+            OrderedDict(
+                [
+                    ("count", self.count),
+                    ("next", self.get_next_link()),
+                    ("previous", self.get_previous_link()),
+                    ("results", data),
+                ]
+            )
+        )
+
+
+class EstimatedCountPaginator(Paginator):
+    """Admin paginator that uses the planner's row estimate for large unfiltered tables.
+
+    Filtered querysets and tables below ``ADMIN_ESTIMATED_COUNT_THRESHOLD`` rows
+    still get an exact ``COUNT(*)``.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        query = getattr(queryset, "query", None)
+
+        if query is not None and not query.where:
+            with connections[queryset.db].cursor() as c:
+                c.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass;",
+                    [queryset.model._meta.db_table],
+                )
+                row = c.fetchone()
+
+            if row and row[0] >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return row[0]
+
+        return super().count
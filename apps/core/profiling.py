@@ -0,0 +1,110 @@
+"""
+On-Demand Request Profiling.
+
+Staff users can send ``X-Profile: cpu`` or ``X-Profile: memory`` (or the
+``?profile=`` query flag) to run one request under cProfile or tracemalloc.
+The result is saved to ``PROFILES_DIR`` and its download URL is returned in
+the ``X-Profile`` response header.
+"""
+
+import cProfile
+import re
+import threading
+import tracemalloc
+from pathlib import Path
+
+from django.conf import settings
+from django.urls import reverse
+from django.utils import timezone
+from knox.auth import TokenAuthentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from .metrics import view_name
+
+PROFILE_MODES = ("cpu", "memory")
+TRACEMALLOC_FRAMES = 25
+MEMORY_REPORT_LINES = 50
+
+# tracemalloc is process-wide and cProfile can only run once per thread, so profile one request at a time.
+_profile_lock = threading.Lock()
+
+
+def is_staff_request(request) -> bool:
+    """Check the session user, or the knox token before DRF has authenticated the request."""
+
+    user = getattr(request, "user", None)
+
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+
+    try:
+        authenticated = TokenAuthentication().authenticate(request)
+    except AuthenticationFailed:
+        return False
+
+    return bool(authenticated and authenticated[0].is_staff)
+
+
+def memory_report(snapshot: tracemalloc.Snapshot, peak: int) -> str:
+    """Summarize the allocations still alive at the end of the request."""
+
+    stats = snapshot.statistics("traceback")
+    lines = [
+        f"Peak traced memory: {peak / 2**20:.1f} MiB",
+        f"Live at end of request: {sum(stat.size for stat in stats) / 2**20:.1f} MiB",
+        "",
+    ]
+
+    for stat in stats[:MEMORY_REPORT_LINES]:
+        lines.append(f"{stat.size / 1024:.1f} KiB in {stat.count} blocks")
+        lines.extend(f"    {line}" for line in stat.traceback.format())
+
+    return "\n".join(lines)
+
+
+class ProfilerMiddleware:
+    """Profile a request when a staff user asks for it; other requests only pay for a header lookup."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = request.headers.get("X-Profile") or request.GET.get("profile")
+
+        if mode not in PROFILE_MODES or not is_staff_request(request):
+            return self.get_response(request)
+
+        if not _profile_lock.acquire(blocking=False):
+            response = self.get_response(request)
+            response["X-Profile"] = "busy"
+            return response
+
+        try:
+            if mode == "cpu":
+                profiler = cProfile.Profile()
+                response = profiler.runcall(self.get_response, request)
+                name = self._name(request, "prof")
+                profiler.dump_stats(Path(settings.PROFILES_DIR) / name)
+            else:
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                try:
+                    response = self.get_response(request)
+                    snapshot = tracemalloc.take_snapshot()
+                    peak = tracemalloc.get_traced_memory()[1]
+                finally:
+                    tracemalloc.stop()
+                name = self._name(request, "txt")
+                (Path(settings.PROFILES_DIR) / name).write_text(memory_report(snapshot, peak))
+        finally:
+            _profile_lock.release()
+
+        response["X-Profile"] = request.build_absolute_uri(reverse("download_profile", args=[name]))
+
+        return response
+
+    def _name(self, request, suffix: str) -> str:
+        Path(settings.PROFILES_DIR).mkdir(parents=True, exist_ok=True)
+
+        view = re.sub(r"[^\w-]", "_", view_name(request))
+
+        return f"{timezone.now():%Y%m%dT%H%M%S%f}-{view}.{suffix}"
@@ -0,0 +1,127 @@
+"""
+Shared SQL Builders.
+"""
+
+import uuid
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Mapping, Sequence
+
+from django.utils import timezone
+
+BULK_UPDATE_CHUNK_SIZE = 500
+BULK_UPDATE_MAX_ROWS = 10_000
+
+
+def provided_fields(data: Mapping, columns: Iterable[str]) -> dict:
+    """Pick the writable columns that are present (and not null) in the request data."""
+
+    return {column: data[column] for column in columns if data.get(column) is not None}
+
+
+def build_partial_update(table: str, id: str, values: Mapping, returning: Sequence[str]) -> tuple[str, list]:
+    """Build one UPDATE statement that only sets the provided columns.
+
+    Column names must come from the view's whitelist, never from the request.
+    The row's ``modified`` timestamp is always refreshed. When no row matches
+    the id, the statement returns nothing.
+    """
+
+    assignments = [f"{column} = %s" for column in values] + ["modified = %s"]
+    sql = f"UPDATE {table} SET {', '.join(assignments)} WHERE id = %s RETURNING {', '.join(returning)};"  # noqa: S608
+    params = [*values.values(), timezone.now(), id]
+
+    return sql, params
+
+
+def build_bulk_update(table: str, column_types: Mapping[str, str], rows: Sequence[tuple[str, Mapping]]) -> tuple[str, list]:
+    """Build one UPDATE ... FROM (VALUES ...) statement for rows that set the same columns.
+
+    ``rows`` holds ``(id, values)`` pairs and every ``values`` mapping must have the
+    keys of ``column_types``, which maps whitelisted column names to SQL types.
+    The statement returns the ids of the rows that were found and updated.
+    """
+
+    columns = list(column_types)
+    placeholders = ", ".join(["%s::uuid", *(f"%s::{column_types[column]}" for column in columns)])
+    values = ", ".join([f"({placeholders})"] * len(rows))
+    assignments = ", ".join([*(f"{column} = v.{column}" for column in columns), "modified = %s"])
+
+    sql = f"UPDATE {table} AS t SET {assignments} FROM (VALUES {values}) AS v(id, {', '.join(columns)}) WHERE t.id = v.id RETURNING t.id;"  # noqa: S608
+    params = [timezone.now()]
+    for id, row in rows:
+        params += [id, *(row[column] for column in columns)]
+
+    return sql, params
+
+
+def prepare_bulk_updates(
+    items: Sequence, columns: Iterable[str], validate: Callable[[dict], str | None] | None = None
+) -> tuple[list[dict], list[tuple[str, dict]]]:
+    """Check each requested change and return per-row results plus the valid updates.
+
+    Valid rows get the status ``pending`` until the update has run.
+    """
+
+    results = []
+    updates = []
+    seen = set()
+
+    for item in items:
+        id = item.get("id") if isinstance(item, Mapping) else None
+
+        try:
+            id = str(uuid.UUID(str(id)))
+        except ValueError:
+            results.append({"id": id, "status": "invalid", "message": "A valid id is required."})
+            continue
+
+        fields = provided_fields(item, columns)
+
+        if id in seen:
+            message = "Duplicate id in request."
+        elif not fields:
+            message = "No fields to update."
+        else:
+            message = validate(fields) if validate else None
+
+        if message:
+            results.append({"id": id, "status": "invalid", "message": message})
+            continue
+
+        seen.add(id)
+        updates.append((id, fields))
+        results.append({"id": id, "status": "pending"})
+
+    return results, updates
+
+
+def run_bulk_update(cursor, table: str, column_types: Mapping[str, str], updates: Sequence[tuple[str, Mapping]]) -> set[str]:
+    """Apply partial updates with one statement per chunk of rows that change the same columns.
+
+    Returns the ids of the rows that were updated.
+    """
+
+    groups = defaultdict(list)
+    for id, values in updates:
+        groups[tuple(column for column in column_types if column in values)].append((id, values))
+
+    updated = set()
+    for columns, rows in groups.items():
+        types = {column: column_types[column] for column in columns}
+
+        for start in range(0, len(rows), BULK_UPDATE_CHUNK_SIZE):
+            sql, params = build_bulk_update(table, types, rows[start : start + BULK_UPDATE_CHUNK_SIZE])
+            cursor.execute(sql, params)
+            updated.update(str(row[0]) for row in cursor.fetchall())
+
+    return updated
+
+
+def finish_bulk_results(results: list[dict], updated: set[str]) -> list[dict]:
+    """Resolve pending rows to ``updated`` or ``not_found``."""
+
+    for result in results:
+        if result["status"] == "pending":
+            result["status"] = "updated" if result["id"] in updated else "not_found"
+
+    return results
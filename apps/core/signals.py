@@ -0,0 +1,17 @@
+"""
+Record tombstones for artists and musics deleted through the ORM, e.g. in the admin.
+"""
+
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import ArtistProfile, Music, Tombstone
+
+
+@receiver(post_delete, sender=ArtistProfile)
+@receiver(post_delete, sender=Music)
+def record_tombstone_handler(sender, instance, **kwargs):  # noqa
+    """Let change feed clients see deletes that bypass the API views."""
+
+    kind = Tombstone.KIND_CHOICES.artist if sender is ArtistProfile else Tombstone.KIND_CHOICES.music
+    Tombstone.objects.create(kind=kind, object_id=instance.id)
@@ -0,0 +1,159 @@
+"""
+Slow Query Log.
+
+An execute wrapper on every database connection logs statements slower than
+``SLOW_QUERY_MS`` together with their redacted parameters, the code that ran
+them and the planner's EXPLAIN output. ``manage.py slow_queries`` aggregates
+the log by normalized statement.
+"""
+
+import logging
+import re
+import threading
+import time
+import traceback
+
+from django.conf import settings
+from django.db import DatabaseError, transaction
+
+logger = logging.getLogger(__name__)
+
+REDACTED = "[redacted]"
+SENSITIVE_COLUMN = re.compile(r"password|token|digest|secret|salt|key|email", re.IGNORECASE)
+SECRET_VALUE_PREFIXES = ("argon2", "pbkdf2_", "bcrypt")
+EXPLAINABLE = re.compile(r"^\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", re.IGNORECASE)
+INSERT_COLUMNS = re.compile(r"INSERT\s+INTO\s+\S+\s*\(([^)]*)\)\s*(?:VALUES|SELECT)", re.IGNORECASE)
+COMPARED_COLUMN = re.compile(
+    r"([\w\"]+)\)?\s*(?:=|<>|!=|<=|>=|<|>|(?:NOT\s+)?I?LIKE|IN\s*\(|=\s*ANY\s*\()\s*(?:lower\()?$", re.IGNORECASE
+)
+
+_state = threading.local()
+
+
+def placeholder_columns(sql: str) -> list[str | None]:
+    """Guess the column each ``%s`` placeholder is bound to."""
+
+    positions = [match.start() for match in re.finditer(r"%s", sql)]
+    insert = INSERT_COLUMNS.search(sql)
+    insert_columns = [column.strip().strip('"') for column in insert.group(1).split(",")] if insert else []
+
+    columns = []
+    for index, position in enumerate(positions):
+        compared = COMPARED_COLUMN.search(sql[max(0, position - 80) : position])
+
+        if compared:
+            columns.append(compared.group(1).strip('"'))
+        elif insert_columns and position > insert.end():
+            columns.append(insert_columns[index % len(insert_columns)])
+        else:
+            columns.append(None)
+
+    return columns
+
+
+def redact_params(sql: str, params) -> list | None:
+    """Replace parameters bound to sensitive columns, or that look like secrets, with a marker."""
+
+    if params is None:
+        return None
+
+    if isinstance(params, dict):
+        return {key: REDACTED if SENSITIVE_COLUMN.search(key) else value for key, value in params.items()}
+
+    redacted = []
+    for column, value in zip(placeholder_columns(sql), params, strict=False):
+        if (column and SENSITIVE_COLUMN.search(column)) or (
+            isinstance(value, str) and value.startswith(SECRET_VALUE_PREFIXES)
+        ):
+            redacted.append(REDACTED)
+        else:
+            redacted.append(value)
+
+    return redacted
+
+
+def calling_code() -> str:
+    """Return ``file:line in function`` of the innermost project frame outside this module."""
+
+    for frame in reversed(traceback.extract_stack()):
+        if "/apps/" in frame.filename and not frame.filename.endswith("slow_queries.py"):
+            return f"{frame.filename[frame.filename.rindex('/apps/') + 1 :]}:{frame.lineno} in {frame.name}"
+
+    return "unknown"
+
+
+def explain(connection, sql: str, params) -> list | str:
+    """Return the JSON plan of a statement without running it."""
+
+    try:
+        with transaction.atomic(using=connection.alias), connection.cursor() as c:
+            c.execute(f"EXPLAIN (ANALYZE off, FORMAT JSON) {sql}", params)
+            plan = c.fetchone()[0]
+    except DatabaseError as exc:
+        return f"EXPLAIN failed: {exc}"
+
+    return plan
+
+
+def log_slow_queries(execute, sql, params, many, context):
+    """Execute wrapper that logs statements slower than ``SLOW_QUERY_MS``.
+
+    Statements that fail are logged too, with their error, since a statement
+    cancelled by ``statement_timeout`` is usually the slowest of all.
+    """
+
+    if getattr(_state, "explaining", False):
+        return execute(sql, params, many, context)
+
+    started = time.perf_counter()
+    error = None
+
+    try:
+        return execute(sql, params, many, context)
+    except Exception as exc:
+        error = exc
+        raise
+    finally:
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        if duration_ms >= settings.SLOW_QUERY_MS:
+            log_slow_query(context["connection"], sql, params, many, duration_ms, error)
+
+
+def log_slow_query(connection, sql: str, params, many: bool, duration_ms: float, error: Exception | None):
+    """Log one slow or failed statement, with its plan when it can still be explained."""
+
+    # A failed statement leaves its transaction aborted, so it can only be explained outside one.
+    explainable = error is None or (isinstance(error, DatabaseError) and not connection.in_atomic_block)
+    plan = None
+
+    if settings.SLOW_QUERY_EXPLAIN and not many and explainable and EXPLAINABLE.match(sql):
+        _state.explaining = True
+        try:
+            plan = explain(connection, sql, params)
+        finally:
+            _state.explaining = False
+
+    caller = calling_code()
+    logger.warning(
+        "Slow query (%.0f ms) in %s%s",
+        duration_ms,
+        caller,
+        f" failed: {error}" if error else "",
+        extra={
+            "duration_ms": round(duration_ms, 1),
+            "sql": sql,
+            "params": None if many else redact_params(sql, params),
+            "many": many,
+            "caller": caller,
+            "plan": plan,
+            "error": f"{type(error).__name__}: {error}" if error else None,
+        },
+    )
+
+
+def install_slow_query_log(sender, connection, **kwargs):
+    """``connection_created`` receiver that adds the wrapper once per connection."""
+
+    if log_slow_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(log_slow_queries)
@@ -0,0 +1,26 @@
+"""
+Common Utilities.
+"""
+
+import os
+import time
+import uuid
+
+
+def uuid7() -> uuid.UUID:
+    """Generate a time-ordered UUID (version 7).
+
+    The leading 48 bits hold the Unix timestamp in milliseconds, so keys created
+    around the same time land on neighbouring index pages instead of random ones.
+    """
+
+    timestamp_ms = time.time_ns() // 1_000_000
+    rand = int.from_bytes(os.urandom(10), "big")
+
+    value = (timestamp_ms & 0xFFFF_FFFF_FFFF) << 80
+    value |= 0x7 << 76
+    value |= ((rand >> 62) & 0xFFF) << 64
+    value |= 0b10 << 62
+    value |= rand & 0x3FFF_FFFF_FFFF_FFFF
+
+    return uuid.UUID(int=value)
@@ -34,10 +34,21 @@ def password_validation(password: str) -> bool:
 
 
 def date_validation(date_str: datetime) -> bool:
-    """Validate date."""
+    """Validate date.
+
+    Raise ValueError when ``date_str`` is not a date or datetime.
+    """
 
     parsed_date = dateparse.parse_datetime(date_str)
 
+    if parsed_date is None:
+        parsed = dateparse.parse_date(date_str)
+
+        if parsed is None:
+            raise ValueError(f"Invalid date: {date_str!r}")
+
+        parsed_date = datetime.datetime.combine(parsed, datetime.time())
+
     if not timezone.is_aware(parsed_date):
         parsed_date = timezone.make_aware(parsed_date)
 
@@ -0,0 +1,120 @@
+"""
+Views For Core App.
+"""
+
+import hashlib
+import re
+import threading
+from pathlib import Path
+
+import yaml
+from django.conf import settings
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified
+from django.utils import translation
+from django.utils.cache import patch_cache_control
+from django.utils.crypto import constant_time_compare
+from drf_spectacular.utils import extend_schema
+from drf_spectacular.views import SpectacularAPIView
+from prometheus_client import CONTENT_TYPE_LATEST
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from .metrics import render_metrics
+
+_schemas: dict[tuple, tuple[bytes, str]] = {}
+_schemas_lock = threading.Lock()
+
+
+class CachedSpectacularAPIView(SpectacularAPIView):
+    """Serve the OpenAPI schema from memory instead of introspecting every view per request.
+
+    With ``API_SCHEMA_CACHE`` on, the schema is read from ``API_SCHEMA_FILE`` (written by
+    ``manage.py spectacular --file``) or generated once, then rendered once per format.
+    Responses carry an ETag so clients can revalidate with a 304.
+    """
+
+    def _get_schema_response(self, request):
+        if not settings.API_SCHEMA_CACHE:
+            return super()._get_schema_response(request)
+
+        version = self.api_version or request.version or self._get_version_parameter(request)
+        renderer = request.accepted_renderer
+        key = (renderer.media_type, version, translation.get_language())
+
+        if key not in _schemas:
+            with _schemas_lock:
+                if key not in _schemas:
+                    content = renderer.render(self._load_schema(request, version), renderer_context={})
+                    _schemas[key] = (content, f'"{hashlib.sha256(content).hexdigest()}"')
+
+        content, etag = _schemas[key]
+
+        if etag in request.headers.get("If-None-Match", ""):
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(content, content_type=f"{request.accepted_media_type}; charset={renderer.charset}")
+            response["Content-Disposition"] = f'inline; filename="{self._get_filename(request, version)}"'
+
+        response["ETag"] = etag
+        patch_cache_control(response, public=True, max_age=settings.API_SCHEMA_MAX_AGE)
+
+        return response
+
+    def _load_schema(self, request, version) -> dict:
+        """Read the pre-generated schema file, or generate the schema when there is none."""
+
+        schema_file = Path(settings.API_SCHEMA_FILE)
+
+        if version is None and schema_file.is_file():
+            with schema_file.open() as f:
+                return yaml.load(f, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))  # noqa: S506
+
+        generator = self.generator_class(urlconf=self.urlconf, api_version=version, patterns=self.patterns)
+
+        return generator.get_schema(request=request, public=self.serve_public)
+
+
+class HasMetricsToken(permissions.BasePermission):
+    """Allow requests that send ``METRICS_TOKEN`` as a bearer token."""
+
+    def has_permission(self, request, view):
+        token = settings.METRICS_TOKEN
+
+        return bool(token) and constant_time_compare(request.headers.get("Authorization", ""), f"Bearer {token}")
+
+
+@extend_schema(exclude=True)
+@api_view(["GET"])
+@permission_classes([HasMetricsToken | permissions.IsAdminUser])
+def metrics(request: Request):
+    """Expose Prometheus metrics to scrapers with ``METRICS_TOKEN`` and to staff.
+
+    Only routed when ``METRICS_ENABLED`` is set.
+    """
+
+    return HttpResponse(render_metrics(), content_type=CONTENT_TYPE_LATEST)
+
+
+@extend_schema(
+    operation_id="download_profile",
+    responses={
+        (200, "application/octet-stream"): bytes,
+        (404, "application/json"): {"example": {"message": "Profile not found."}},
+    },
+)
+@api_view(["GET"])
+@permission_classes([permissions.IsAdminUser])
+def download_profile(request: Request, name: str):
+    """Download a request profile recorded by ``ProfilerMiddleware``."""
+
+    if request.method == "GET":
+        path = Path(settings.PROFILES_DIR) / name
+
+        if not re.fullmatch(r"[\w.-]+", name) or not path.is_file():
+            return Response({"message": "Profile not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        return FileResponse(path.open("rb"), as_attachment=True, filename=name)
+
+    return Response({"message": "Invalid request method"}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,30 @@
+"""
+Admin Customization For Background Jobs.
+"""
+
+from django.contrib import admin
+
+from apps.core.models import Job
+from apps.core.pagination import EstimatedCountPaginator
+
+
+class JobAdmin(admin.ModelAdmin):
+    """Admin setup for background job monitoring."""
+
+    list_display = (
+        "kind",
+        "status",
+        "progress",
+        "attempts",
+        "created_by",
+        "created",
+        "finished",
+    )
+    list_filter = ("status", "kind")
+    raw_id_fields = ("created_by",)
+    ordering = ("-created",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+admin.site.register(Job, JobAdmin)
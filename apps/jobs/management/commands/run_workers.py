@@ -0,0 +1,63 @@
+"""
+Run background job workers.
+"""
+
+import multiprocessing
+import signal
+
+import django
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from apps.jobs.queue import work
+
+
+def _run_worker(stop_event, poll_interval: float):
+    """Worker process entry point."""
+
+    # Needed when processes are spawned rather than forked.
+    django.setup()
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    work(stop_event.is_set, poll_interval)
+
+
+class Command(BaseCommand):
+    help = "Run background job workers that poll the core_job queue."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=1, help="Number of worker processes.")
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.JOB_POLL_INTERVAL,
+            help="Seconds to sleep when the queue is empty.",
+        )
+
+    def handle(self, *args, **options):
+        workers = max(1, options["workers"])
+        poll_interval = options["poll_interval"]
+        stop_event = multiprocessing.Event()
+
+        def stop(signum, frame):
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        # Never share the parent's database connection with the children.
+        connections.close_all()
+
+        processes = [
+            multiprocessing.Process(target=_run_worker, args=(stop_event, poll_interval), name=f"job-worker-{number}")
+            for number in range(workers)
+        ]
+        for process in processes:
+            process.start()
+
+        self.stdout.write(self.style.SUCCESS(f"Started {workers} job worker(s)."))
+
+        for process in processes:
+            process.join()
+
+        self.stdout.write("Job workers stopped.")
@@ -0,0 +1,272 @@
+"""
+Postgres-Backed Job Queue.
+
+Jobs are rows in ``core_job``. Workers claim them with ``SELECT ... FOR UPDATE
+SKIP LOCKED`` so several processes can poll the same table without blocking
+each other or running a job twice.
+"""
+
+import json
+import logging
+import threading
+import time
+import traceback
+from collections.abc import Callable
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.utils import timezone
+from django.utils.module_loading import autodiscover_modules
+
+from apps.core.decorators import set_statement_timeout
+from apps.core.utils import uuid7
+
+logger = logging.getLogger(__name__)
+
+HANDLERS: dict[str, Callable] = {}
+# Kinds that must not run more often than JOB_MAX_ATTEMPTS allows, e.g. because a retry would repeat committed work.
+MAX_ATTEMPTS: dict[str, int] = {}
+
+# Advisory lock key that keeps workers from scheduling periodic jobs at the same time.
+PERIODIC_LOCK_ID = 2_029_030
+PERIODIC_CHECK_INTERVAL = 60
+
+
+def register(kind: str, max_attempts: int | None = None):
+    """Register the decorated function as the handler for a job kind.
+
+    Handlers are called as ``handler(payload, report_progress)`` and return a
+    JSON-serialisable result. A handler that raises is retried until the job
+    has run ``max_attempts`` times (default ``JOB_MAX_ATTEMPTS``).
+    """
+
+    def decorator(func: Callable) -> Callable:
+        HANDLERS[kind] = func
+
+        if max_attempts is not None:
+            MAX_ATTEMPTS[kind] = max_attempts
+
+        return func
+
+    return decorator
+
+
+def discover_handlers():
+    """Import the ``jobs`` module of every installed app."""
+
+    autodiscover_modules("jobs")
+
+
+def enqueue(kind: str, payload: dict | None = None, user_id: str | None = None) -> str:
+    """Queue a new job and return its id."""
+
+    now = timezone.now()
+
+    with connection.cursor() as c:
+        c.execute(
+            "INSERT INTO core_job(id, kind, status, payload, progress, attempts, run_after, created_by_id, created, modified) VALUES (%s, %s, 'queued', %s, 0, 0, %s, %s, %s, %s) RETURNING id;",
+            [
+                str(uuid7()),
+                kind,
+                json.dumps(payload or {}, cls=DjangoJSONEncoder),
+                now,
+                user_id,
+                now,
+                now,
+            ],
+        )
+
+        return str(c.fetchone()[0])
+
+
+def report_progress(job_id: str, progress: int):
+    """Store the job's progress in percent."""
+
+    with connection.cursor() as c:
+        c.execute(
+            "UPDATE core_job SET progress = %s, modified = %s WHERE id = %s;",
+            [max(0, min(100, int(progress))), timezone.now(), job_id],
+        )
+
+
+def heartbeat(job_id: str, stop: threading.Event):
+    """Touch a running job every ``JOB_HEARTBEAT_INTERVAL`` seconds until ``stop`` is set.
+
+    Runs in its own thread and connection, so it keeps beating while the
+    handler is inside a long statement or an open transaction.
+    """
+
+    try:
+        while not stop.wait(settings.JOB_HEARTBEAT_INTERVAL):
+            try:
+                with connection.cursor() as c:
+                    c.execute(
+                        "UPDATE core_job SET modified = %s WHERE id = %s AND status = 'running';",
+                        [timezone.now(), job_id],
+                    )
+            except Exception:
+                logger.warning("Heartbeat for job %s failed", job_id, exc_info=True)
+                connection.close()
+    finally:
+        connection.close()
+
+
+def requeue_stale_jobs() -> int:
+    """Requeue running jobs whose worker stopped sending heartbeats, or fail them after the last attempt."""
+
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=settings.JOB_STALE_AFTER)
+
+    with connection.cursor() as c:
+        c.execute(
+            "UPDATE core_job SET status = CASE WHEN attempts < COALESCE((%s::jsonb ->> kind)::int, %s) THEN 'queued' ELSE 'failed' END, error = CASE WHEN attempts < COALESCE((%s::jsonb ->> kind)::int, %s) THEN error ELSE 'Worker stopped responding.' END, modified = %s WHERE status = 'running' AND modified < %s;",
+            [
+                json.dumps(MAX_ATTEMPTS),
+                settings.JOB_MAX_ATTEMPTS,
+                json.dumps(MAX_ATTEMPTS),
+                settings.JOB_MAX_ATTEMPTS,
+                now,
+                stale_before,
+            ],
+        )
+
+        return c.rowcount
+
+
+def claim_job() -> tuple | None:
+    """Mark the oldest runnable job as running and return ``(id, kind, payload)``."""
+
+    now = timezone.now()
+
+    with connection.cursor() as c:
+        c.execute(
+            "UPDATE core_job SET status = 'running', attempts = attempts + 1, started = %s, modified = %s WHERE id = (SELECT id FROM core_job WHERE status = 'queued' AND run_after <= %s ORDER BY run_after FOR UPDATE SKIP LOCKED LIMIT 1) RETURNING id, kind, payload;",
+            [now, now, now],
+        )
+
+        return c.fetchone()
+
+
+def finish_job(job_id: str, status: str, result=None, error: str | None = None):
+    """Store the outcome of a job."""
+
+    now = timezone.now()
+
+    with connection.cursor() as c:
+        c.execute(
+            "UPDATE core_job SET status = %s, result = %s, error = %s, progress = CASE WHEN %s = 'succeeded' THEN 100 ELSE progress END, finished = %s, modified = %s WHERE id = %s;",
+            [
+                status,
+                json.dumps(result, cls=DjangoJSONEncoder) if result is not None else None,
+                error,
+                status,
+                now,
+                now,
+                job_id,
+            ],
+        )
+
+
+def retry_job(job_id: str, kind: str, error: str):
+    """Queue a failed job again after a backoff, or fail it once it has used its attempts."""
+
+    now = timezone.now()
+    max_attempts = MAX_ATTEMPTS.get(kind, settings.JOB_MAX_ATTEMPTS)
+
+    with connection.cursor() as c:
+        c.execute(
+            "UPDATE core_job SET status = CASE WHEN attempts < %s THEN 'queued' ELSE 'failed' END, run_after = %s + make_interval(secs => %s * attempts), error = %s, finished = CASE WHEN attempts < %s THEN NULL ELSE %s END, modified = %s WHERE id = %s;",
+            [max_attempts, now, settings.JOB_RETRY_DELAY, error, max_attempts, now, now, job_id],
+        )
+
+
+def schedule_periodic_jobs():
+    """Queue each kind in ``PERIODIC_JOBS`` unless one is pending or was created within its interval."""
+
+    now = timezone.now()
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as c:
+        c.execute("SELECT pg_try_advisory_xact_lock(%s);", [PERIODIC_LOCK_ID])
+
+        if not c.fetchone()[0]:
+            return
+
+        for kind, interval in settings.PERIODIC_JOBS.items():
+            c.execute(
+                "INSERT INTO core_job(id, kind, status, payload, progress, attempts, run_after, created, modified) SELECT %s, %s, 'queued', '{}', 0, 0, %s, %s, %s WHERE NOT EXISTS (SELECT 1 FROM core_job WHERE kind = %s AND created > %s) AND NOT EXISTS (SELECT 1 FROM core_job WHERE kind = %s AND status IN ('queued', 'running'));",
+                [
+                    str(uuid7()),
+                    kind,
+                    now,
+                    now,
+                    now,
+                    kind,
+                    now - timedelta(seconds=interval),
+                    kind,
+                ],
+            )
+
+
+def run_next_job() -> bool:
+    """Claim and run one job. Returns False when the queue is empty."""
+
+    claimed = claim_job()
+
+    if not claimed:
+        return False
+
+    job_id, kind, payload = claimed
+    payload = json.loads(payload) if isinstance(payload, str) else payload
+    handler = HANDLERS.get(kind)
+
+    if handler is None:
+        finish_job(job_id, "failed", error=f"No handler registered for job kind '{kind}'.")
+        return True
+
+    logger.info("Running job %s (%s)", job_id, kind)
+
+    set_statement_timeout(settings.STATEMENT_TIMEOUTS["job"])
+
+    stop = threading.Event()
+    beat = threading.Thread(target=heartbeat, args=(job_id, stop), name=f"job-heartbeat-{job_id}", daemon=True)
+    beat.start()
+
+    try:
+        result = handler(payload, lambda progress: report_progress(job_id, progress))
+    except Exception:
+        logger.exception("Job %s (%s) failed", job_id, kind)
+        retry_job(job_id, kind, traceback.format_exc())
+    else:
+        finish_job(job_id, "succeeded", result=result)
+    finally:
+        stop.set()
+        beat.join()
+
+    return True
+
+
+def work(should_stop: Callable[[], bool], poll_interval: float):
+    """Run jobs until ``should_stop`` returns True, sleeping while the queue is empty."""
+
+    discover_handlers()
+    next_schedule = 0.0
+
+    while not should_stop():
+        try:
+            if time.monotonic() >= next_schedule:
+                schedule_periodic_jobs()
+                next_schedule = time.monotonic() + PERIODIC_CHECK_INTERVAL
+
+            requeue_stale_jobs()
+            ran = run_next_job()
+        except Exception:
+            logger.exception("Job worker loop failed")
+            connection.close()
+            ran = False
+
+        if not ran:
+            time.sleep(poll_interval)
+
+    connection.close()
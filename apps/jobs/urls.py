@@ -0,0 +1,12 @@
+"""
+URLs For Background Jobs.
+"""
+
+from django.urls import path
+
+from .views import download_job_file, get_job
+
+urlpatterns = [
+    path("<uuid:id>/", get_job, name="get_job"),
+    path("<uuid:id>/download/", download_job_file, name="download_job_file"),
+]
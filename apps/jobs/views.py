@@ -0,0 +1,107 @@
+"""
+Background Job Views.
+"""
+
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+from django.http import FileResponse
+from drf_spectacular.utils import extend_schema
+from rest_framework import permissions, status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from apps.core.decorators import admission_control, statement_timeout
+
+
+def fetch_job(request: Request, id: str) -> dict | None:
+    """Get a job that the requesting user is allowed to see."""
+
+    with connection.cursor() as c:
+        c.execute(
+            "SELECT id, kind, status, progress, result, error, attempts, created, started, finished, created_by_id FROM core_job WHERE id = %s;",
+            [id],
+        )
+        columns = [col[0] for col in c.description]
+        data = c.fetchone()
+
+    if not data:
+        return None
+
+    job = dict(zip(columns, data))
+    created_by_id = job.pop("created_by_id")
+
+    # Raw cursors return jsonb columns as text.
+    if isinstance(job["result"], str):
+        job["result"] = json.loads(job["result"])
+
+    if not request.user.is_staff and created_by_id != request.user.id:
+        return None
+
+    return job
+
+
+@extend_schema(
+    operation_id="get_job",
+    responses={
+        (200, "application/json"): {
+            "example": {
+                "id": "01a1515b-81eb-791f-96c8-f7f733d8827a",
+                "kind": "export_musics",
+                "status": "running",
+                "progress": 40,
+                "result": None,
+                "error": None,
+                "attempts": 1,
+                "created": "2024-03-12T06:58:00Z",
+                "started": "2024-03-12T06:58:01Z",
+                "finished": None,
+            }
+        },
+        (404, "application/json"): {"example": {"message": "Job not found."}},
+    },
+)
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@admission_control("crud")
+@statement_timeout("read")
+def get_job(request: Request, id: str):
+    """Get status and progress of a background job."""
+
+    if request.method == "GET":
+        job = fetch_job(request, id)
+
+        if not job:
+            return Response({"message": "Job not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        return Response(job)
+
+    return Response({"message": "Invalid request method"}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
+
+
+@extend_schema(
+    operation_id="download_job_file",
+    responses={
+        (200, "text/csv"): {"example": "id,title,release_date,album_name,genre,artists"},
+        (404, "application/json"): {"example": {"message": "File not found."}},
+    },
+)
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+def download_job_file(request: Request, id: str):
+    """Download the file produced by a finished export job."""
+
+    if request.method == "GET":
+        job = fetch_job(request, id)
+        file_name = (job["result"] or {}).get("file") if job and job["status"] == "succeeded" else None
+        path = Path(settings.EXPORTS_DIR) / Path(file_name).name if file_name else None
+
+        if not path or not path.is_file():
+            return Response({"message": "File not found."}, status=status.HTTP_404_NOT_FOUND)
+
+        return FileResponse(path.open("rb"), as_attachment=True, filename=path.name)
+
+    return Response({"message": "Invalid request method"}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -5,6 +5,7 @@ Admin Customization For Music App.
 from django.contrib import admin
 
 from apps.core.models import Music, MusicArtists
+from apps.core.pagination import EstimatedCountPaginator
 
 
 class MusicArtistsInline(admin.TabularInline):
@@ -12,6 +13,7 @@ class MusicArtistsInline(admin.TabularInline):
 
     model = MusicArtists
     extra = 1
+    autocomplete_fields = ("artistprofile",)
 
 
 class MusicAdmin(admin.ModelAdmin):
@@ -25,10 +27,11 @@ class MusicAdmin(admin.ModelAdmin):
         "created",
         "modified",
     )
-    date_hierarchy = "release_date"
     search_fields = ("title",)
     ordering = ("title",)
-    list_filter = ("genre", "release_date")
+    list_filter = ("genre",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     inlines = [
         MusicArtistsInline,
     ]
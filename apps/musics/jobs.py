@@ -0,0 +1,118 @@
+"""
+Background Jobs For Musics.
+"""
+
+import csv
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.cache import ARTIST_MUSICS_KEY, bump_generation, invalidate
+from apps.core.utils import uuid7
+from apps.jobs.queue import register
+
+from .views import validate_music_fields
+
+EXPORT_BATCH_SIZE = 2_000
+IMPORT_BATCH_SIZE = 500
+
+
+@register("export_musics")
+def export_musics(payload: dict, report_progress) -> dict:
+    """Write the whole catalog to a CSV file in the exports directory."""
+
+    export_dir = Path(settings.EXPORTS_DIR)
+    export_dir.mkdir(parents=True, exist_ok=True)
+    file_name = f"musics-{uuid7()}.csv"
+
+    with connection.cursor() as c:
+        c.execute("SELECT count(*) FROM core_music;")
+        total = c.fetchone()[0]
+
+    rows = 0
+    with open(export_dir / file_name, "w", newline="") as f, connection.chunked_cursor() as c:
+        writer = csv.writer(f)
+        writer.writerow(["id", "title", "release_date", "album_name", "genre", "artists"])
+
+        c.execute(
+            "SELECT id, title, release_date, album_name, genre, array_to_string(artist_names, '; ') FROM core_music ORDER BY id;"
+        )
+
+        while batch := c.fetchmany(EXPORT_BATCH_SIZE):
+            writer.writerows(batch)
+            rows += len(batch)
+            report_progress(rows * 99 // total if total else 99)
+
+    return {"file": file_name, "rows": rows}
+
+
+def import_row_error(music) -> str | None:
+    """Return an error message for an import row that the insert would reject."""
+
+    if not isinstance(music, dict):
+        return "Each music must be an object."
+
+    if "release_date" not in music:
+        return "Please enter a valid release date."
+
+    artist_ids = music.get("artist_ids", [])
+    try:
+        if not isinstance(artist_ids, list):
+            raise ValueError
+        for artist_id in artist_ids:
+            uuid.UUID(str(artist_id))
+    except ValueError:
+        return "artist_ids must be a list of artist ids."
+
+    return validate_music_fields({**music, "genre": music.get("genre", "rnb")})
+
+
+# Batches commit one by one, so running it again would insert them twice.
+@register("import_musics", max_attempts=1)
+def import_musics(payload: dict, report_progress) -> dict:
+    """Insert many musics and their artist links, one transaction per batch."""
+
+    musics = payload.get("musics", [])
+    created = 0
+    errors = []
+
+    for start in range(0, len(musics), IMPORT_BATCH_SIZE):
+        music_rows = []
+        link_rows = []
+        now = timezone.now()
+
+        for index, music in enumerate(musics[start : start + IMPORT_BATCH_SIZE], start=start):
+            # One bad value would abort the whole batch insert, so rows are checked first and skipped.
+            message = import_row_error(music)
+            if message:
+                errors.append({"index": index, "message": message})
+                continue
+
+            id = str(uuid7())
+            music_rows.append(
+                [id, music.get("title"), music["release_date"], music.get("album_name"), music.get("genre", "rnb"), now, now]
+            )
+            link_rows += [[str(uuid7()), id, str(artist_id)] for artist_id in music.get("artist_ids", [])]
+
+        with transaction.atomic(using=connection.alias), connection.cursor() as c:
+            bump_generation("core_music", "core_music_artists")
+            c.executemany(
+                "INSERT INTO core_music(id, title, release_date, album_name, genre, created, modified) VALUES (%s, %s, %s, %s, %s, %s, %s);",
+                music_rows,
+            )
+
+            if link_rows:
+                # Links to unknown artists are skipped.
+                c.executemany(
+                    "INSERT INTO core_music_artists(id, music_id, artistprofile_id) SELECT %s, %s, id FROM core_artistprofile WHERE id = %s;",
+                    link_rows,
+                )
+                invalidate(ARTIST_MUSICS_KEY.format(artist_id) for _, _, artist_id in link_rows)
+
+        created += len(music_rows)
+        report_progress((start + IMPORT_BATCH_SIZE) * 99 // len(musics))
+
+    return {"created": created, "errors": errors}
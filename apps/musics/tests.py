@@ -0,0 +1,56 @@
+"""
+Tests For Music App.
+"""
+
+import pytest
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.core.models import Music
+from apps.musics.jobs import import_musics
+
+
+@pytest.fixture
+def client(db) -> APIClient:
+    client = APIClient()
+    client.force_authenticate(get_user_model().objects.create_user(email="music@example.com", password="Music#Test123"))
+
+    return client
+
+
+def test_bulk_update_reports_malformed_date_per_row(client):
+    good = Music.objects.create(title="Good", genre="rnb")
+    bad = Music.objects.create(title="Bad", genre="rnb")
+
+    response = client.patch(
+        "/musics/bulk/",
+        [{"id": str(good.id), "genre": "jazz"}, {"id": str(bad.id), "release_date": "not-a-date"}],
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert response.data["updated"] == 1
+    assert {row["id"]: row["status"] for row in response.data["results"]} == {str(good.id): "updated", str(bad.id): "invalid"}
+
+    good.refresh_from_db()
+    bad.refresh_from_db()
+    assert good.genre == "jazz"
+    assert bad.release_date is None
+
+
+@pytest.mark.django_db
+def test_import_skips_and_reports_invalid_rows():
+    good = {"title": "Good", "release_date": "2020-01-01", "genre": "jazz"}
+    musics = [
+        good,
+        {**good, "genre": "polka"},
+        {**good, "title": "x" * 101},
+        {**good, "artist_ids": ["not-an-id"]},
+        "not a row",
+    ]
+
+    result = import_musics({"musics": musics}, lambda progress: None)
+
+    assert result["created"] == 1
+    assert [error["index"] for error in result["errors"]] == [1, 2, 3, 4]
+    assert list(Music.objects.values_list("title", flat=True)) == ["Good"]
@@ -4,13 +4,28 @@ URLs For Music API.
 
 from django.urls import path
 
-from .views import create_music, delete_music, get_music, get_music_by_artist, get_musics, update_music
+from .views import (
+    bulk_update_musics,
+    create_music,
+    delete_music,
+    export_musics,
+    get_music,
+    get_music_by_artist,
+    get_music_changes,
+    get_musics,
+    import_musics,
+    update_music,
+)
 
 urlpatterns = [
     path("", get_musics, name="get_musics"),
     path("<uuid:id>/", get_music, name="get_music"),
+    path("changes/", get_music_changes, name="get_music_changes"),
     path("by_artist/<uuid:artist_id>", get_music_by_artist, name="get_music_by_artist"),
     path("create_music/", create_music, name="create_music"),
     path("update/<uuid:id>", update_music, name="update_music"),
+    path("bulk/", bulk_update_musics, name="bulk_update_musics"),
+    path("export/", export_musics, name="export_musics"),
+    path("import/", import_musics, name="import_musics"),
     path("delete/<uuid:id>/", delete_music, name="delete_music"),
 ]
@@ -2,8 +2,7 @@
 API Views For Music App.
 """
 
-import uuid
-
+from django.conf import settings
 from django.db import connection, transaction
 from django.utils import timezone
 from drf_spectacular.types import OpenApiTypes
@@ -14,7 +13,33 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from apps.core.cache import ARTIST_MUSICS_KEY, bump_generation, cached_list_page, get_or_compute, invalidate
+from apps.core.changes import change_feed, record_tombstone
+from apps.core.decorators import admission_control, statement_timeout
+from apps.core.models import Music, Tombstone
+from apps.core.queries import (
+    BULK_UPDATE_MAX_ROWS,
+    build_partial_update,
+    finish_bulk_results,
+    prepare_bulk_updates,
+    provided_fields,
+    run_bulk_update,
+)
+from apps.core.utils import uuid7
 from apps.core.validations import date_validation
+from apps.jobs.queue import enqueue
+
+MUSIC_COLUMN_TYPES = {
+    "title": "varchar",
+    "release_date": "timestamptz",
+    "album_name": "varchar",
+    "genre": "varchar",
+}
+MUSIC_COLUMNS = tuple(MUSIC_COLUMN_TYPES)
+MUSIC_RETURNING = ("id", *MUSIC_COLUMNS)
+# Tables whose writes change the cached musics list (it shows artist names).
+MUSIC_LIST_TABLES = ("core_music", "core_music_artists", "core_artistprofile")
+MUSIC_CHANGE_COLUMNS = "id, title, release_date, album_name, genre, modified, artist_ids"
 
 
 class MusicsPagination(PageNumberPagination):
@@ -23,6 +48,17 @@ class MusicsPagination(PageNumberPagination):
     max_page_size = 100
 
 
+def fetch_musics() -> list[dict]:
+    """Read every music with its artist names from the database."""
+
+    with connection.cursor() as c:
+        c.execute("SELECT id, title, release_date, album_name, genre, artist_names AS artists FROM core_music;")
+        columns = [col[0] for col in c.description]
+        music_data = c.fetchall()
+
+    return [dict(zip(columns, row)) for row in music_data]
+
+
 @extend_schema(
     operation_id="get_musics",
     responses={
@@ -59,53 +95,20 @@ class MusicsPagination(PageNumberPagination):
 )
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("search")
+@statement_timeout("read")
 def get_musics(request: Request):
     """Get all musics"""
     paginator = MusicsPagination()
 
     if request.method == "GET":
-        with connection.cursor() as c:
-            # c.execute(
-            #     "SELECT m.id, title, release_date, album_name, genre, a.name FROM core_music m INNER JOIN core_music_artists ma ON m.id = ma.music_id INNER JOIN core_artistprofile a ON ma.artistprofile_id = a.id;"
-            # )
-
-            c.execute("SELECT id, title, release_date, album_name, genre FROM core_music;")
-            music_data = c.fetchall()
-
-            music_list = []
-            for music in music_data:
-                music_info = {
-                    "id": music[0],
-                    "title": music[1],
-                    "release_date": music[2],
-                    "album_name": music[3],
-                    "genre": music[4],
-                }
-
-                c.execute(
-                    "SELECT artistprofile_id FROM core_music_artists WHERE music_id = %s",
-                    [music_info["id"]],
-                )
-                artist_ids = c.fetchall()
 
-                artist_list = []
-                for artist_id in artist_ids:
-                    c.execute(
-                        "SELECT id, name FROM core_artistprofile WHERE id = %s",
-                        [artist_id[0]],
-                    )
-                    artist_data = c.fetchone()
+        def render():
+            page = paginator.paginate_queryset(fetch_musics(), request)
 
-                    if artist_data:
-                        artist_name = artist_data[1]
-                        artist_list.append(artist_name)
+            return paginator.get_paginated_response(page).data
 
-                music_info["artists"] = artist_list
-                music_list.append(music_info)
-
-        page = paginator.paginate_queryset(music_list, request)
-
-        return paginator.get_paginated_response(page)
+        return Response(cached_list_page(request, "musics", MUSIC_LIST_TABLES, render))
 
     return Response(
         {"message": "Invaid request method."},
@@ -136,13 +139,15 @@ def get_musics(request: Request):
 )
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("crud")
+@statement_timeout("read")
 def get_music(request: Request, id: str):
     """Get music with id."""
 
     if request.method == "GET":
         with connection.cursor() as c:
             c.execute(
-                "SELECT id, title, release_date, album_name, genre FROM core_music WHERE id = %s;",
+                "SELECT id, title, release_date, album_name, genre, artist_ids FROM core_music WHERE id = %s;",
                 [id],
             )
             music_data = c.fetchone()
@@ -154,28 +159,9 @@ def get_music(request: Request, id: str):
                     "release_date": music_data[2],
                     "album_name": music_data[3],
                     "genre": music_data[4],
+                    "artist_ids": music_data[5],
                 }
 
-                c.execute(
-                    "SELECT artistprofile_id FROM core_music_artists WHERE music_id = %s",
-                    [str(music_info["id"])],
-                )
-                artist_ids = c.fetchall()
-
-                artist_list = []
-                for artist_id in artist_ids:
-                    c.execute(
-                        "SELECT id, name FROM core_artistprofile WHERE id = %s",
-                        [str(artist_id[0])],
-                    )
-                    artist_data = c.fetchall()
-
-                    if artist_data:
-                        artist_id = artist_data[0][0]
-                        artist_list.append(artist_id)
-
-                music_info["artist_ids"] = artist_list
-
         return Response(music_info, status=status.HTTP_200_OK)
 
     return Response(
@@ -184,6 +170,22 @@ def get_music(request: Request, id: str):
     )
 
 
+def fetch_artist_musics(artist_id: str) -> list[dict]:
+    """Read every music linked to an artist from the database."""
+
+    with connection.cursor() as c:
+        # Served by the GIN index on artist_ids.
+        c.execute(
+            "SELECT id, title, release_date, album_name, genre FROM core_music WHERE artist_ids @> ARRAY[%s]::uuid[];",
+            [artist_id],
+        )
+
+        columns = [col[0] for col in c.description]
+        music_data = c.fetchall()
+
+    return [dict(zip(columns, row)) for row in music_data]
+
+
 @extend_schema(
     operation_id="get_music_by_artist",
     parameters=[
@@ -215,21 +217,19 @@ def get_music(request: Request, id: str):
 )
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("search")
+@statement_timeout("read")
 def get_music_by_artist(request: Request, artist_id: str):
     """Get music by artist."""
     paginator = MusicsPagination()
 
     if request.method == "GET":
-        with connection.cursor() as c:
-            c.execute(
-                "SELECT core_music.id, title, release_date, album_name, genre FROM core_music INNER JOIN core_music_artists ON core_music.id = core_music_artists.music_id INNER JOIN core_artistprofile ON core_music_artists.artistprofile_id = core_artistprofile.id WHERE core_artistprofile.id = %s;",
-                [artist_id],
-            )
-
-            columns = [col[0] for col in c.description]
-            music_data = c.fetchall()
-
-        result = [dict(zip(columns, row)) for row in music_data]
+        result = get_or_compute(
+            ARTIST_MUSICS_KEY.format(artist_id),
+            lambda: fetch_artist_musics(artist_id),
+            settings.RECORD_CACHE_TIMEOUT,
+            "artist_musics",
+        )
 
         page = paginator.paginate_queryset(result, request)
 
@@ -278,13 +278,15 @@ def get_music_by_artist(request: Request, artist_id: str):
 )
 @api_view(["POST"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("crud")
+@statement_timeout("write")
 def create_music(request: Request):
     """Add new music."""
 
     if request.method == "POST":
         try:
             data = request.data
-            id = uuid.uuid4()
+            id = uuid7()
             title = data.get("title")
             release_date = data.get("release_date")
             album_name = data.get("album_name")
@@ -293,7 +295,7 @@ def create_music(request: Request):
             modified = timezone.now()
             artist_ids = data.get("artist_ids", [])
 
-            with connection.cursor() as c:
+            with transaction.atomic(using=connection.alias), connection.cursor() as c:
                 # Validate release date
                 if not date_validation(release_date):
                     return Response({"message": "Release date must not be greater than present date."})
@@ -320,8 +322,6 @@ def create_music(request: Request):
                         "album_name": music_data[3],
                         "genre": music_data[4],
                     }
-                    music_artist_id = uuid.uuid4()
-
                     artist_names = []
                     for artist_id in artist_ids:
                         c.execute(
@@ -342,10 +342,12 @@ def create_music(request: Request):
 
                             c.execute(
                                 "INSERT INTO core_music_artists(id, music_id, artistprofile_id) VALUES (%s, %s, %s) RETURNING artistprofile_id;",
-                                [music_artist_id, music_details["id"], artist_id],
+                                [uuid7(), music_details["id"], artist_id],
                             )
 
                     music_details["artists"] = artist_names
+                    invalidate(ARTIST_MUSICS_KEY.format(artist_id) for artist_id in artist_ids)
+                    bump_generation("core_music", "core_music_artists")
 
             return Response(
                 {"message": "Music added successfully.", "music": music_details},
@@ -393,21 +395,21 @@ def create_music(request: Request):
             }
         },
         (400, "application/json"): {"example": {"message": "Invalid JSON in request body."}},
+        (404, "application/json"): {"example": {"message": "Music not found."}},
     },
 )
 @api_view(["PUT", "PATCH"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("crud")
+@statement_timeout("write")
 def update_music(request: Request, id: str):
     """Update existing music."""
 
     if request.method == "PUT" or request.method == "PATCH":
         data = request.data
-        title = data.get("title")
-        release_date = data.get("release_date")
-        album_name = data.get("album_name")
-        genre = data.get("genre")
-        modified = timezone.now()
-        artist_ids = data.get("artist_ids", [])
+        fields = provided_fields(data, MUSIC_COLUMNS)
+        release_date = fields.get("release_date")
+        artist_ids = data.get("artist_ids")
 
         with transaction.atomic(using=connection.alias), connection.cursor() as c:
             try:
@@ -415,73 +417,35 @@ def update_music(request: Request, id: str):
                 if release_date and not date_validation(release_date):
                     return Response({"message": "Release date must not be greater than present date."})
 
-                # Get stored data
-                c.execute(
-                    "SELECT title, release_date, album_name, genre, core_music_artists.artistprofile_id as artists FROM core_music INNER JOIN core_music_artists ON core_music.id = core_music_artists.music_id WHERE core_music.id = %s;",
-                    [str(id)],
-                )
-
-                music_data = c.fetchall()
-                print(f"Music Data =============> {music_data}")
-
-                if music_data:
-                    artist_list = []
-                    for music in music_data:
-                        music_details = {
-                            "stored_title": music[0],
-                            "stored_release_date": music[1],
-                            "stored_album_name": music[2],
-                            "stored_genre": music[3],
-                            "stored_artist_ids": music[4],
-                        }
-
-                        new_title = title if title else music_details["stored_title"]
-                        new_release_date = release_date if release_date else music_details["stored_release_date"]
-                        new_album_name = album_name if album_name else music_details["stored_album_name"]
-                        new_genre = genre if genre else music_details["stored_genre"]
-                        artist_list.append(music_details["stored_artist_ids"])
-                        new_artist_ids = artist_ids if artist_ids else artist_list
-
-                c.execute(
-                    "UPDATE core_music SET title = %s, release_date = %s, album_name = %s, genre = %s, modified = %s WHERE id = %s RETURNING id, title, release_date, album_name, genre;",
-                    [
-                        new_title,
-                        new_release_date,
-                        new_album_name,
-                        new_genre,
-                        modified,
-                        id,
-                    ],
-                )
+                sql, params = build_partial_update("core_music", id, fields, MUSIC_RETURNING)
+                c.execute(sql, params)
                 updated_music = c.fetchone()
 
-                if updated_music:
-                    music_detail = {
-                        "id": updated_music[0],
-                        "title": updated_music[1],
-                        "release_date": updated_music[2],
-                        "album_name": updated_music[3],
-                        "genre": updated_music[4],
-                    }
-
-                c.execute("DELETE FROM core_music_artists WHERE music_id = %s", [id])
+                if not updated_music:
+                    return Response({"message": "Music not found."}, status=status.HTTP_404_NOT_FOUND)
 
-                artist_names = []
-                relation_id = uuid.uuid4()
-                for artist_id in new_artist_ids:
-                    c.execute(
-                        "SELECT name FROM core_artistprofile WHERE id = %s;",
-                        [artist_id],
-                    )
-                    artist_name = c.fetchone()[0]
-                    artist_names.append(artist_name)
+                music_detail = {
+                    "id": updated_music[0],
+                    "title": updated_music[1],
+                    "release_date": updated_music[2],
+                    "album_name": updated_music[3],
+                    "genre": updated_music[4],
+                }
 
+                # Links are only rewritten when the request sends a new artist list.
+                if artist_ids is not None:
+                    c.execute("DELETE FROM core_music_artists WHERE music_id = %s RETURNING artistprofile_id", [id])
+                    invalidate(ARTIST_MUSICS_KEY.format(row[0]) for row in c.fetchall())
                     c.execute(
-                        "INSERT INTO core_music_artists(id, music_id, artistprofile_id) VALUES (%s, %s, %s);",
-                        [relation_id, id, artist_id],
+                        "INSERT INTO core_music_artists(id, music_id, artistprofile_id) SELECT link.id, %s, a.id FROM unnest(%s::uuid[], %s::uuid[]) AS link(id, artist_id) INNER JOIN core_artistprofile a ON a.id = link.artist_id;",
+                        [id, [uuid7() for _ in artist_ids], artist_ids],
                     )
 
-                music_detail["artists"] = artist_names
+                # The link triggers have already refreshed the artist arrays.
+                c.execute("SELECT artist_ids, artist_names FROM core_music WHERE id = %s;", [id])
+                linked_ids, music_detail["artists"] = c.fetchone()
+                invalidate(ARTIST_MUSICS_KEY.format(artist_id) for artist_id in linked_ids)
+                bump_generation("core_music", "core_music_artists")
 
                 return Response(
                     {"message": "Music updated successfully", "music": music_detail},
@@ -496,6 +460,173 @@ def update_music(request: Request, id: str):
     )
 
 
+def validate_music_fields(fields: dict) -> str | None:
+    """Return an error message for invalid music fields."""
+
+    try:
+        if "release_date" in fields and not date_validation(fields["release_date"]):
+            return "Release date must not be greater than present date."
+    except (TypeError, ValueError):
+        return "Please enter a valid release date."
+
+    if "genre" in fields and fields["genre"] not in Music.GENRE_CHOICES:
+        return f"Genre must be one of {', '.join(genre for genre, _ in Music.GENRE_CHOICES)}."
+
+    for name in ("title", "album_name"):
+        value = fields.get(name)
+        max_length = Music._meta.get_field(name).max_length
+
+        if value is not None and (not isinstance(value, str) or len(value) > max_length):
+            return f"{Music._meta.get_field(name).verbose_name} must be text of at most {max_length} characters."
+
+    return None
+
+
+@extend_schema(
+    operation_id="bulk_update_musics",
+    request={
+        "application/json": {
+            "example": [
+                {"id": "987asf-qf165-y5211r-974daq", "genre": "jazz"},
+                {"id": "987asf-qf165-y5211r-974dab", "album_name": "Album 2", "genre": "jazz"},
+            ]
+        }
+    },
+    responses={
+        (200, "application/json"): {
+            "example": {
+                "message": "Musics updated.",
+                "updated": 1,
+                "results": [
+                    {"id": "987asf-qf165-y5211r-974daq", "status": "updated"},
+                    {"id": "987asf-qf165-y5211r-974dab", "status": "not_found"},
+                ],
+            }
+        },
+        (400, "application/json"): {"example": {"message": "Send a list of at most 10000 updates."}},
+    },
+)
+@api_view(["PATCH"])
+@permission_classes([permissions.IsAuthenticated])
+@admission_control("bulk")
+@statement_timeout("bulk")
+def bulk_update_musics(request: Request):
+    """Apply partial updates to many musics in one transaction.
+
+    Artist links are left untouched; use update_music to change them.
+    """
+
+    if request.method == "PATCH":
+        data = request.data
+
+        if not isinstance(data, list) or len(data) > BULK_UPDATE_MAX_ROWS:
+            return Response(
+                {"message": f"Send a list of at most {BULK_UPDATE_MAX_ROWS} updates."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results, updates = prepare_bulk_updates(data, MUSIC_COLUMNS, validate_music_fields)
+
+        try:
+            with transaction.atomic(using=connection.alias), connection.cursor() as c:
+                updated = run_bulk_update(c, "core_music", MUSIC_COLUMN_TYPES, updates)
+                c.execute(
+                    "SELECT DISTINCT unnest(artist_ids) FROM core_music WHERE id = ANY(%s::uuid[]);",
+                    [list(updated)],
+                )
+                invalidate(ARTIST_MUSICS_KEY.format(row[0]) for row in c.fetchall())
+                bump_generation("core_music")
+        except Exception as e:
+            return Response({"message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response(
+            {
+                "message": "Musics updated.",
+                "updated": len(updated),
+                "results": finish_bulk_results(results, updated),
+            }
+        )
+
+    return Response(
+        {"message": "Invaid request method."},
+        status=status.HTTP_405_METHOD_NOT_ALLOWED,
+    )
+
+
+@extend_schema(
+    operation_id="export_musics",
+    request=None,
+    responses={
+        (202, "application/json"): {
+            "example": {"message": "Music export queued.", "job_id": "01a1515b-81eb-791f-96c8-f7f733d8827a"}
+        },
+    },
+)
+@api_view(["POST"])
+@permission_classes([permissions.IsAuthenticated])
+@admission_control("export")
+@statement_timeout("write")
+def export_musics(request: Request):
+    """Queue a CSV export of the catalog. Poll the job and download the file when it succeeds."""
+
+    if request.method == "POST":
+        job_id = enqueue("export_musics", user_id=request.user.id)
+
+        return Response({"message": "Music export queued.", "job_id": job_id}, status=status.HTTP_202_ACCEPTED)
+
+    return Response(
+        {"message": "Invaid request method."},
+        status=status.HTTP_405_METHOD_NOT_ALLOWED,
+    )
+
+
+@extend_schema(
+    operation_id="import_musics",
+    request={
+        "application/json": {
+            "example": {
+                "musics": [
+                    {
+                        "title": "Music",
+                        "release_date": "1998-12-15",
+                        "album_name": "Album",
+                        "genre": "rnb",
+                        "artist_ids": ["4651dq-8q8qd4-812dq3-q4d451"],
+                    }
+                ]
+            }
+        }
+    },
+    responses={
+        (202, "application/json"): {
+            "example": {"message": "Music import queued.", "job_id": "01a1515b-81eb-791f-96c8-f7f733d8827a"}
+        },
+        (400, "application/json"): {"example": {"message": "Send a list of musics to import."}},
+    },
+)
+@api_view(["POST"])
+@permission_classes([permissions.IsAuthenticated])
+@admission_control("bulk")
+@statement_timeout("write")
+def import_musics(request: Request):
+    """Queue a bulk import of musics."""
+
+    if request.method == "POST":
+        musics = request.data.get("musics") if isinstance(request.data, dict) else None
+
+        if not isinstance(musics, list) or not musics:
+            return Response({"message": "Send a list of musics to import."}, status=status.HTTP_400_BAD_REQUEST)
+
+        job_id = enqueue("import_musics", {"musics": musics}, user_id=request.user.id)
+
+        return Response({"message": "Music import queued.", "job_id": job_id}, status=status.HTTP_202_ACCEPTED)
+
+    return Response(
+        {"message": "Invaid request method."},
+        status=status.HTTP_405_METHOD_NOT_ALLOWED,
+    )
+
+
 @extend_schema(
     request=None,
     responses={
@@ -505,6 +636,8 @@ def update_music(request: Request, id: str):
 )
 @api_view(["DELETE"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("crud")
+@statement_timeout("write")
 def delete_music(request: Request, id: str):
     """Delete existing music."""
 
@@ -513,15 +646,19 @@ def delete_music(request: Request, id: str):
             try:
                 # Delete record from intermediatary table.
                 c.execute(
-                    "DELETE FROM core_music_artists WHERE music_id = %s;",
+                    "DELETE FROM core_music_artists WHERE music_id = %s RETURNING artistprofile_id;",
                     [id],
                 )
+                invalidate(ARTIST_MUSICS_KEY.format(row[0]) for row in c.fetchall())
 
                 # Delete music from table.
                 c.execute(
                     "DELETE FROM core_music WHERE id = %s;",
                     [id],
                 )
+                if c.rowcount:
+                    record_tombstone(c, Tombstone.KIND_CHOICES.music, id)
+                bump_generation("core_music", "core_music_artists")
 
                 return Response(
                     {
@@ -536,3 +673,53 @@ def delete_music(request: Request, id: str):
         {"message": "Invaid request method."},
         status=status.HTTP_405_METHOD_NOT_ALLOWED,
     )
+
+
+@extend_schema(
+    operation_id="get_music_changes",
+    parameters=[
+        OpenApiParameter("since", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Cursor from the previous response."),
+        OpenApiParameter("limit", OpenApiTypes.INT, OpenApiParameter.QUERY, description="Changes per page."),
+    ],
+    responses={
+        (200, "application/json"): {
+            "example": {
+                "results": [
+                    {
+                        "id": "01a1515b-81eb-791f-96c8-f7f733d8827a",
+                        "title": "Music",
+                        "release_date": "1998-12-15T00:00:00Z",
+                        "album_name": "Album",
+                        "genre": "rnb",
+                        "modified": "2024-03-01T10:00:00.123456Z",
+                        "artist_ids": ["01a1515b-7f2e-7c4a-9d61-0b6a4f1e2c33"],
+                        "deleted": False,
+                    },
+                    {
+                        "id": "01a1515b-8a10-7b5e-8f0c-3d2e1a9b7c55",
+                        "modified": "2024-03-01T10:05:00.654321Z",
+                        "deleted": True,
+                    },
+                ],
+                "since": "MjAyNC0wMy0wMVQxMDowNTowMC42NTQzMjErMDA6MDB8MDFhMTUxNWItOGExMC03YjVlLThmMGMtM2QyZTFhOWI3YzU1",
+                "has_more": False,
+            }
+        },
+        (400, "application/json"): {"example": {"message": "Invalid cursor or limit."}},
+        (410, "application/json"): {"example": {"message": "Cursor expired. Sync again from the start by leaving out since."}},
+    },
+)
+@api_view(["GET"])
+@permission_classes([permissions.IsAuthenticated])
+@admission_control("search")
+@statement_timeout("read")
+def get_music_changes(request: Request):
+    """List musics changed or deleted after the ``since`` cursor."""
+
+    if request.method == "GET":
+        return change_feed(request, "core_music", Tombstone.KIND_CHOICES.music, MUSIC_CHANGE_COLUMNS)
+
+    return Response(
+        {"message": "Invaid request method."},
+        status=status.HTTP_405_METHOD_NOT_ALLOWED,
+    )
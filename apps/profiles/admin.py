@@ -5,6 +5,7 @@ Admin Customization For User Profile App.
 from django.contrib import admin
 
 from apps.core.models import UserProfile
+from apps.core.pagination import EstimatedCountPaginator
 
 
 class UserProfileAdmin(admin.ModelAdmin):
@@ -23,6 +24,8 @@ class UserProfileAdmin(admin.ModelAdmin):
     search_fields = ("first_name",)
     ordering = ("first_name",)
     list_filter = ("gender",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     def full_name(self, obj: UserProfile):
         """Returns full name for the profile."""
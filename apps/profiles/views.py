@@ -2,8 +2,6 @@
 User Profile Views.
 """
 
-import uuid
-
 from django.db import connection
 from django.utils import timezone
 from drf_spectacular.utils import extend_schema
@@ -13,8 +11,17 @@ from rest_framework.pagination import PageNumberPagination
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from apps.core.cache import bump_generation, cached_list_page
+from apps.core.decorators import admission_control, statement_timeout
+from apps.core.queries import build_partial_update, provided_fields
+from apps.core.utils import uuid7
 from apps.core.validations import date_validation
 
+PROFILE_COLUMNS = ("first_name", "last_name", "phone", "date_of_birth", "gender", "address")
+PROFILE_RETURNING = ("id", *PROFILE_COLUMNS, "modified")
+# Tables whose writes change the cached profiles list (it shows the user's email).
+PROFILE_LIST_TABLES = ("core_userprofile", "core_user")
+
 
 class ProfilesPagination(PageNumberPagination):
     page_size = 10
@@ -22,6 +29,19 @@ class ProfilesPagination(PageNumberPagination):
     max_page_size = 100
 
 
+def fetch_profiles() -> list[dict]:
+    """Read every user profile with its email from the database."""
+
+    with connection.cursor() as c:
+        c.execute(
+            "SELECT p.id, u.email, (first_name || ' ' || last_name) as full_name, DATE(date_of_birth) as date_of_birth, gender, address, phone FROM core_userprofile p INNER JOIN core_user u ON p.user_id = u.id;"
+        )
+        columns = [col[0] for col in c.description]
+        data = c.fetchall()
+
+    return [dict(zip(columns, row)) for row in data]
+
+
 @extend_schema(
     operation_id="get_user_profiles",
     responses={
@@ -53,24 +73,21 @@ class ProfilesPagination(PageNumberPagination):
 )
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("search")
+@statement_timeout("read")
 def get_profiles(request: Request):
     """Get all user profiles."""
 
     paginator = ProfilesPagination()
 
     if request.method == "GET":
-        with connection.cursor() as c:
-            c.execute(
-                "SELECT p.id, u.email, (first_name || ' ' || last_name) as full_name, DATE(date_of_birth) as date_of_birth, gender, address, phone FROM core_userprofile p INNER JOIN core_user u ON p.user_id = u.id;"
-            )
-            columns = [col[0] for col in c.description]
-            data = c.fetchall()
 
-        result = [dict(zip(columns, row)) for row in data]
+        def render():
+            page = paginator.paginate_queryset(fetch_profiles(), request)
 
-        page = paginator.paginate_queryset(result, request)
+            return paginator.get_paginated_response(page).data
 
-        return paginator.get_paginated_response(page)
+        return Response(cached_list_page(request, "profiles", PROFILE_LIST_TABLES, render))
 
     return Response({"message": "Invalid request method"}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
@@ -97,6 +114,8 @@ def get_profiles(request: Request):
 )
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("crud")
+@statement_timeout("read")
 def get_profile(request: Request, id: str):
     """Get profile with id."""
 
@@ -137,13 +156,15 @@ def get_profile(request: Request, id: str):
 )
 @api_view(["POST"])
 @permission_classes([permissions.AllowAny])
+@admission_control("crud")
+@statement_timeout("write")
 def create_profile(request: Request):
     """Create new user profile."""
 
     if request.method == "POST":
         try:
             data = request.data
-            id = str(uuid.uuid4())
+            id = str(uuid7())
             user_email = data.get("user_email")
             first_name = data.get("first_name")
             last_name = data.get("last_name")
@@ -179,6 +200,7 @@ def create_profile(request: Request):
                     )
 
                     created_profile = c.fetchone()
+                    bump_generation("core_userprofile")
                 else:
                     return Response({"message": f"User with email '{user_email}' not found."})
 
@@ -222,98 +244,63 @@ def create_profile(request: Request):
     responses={
         (200, "application/json"): {"example": {"message": "Profile updated successfully"}},
         (400, "application/json"): {"example": {"message": "Invalid JSON in request body."}},
+        (404, "application/json"): {"example": {"message": "Profile not found."}},
     },
 )
 @api_view(["PUT", "PATCH"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("crud")
+@statement_timeout("write")
 def update_profile(request: Request, id: str):
     """Update user profile."""
 
     if request.method == "PUT" or request.method == "PATCH":
         data = request.data
-        first_name = data.get("first_name")
-        last_name = data.get("last_name")
-        phone = data.get("phone")
-        date_of_birth = data.get("date_of_birth")
-        gender = data.get("gender")
-        address = data.get("address")
-        modified = timezone.now()
+        fields = provided_fields(data, PROFILE_COLUMNS)
+        date_of_birth = fields.get("date_of_birth")
 
         try:
+            if date_of_birth and not date_validation(date_of_birth):
+                return Response({"message": "Date of birth must not be greater than present date."})
+
+            sql, params = build_partial_update("core_userprofile", id, fields, PROFILE_RETURNING)
+
             with connection.cursor() as c:
-                if date_of_birth and not date_validation(date_of_birth):
-                    return Response({"message": "Date of birth must not be greater than present date."})
-
-                # Get stored data
-                c.execute(
-                    "SELECT first_name, last_name, phone, date_of_birth, gender, address FROM core_userprofile WHERE id = %s;",
-                    [id],
-                )
-
-                user_data = c.fetchone()
-
-                if user_data:
-                    (
-                        stored_first_name,
-                        stored_last_name,
-                        stored_phone,
-                        stored_date_of_birth,
-                        stored_gender,
-                        stored_address,
-                    ) = user_data
-
-                    new_first_name = first_name if first_name else stored_first_name
-                    new_last_name = last_name if last_name else stored_last_name
-                    new_phone = phone if phone else stored_phone
-                    new_date_of_birth = date_of_birth if date_of_birth else stored_date_of_birth
-                    new_gender = gender if gender else stored_gender
-                    new_address = address if address else stored_address
-
-                c.execute(
-                    "UPDATE core_userprofile SET first_name = %s, last_name = %s, phone = %s, date_of_birth = %s, gender = %s, address = %s, modified = %s WHERE id = %s RETURNING id, first_name, last_name, phone, date_of_birth, gender, address, modified;",
-                    [
-                        new_first_name,
-                        new_last_name,
-                        new_phone,
-                        new_date_of_birth,
-                        new_gender,
-                        new_address,
-                        modified,
-                        id,
-                    ],
-                )
+                c.execute(sql, params)
                 profile_data = c.fetchone()
 
-                if profile_data:
-                    (
-                        id,
-                        first_name,
-                        last_name,
-                        phone,
-                        date_of_birth,
-                        gender,
-                        address,
-                        modified,
-                    ) = profile_data
+            if not profile_data:
+                return Response({"message": "Profile not found."}, status=status.HTTP_404_NOT_FOUND)
 
-                    return Response(
-                        {
-                            "message": "Profile updated successfully.",
-                            "profile": {
-                                "id": id,
-                                "first_name": first_name,
-                                "last_name": last_name,
-                                "phone": phone,
-                                "date_of_birth": date_of_birth,
-                                "gender": gender,
-                                "address": address,
-                                "modified": modified,
-                            },
-                        },
-                        status=status.HTTP_200_OK,
-                    )
+            bump_generation("core_userprofile")
+
+            (
+                id,
+                first_name,
+                last_name,
+                phone,
+                date_of_birth,
+                gender,
+                address,
+                modified,
+            ) = profile_data
 
-                return Response({"message": "Failed to update profile."})
+            return Response(
+                {
+                    "message": "Profile updated successfully.",
+                    "profile": {
+                        "id": id,
+                        "first_name": first_name,
+                        "last_name": last_name,
+                        "phone": phone,
+                        "date_of_birth": date_of_birth,
+                        "gender": gender,
+                        "address": address,
+                        "modified": modified,
+                    },
+                },
+                status=status.HTTP_200_OK,
+            )
         except Exception as e:
             return Response(
                 {"message": str(e)},
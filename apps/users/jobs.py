@@ -0,0 +1,18 @@
+"""
+Background Jobs For Users.
+"""
+
+from django.conf import settings
+
+from apps.jobs.queue import register
+
+from .tokens import purge_expired_tokens
+
+
+@register("purge_tokens")
+def purge_tokens(payload: dict, report_progress) -> dict:
+    """Remove expired knox tokens."""
+
+    deleted = purge_expired_tokens(settings.AUTH_TOKEN_PURGE_BATCH_SIZE, settings.AUTH_TOKEN_PURGE_PAUSE)
+
+    return {"deleted": deleted}
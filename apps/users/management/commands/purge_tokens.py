@@ -0,0 +1,31 @@
+"""
+Delete expired knox tokens.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.users.tokens import purge_expired_tokens
+
+
+class Command(BaseCommand):
+    help = "Delete expired knox tokens in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.AUTH_TOKEN_PURGE_BATCH_SIZE,
+            help="Tokens deleted per statement.",
+        )
+        parser.add_argument(
+            "--pause",
+            type=float,
+            default=settings.AUTH_TOKEN_PURGE_PAUSE,
+            help="Seconds to sleep between batches.",
+        )
+
+    def handle(self, *args, **options):
+        deleted = purge_expired_tokens(options["batch_size"], options["pause"])
+
+        self.stdout.write(self.style.SUCCESS(f"Deleted {deleted} expired token(s)."))
@@ -0,0 +1,61 @@
+"""
+Tests For User App.
+"""
+
+import pytest
+from rest_framework.test import APIClient
+
+from apps.core.models import User, UserProfile
+
+REGISTRATION = {"email": "new@example.com", "password": "Register#Test123", "confirm_password": "Register#Test123"}
+
+
+@pytest.mark.django_db
+def test_register_creates_user_and_profile_once(django_assert_num_queries):
+    client = APIClient()
+
+    # The statement timeout, one statement for the user and its profile, and the token.
+    # The savepoint pair comes from running inside the test's transaction.
+    with django_assert_num_queries(5) as captured:
+        response = client.post("/users/user_register/", REGISTRATION, format="json")
+
+    statements = [query["sql"] for query in captured.captured_queries if "SAVEPOINT" not in query["sql"]]
+    assert statements[0].startswith("SELECT set_config('statement_timeout'")
+    assert statements[1].startswith("WITH new_user AS (INSERT INTO core_user")
+    assert statements[2].startswith('INSERT INTO "knox_authtoken"')
+
+    assert response.status_code == 201
+    assert response.data["email"] == REGISTRATION["email"]
+    assert response.data["token"]
+
+    user = User.objects.get(email=REGISTRATION["email"])
+    assert str(user.id) == str(response.data["id"])
+    assert user.check_password(REGISTRATION["password"])
+    assert UserProfile.objects.filter(user=user).count() == 1
+
+    response = client.post("/users/user_register/", REGISTRATION, format="json")
+
+    assert response.status_code == 400
+    assert response.data["message"] == "User already exists."
+    assert User.objects.filter(email=REGISTRATION["email"]).count() == 1
+    # The profile insert reads from the user insert, so a conflict must not leave a profile behind.
+    assert UserProfile.objects.count() == 1
+    assert not UserProfile.objects.exclude(user__in=User.objects.all()).exists()
+
+
+@pytest.mark.django_db
+def test_user_list_date_filters():
+    admin = User.objects.create_user(email="admin@example.com", password="Admin#Test123", is_staff=True)
+    client = APIClient()
+    client.force_authenticate(admin)
+
+    response = client.get("/users/", {"date_joined_after": "2024-01-01", "date_joined_before": "2999-01-01T00:00:00Z"})
+
+    assert response.status_code == 200
+    assert [user["email"] for user in response.data["results"]] == [admin.email]
+
+    for value in ("yesterday", "2024-13-01"):
+        response = client.get("/users/", {"date_joined_after": value})
+
+        assert response.status_code == 400
+        assert "date_joined_after" in response.data["message"]
@@ -0,0 +1,55 @@
+"""
+Knox Token Housekeeping.
+"""
+
+import time
+
+from django.conf import settings
+from django.db import connection
+from django.utils import timezone
+from knox.models import AuthToken
+
+
+def create_token(user, evict: bool = True) -> str:
+    """Create a knox token for the user, evicting expired and excess tokens first.
+
+    At most ``AUTH_TOKEN_LIMIT_PER_USER`` tokens stay active; the oldest ones are
+    removed to make room for the new one. Pass ``evict=False`` for users that
+    cannot have tokens yet.
+    """
+
+    if not evict:
+        return AuthToken.objects.create(user)[1]
+
+    with connection.cursor() as c:
+        c.execute(
+            "DELETE FROM knox_authtoken WHERE user_id = %s AND (expiry <= %s OR digest IN (SELECT digest FROM knox_authtoken WHERE user_id = %s ORDER BY created DESC OFFSET %s));",
+            [user.id, timezone.now(), user.id, settings.AUTH_TOKEN_LIMIT_PER_USER - 1],
+        )
+
+    return AuthToken.objects.create(user)[1]
+
+
+def purge_expired_tokens(batch_size: int, pause: float = 0.0) -> int:
+    """Delete expired tokens in small batches so no lock is held for long.
+
+    Returns the number of deleted tokens.
+    """
+
+    deleted = 0
+
+    while True:
+        with connection.cursor() as c:
+            c.execute(
+                "DELETE FROM knox_authtoken WHERE digest IN (SELECT digest FROM knox_authtoken WHERE expiry < %s LIMIT %s);",
+                [timezone.now(), batch_size],
+            )
+            batch = c.rowcount
+
+        deleted += batch
+
+        if batch < batch_size:
+            return deleted
+
+        if pause:
+            time.sleep(pause)
@@ -2,51 +2,180 @@
 CRUD Operations For User.
 """
 
+import datetime
 import json
-import uuid
 
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.hashers import check_password, make_password
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import connection, transaction
-from django.utils import timezone
-from drf_spectacular.utils import extend_schema
+from django.http import StreamingHttpResponse
+from django.utils import dateparse, timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
 from knox.auth import AuthToken
 from rest_framework import permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.request import Request
 from rest_framework.response import Response
 
-from apps.core.models import User
+from apps.core.cache import bump_generation
+from apps.core.decorators import admission_control, set_statement_timeout, statement_timeout
+from apps.core.models import User, UserProfile
+from apps.core.pagination import SQLPagination
 from apps.core.schema import KnoxTokenScheme  # noqa
+from apps.core.utils import uuid7
 from apps.core.validations import email_validation, password_validation
-from apps.profiles.signals import create_profile_handler
+
+from .tokens import create_token
+
+USER_LIST_SQL = "SELECT id, email, is_active, is_staff, date_joined FROM core_user"
+USER_STREAM_BATCH_SIZE = 2_000
+
+
+def parse_bool(value: str | None) -> bool | None:
+    """Parse a boolean query parameter; missing or unknown values give None."""
+
+    return {"true": True, "1": True, "false": False, "0": False}.get((value or "").lower())
+
+
+def parse_datetime_param(request: Request, name: str) -> datetime.datetime | None:
+    """Parse a datetime or date query parameter; a date means midnight.
+
+    Raise ValueError when the parameter is present but not a date or datetime.
+    """
+
+    value = request.query_params.get(name)
+    if not value:
+        return None
+
+    try:
+        parsed = dateparse.parse_datetime(value)
+        if parsed is None and (day := dateparse.parse_date(value)) is not None:
+            parsed = datetime.datetime.combine(day, datetime.time())
+    except ValueError:
+        parsed = None
+
+    if parsed is None:
+        raise ValueError(f"Invalid {name}: {value!r}. Use an ISO 8601 date or datetime.")
+
+    return parsed if timezone.is_aware(parsed) else timezone.make_aware(parsed)
+
+
+def user_list_filters(request: Request) -> tuple[str, list]:
+    """Build the WHERE clause for the user listing from query parameters.
+
+    Raise ValueError for an invalid date filter.
+    """
+
+    conditions = []
+    params = []
+
+    search = request.query_params.get("search")
+    if search:
+        # Prefix match on lower(email), served by core_user_email_lower_like_idx.
+        escaped = search.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        conditions.append("lower(email) LIKE %s")
+        params.append(f"{escaped}%")
+
+    for field in ("is_active", "is_staff"):
+        value = parse_bool(request.query_params.get(field))
+        if value is not None:
+            conditions.append(f"{field} = %s")
+            params.append(value)
+
+    joined_after = parse_datetime_param(request, "date_joined_after")
+    if joined_after:
+        conditions.append("date_joined >= %s")
+        params.append(joined_after)
+
+    joined_before = parse_datetime_param(request, "date_joined_before")
+    if joined_before:
+        conditions.append("date_joined < %s")
+        params.append(joined_before)
+
+    where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    return where, params
+
+
+def stream_users(sql: str, params: list):
+    """Yield matching users as newline-delimited JSON using a server-side cursor.
+
+    The body is produced after the view has returned, so the read timeout is applied here.
+    """
+
+    set_statement_timeout(settings.STATEMENT_TIMEOUTS["read"])
+
+    with connection.chunked_cursor() as c:
+        c.execute(sql, params)
+        columns = [col[0] for col in c.description]
+
+        while rows := c.fetchmany(USER_STREAM_BATCH_SIZE):
+            yield "".join(json.dumps(dict(zip(columns, row)), cls=DjangoJSONEncoder) + "\n" for row in rows)
 
 
 @extend_schema(
     operation_id="get_users",
+    parameters=[
+        OpenApiParameter("search", OpenApiTypes.STR, OpenApiParameter.QUERY, description="Email prefix."),
+        OpenApiParameter("is_active", OpenApiTypes.BOOL, OpenApiParameter.QUERY),
+        OpenApiParameter("is_staff", OpenApiTypes.BOOL, OpenApiParameter.QUERY),
+        OpenApiParameter("date_joined_after", OpenApiTypes.DATETIME, OpenApiParameter.QUERY),
+        OpenApiParameter("date_joined_before", OpenApiTypes.DATETIME, OpenApiParameter.QUERY),
+        OpenApiParameter("stream", OpenApiTypes.BOOL, OpenApiParameter.QUERY, description="Stream all matches as NDJSON."),
+    ],
     responses={
         (200, "application/json"): {
-            "example": [
-                {"id": 1, "email": "user1@example.com"},
-                {"id": 2, "email": "user2@example.com"},
-            ]
+            "example": {
+                "count": 2,
+                "next": None,
+                "previous": None,
+                "results": [
+                    {
+                        "id": 1,
+                        "email": "user1@example.com",
+                        "is_active": True,
+                        "is_staff": False,
+                        "date_joined": "2024-03-12T06:58:00Z",
+                    },
+                    {
+                        "id": 2,
+                        "email": "user2@example.com",
+                        "is_active": True,
+                        "is_staff": True,
+                        "date_joined": "2024-03-11T06:58:00Z",
+                    },
+                ],
+            }
         }
     },
 )
 @api_view(["GET"])
 @permission_classes([permissions.IsAdminUser])
+@admission_control("search")
+@statement_timeout("read")
 def get_users(request: Request):
-    """Get all users."""
+    """Get users page by page, with email prefix search and filters."""
 
     if request.method == "GET":
-        with connection.cursor() as c:
-            c.execute("SELECT id, email FROM core_user;")
-            columns = [col[0] for col in c.description]
-            data = c.fetchall()
+        try:
+            where, params = user_list_filters(request)
+        except ValueError as e:
+            return Response({"message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        result = [dict(zip(columns, row)) for row in data]
+        sql = f"{USER_LIST_SQL}{where} ORDER BY date_joined DESC, id DESC"
+
+        if parse_bool(request.query_params.get("stream")):
+            return StreamingHttpResponse(stream_users(sql, params), content_type="application/x-ndjson")
 
-        return Response({"users": result})
+        paginator = SQLPagination()
+
+        with connection.cursor() as c:
+            page = paginator.paginate_sql(request, c, sql, params)
+
+        return paginator.get_paginated_response(page)
 
     return Response({"message": "Invalid request method"}, status=status.HTTP_405_METHOD_NOT_ALLOWED)
 
@@ -61,6 +190,8 @@ def get_users(request: Request):
 )
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("crud")
+@statement_timeout("read")
 def get_user(request: Request, id: str):
     """Get a specific user."""
 
@@ -86,6 +217,8 @@ def get_user(request: Request, id: str):
 )
 @api_view(["GET"])
 @permission_classes([permissions.IsAuthenticated])
+@admission_control("crud")
+@statement_timeout("read")
 def get_current_user(request: Request):
     """Get authenticated user."""
 
@@ -115,6 +248,8 @@ def get_current_user(request: Request):
 )
 @api_view(["PATCH"])
 @permission_classes([permissions.AllowAny])
+@admission_control("crud")
+@statement_timeout("write")
 def change_password(request: Request):
     """Change user password."""
 
@@ -194,87 +329,86 @@ def change_password(request: Request):
 )
 @api_view(["POST"])
 @permission_classes([permissions.AllowAny])
+@admission_control("crud")
+@statement_timeout("write")
 def user_register(request: Request):
     """Register new user."""
 
     if request.method == "POST":
         try:
             data = request.data
-            id = str(uuid.uuid4())
+            id = str(uuid7())
+            profile_id = str(uuid7())
             email = data.get("email")
             password = data.get("password")
             confirm_password = data.get("confirm_password")
-            hashed_password = make_password(password)
-            date_joined = timezone.now()
-            created = timezone.now()
-            modified = timezone.now()
+            now = timezone.now()
 
-            with connection.cursor() as c:
-                # Validate email
-                if not email_validation(email):
-                    return Response(
-                        {"message": "Invalid email."},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
+            # Validate email
+            if not email_validation(email):
+                return Response(
+                    {"message": "Invalid email."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-                c.execute("SELECT id FROM core_user WHERE email = %s;", [email])
-                existing_user = c.fetchone()
+            if not password_validation(password):
+                return Response(
+                    {"message": "Please enter a strong password with at least 8 characters."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-                if existing_user:
-                    return Response(
-                        {"message": "User already exists."},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
+            if password != confirm_password:
+                return Response(
+                    {"message": "Password did not match"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
 
-                if not password_validation(password):
-                    return Response(
-                        {"message": "Please enter a strong password with at least 8 characters."},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
+            hashed_password = make_password(password)
 
-                if password == confirm_password:
-                    c.execute(
-                        "INSERT INTO core_user (id, email, password, is_superuser, is_staff, is_active, date_joined, created, modified) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id, email;",
-                        [
-                            id,
-                            email,
-                            hashed_password,
-                            False,
-                            False,
-                            True,
-                            date_joined,
-                            created,
-                            modified,
-                        ],
-                    )
+            with transaction.atomic(using=connection.alias), connection.cursor() as c:
+                # Insert the user and its default profile in one statement. The unique
+                # email constraint replaces a separate existence check.
+                c.execute(
+                    "WITH new_user AS (INSERT INTO core_user (id, email, password, is_superuser, is_staff, is_active, date_joined, created, modified) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s) ON CONFLICT (email) DO NOTHING RETURNING id, email), new_profile AS (INSERT INTO core_userprofile (id, user_id, gender, created, modified) SELECT %s, id, %s, %s, %s FROM new_user) SELECT id, email FROM new_user;",
+                    [
+                        id,
+                        email,
+                        hashed_password,
+                        False,
+                        False,
+                        True,
+                        now,
+                        now,
+                        now,
+                        profile_id,
+                        UserProfile.GENDER_CHOICES.male,
+                        now,
+                        now,
+                    ],
+                )
+                created_user = c.fetchone()
 
-                    created_user = c.fetchone()
-                else:
+                if not created_user:
                     return Response(
-                        {"message": "Password did not match"},
+                        {"message": "User already exists."},
                         status=status.HTTP_400_BAD_REQUEST,
                     )
 
-                if created_user:
-                    id, email = created_user
-
-                    user = User.objects.get(id=id)
-
-                    # Send signal to create user profile
-                    create_profile_handler(sender=User, instance=user, created=True)
+                id, email = created_user
+                bump_generation("core_user", "core_userprofile")
 
-                    # Generate token
-                    knox_token = AuthToken.objects.create(user)[1]
+                # Generate token without reading the user back.
+                knox_token = create_token(User(id=id, email=email), evict=False)
 
-                    return Response(
-                        {
-                            "message": "User Created",
-                            "id": id,
-                            "email": email,
-                            "token": knox_token,
-                        },
-                        status=status.HTTP_201_CREATED,
-                    )
+            return Response(
+                {
+                    "message": "User Created",
+                    "id": id,
+                    "email": email,
+                    "token": knox_token,
+                },
+                status=status.HTTP_201_CREATED,
+            )
         except json.JSONDecodeError:
             return Response(
                 {"message": "Failed to create user"},
@@ -300,6 +434,8 @@ def user_register(request: Request):
 )
 @api_view(["POST"])
 @permission_classes([permissions.AllowAny])
+@admission_control("crud")
+@statement_timeout("write")
 def login(request: Request):
     """User login with email and password."""
 
@@ -321,7 +457,7 @@ def login(request: Request):
 
                 if check_password(password, stored_password):
                     user = User.objects.get(id=id)
-                    knox_token = AuthToken.objects.create(user)[1]
+                    knox_token = create_token(user)
 
                     return Response(
                         {
@@ -357,6 +493,8 @@ def login(request: Request):
 )
 @api_view(["POST"])
 @login_required
+@admission_control("crud")
+@statement_timeout("write")
 def logout(request: Request):
     """Logout user."""
 
@@ -378,6 +516,8 @@ def logout(request: Request):
 )
 @api_view(["DELETE"])
 @permission_classes([permissions.IsAdminUser])
+@admission_control("crud")
+@statement_timeout("write")
 def delete_user(request: Request, id: str):
     """Delete inactive user."""
 
@@ -395,6 +535,7 @@ def delete_user(request: Request, id: str):
                     "DELETE FROM core_user WHERE id = %s;",
                     [id],
                 )
+                bump_generation("core_user", "core_userprofile")
 
                 return Response(
                     {
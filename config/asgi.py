@@ -11,6 +11,11 @@ import os
 
 from django.core.asgi import get_asgi_application
 
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from apps.core.events import EventStreamRouter  # noqa: E402
+
+# Catalog change events are streamed outside Django's request cycle.
+application = EventStreamRouter(django_application)
@@ -43,6 +43,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 THIRD_PARTY_APPS = [
@@ -65,22 +66,67 @@ LOCAL_APPS = [
     "apps.profiles",
     "apps.artists",
     "apps.musics",
+    "apps.albums",
+    "apps.jobs",
 ]
 
 INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
-MIDDLEWARE = [
-    "django.middleware.security.SecurityMiddleware",
-    "corsheaders.middleware.CorsMiddleware",
+# Routes served by knox token auth only; see LEAN_API_MIDDLEWARE
+API_PATH_PREFIXES = ("/users/", "/user_profiles/", "/artists/", "/musics/", "/albums/", "/jobs/", "/metrics", "/profiles/")
+
+# Middleware that only browser pages (admin, allauth) need
+BROWSER_MIDDLEWARE = [
     "django.contrib.sessions.middleware.SessionMiddleware",
-    "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
-    "allauth.account.middleware.AccountMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Skip BROWSER_MIDDLEWARE for API_PATH_PREFIXES
+LEAN_API_MIDDLEWARE = env.bool("LEAN_API_MIDDLEWARE", default=False)
+
+if LEAN_API_MIDDLEWARE:
+    MIDDLEWARE = [
+        "django.middleware.security.SecurityMiddleware",
+        "corsheaders.middleware.CorsMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "apps.core.middleware.BrowserOnlyMiddleware",
+        # allauth refuses to start without it; it only touches the session for HTML responses.
+        "allauth.account.middleware.AccountMiddleware",
+    ]
+
+    # The admin checks look for session, auth and messages middleware in MIDDLEWARE
+    # and cannot see them inside BrowserOnlyMiddleware.
+    SILENCED_SYSTEM_CHECKS = ["admin.E408", "admin.E409", "admin.E410"]
+else:
+    MIDDLEWARE = [
+        "django.middleware.security.SecurityMiddleware",
+        "corsheaders.middleware.CorsMiddleware",
+        "django.contrib.sessions.middleware.SessionMiddleware",
+        "django.middleware.common.CommonMiddleware",
+        "django.middleware.csrf.CsrfViewMiddleware",
+        "django.contrib.auth.middleware.AuthenticationMiddleware",
+        "django.contrib.messages.middleware.MessageMiddleware",
+        "allauth.account.middleware.AccountMiddleware",
+        "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    ]
+
+# Prometheus metrics at /metrics; set PROMETHEUS_MULTIPROC_DIR when running several worker processes
+METRICS_ENABLED = env.bool("METRICS_ENABLED", default=False)
+METRICS_TOKEN = env("METRICS_TOKEN", default=None)  # bearer token for scrapers; without it only staff can read them
+
+if METRICS_ENABLED:
+    MIDDLEWARE.insert(0, "apps.core.metrics.MetricsMiddleware")
+
+# Staff can profile one request with `X-Profile: cpu|memory` or `?profile=cpu|memory`
+PROFILING_ENABLED = env.bool("PROFILING_ENABLED", default=False)
+PROFILES_DIR = BASE_DIR / "profiles"
+
+if PROFILING_ENABLED:
+    MIDDLEWARE.append("apps.core.profiling.ProfilerMiddleware")
+
 ROOT_URLCONF = "config.urls"
 
 TEMPLATES = [
@@ -169,6 +215,9 @@ REST_KNOX = {
     "TOKEN_TTL": timedelta(hours=10),
     "AUTO_REFRESH": False,
 }
+AUTH_TOKEN_LIMIT_PER_USER = 10  # oldest tokens are evicted on login beyond this
+AUTH_TOKEN_PURGE_BATCH_SIZE = 5_000
+AUTH_TOKEN_PURGE_PAUSE = 0.1  # seconds between purge batches
 
 # DRF Spectacular Configuration
 SPECTACULAR_SETTINGS = {
@@ -179,6 +228,73 @@ SPECTACULAR_SETTINGS = {
     "SCHEMA_PATH_PREFIX": r"/api/",
 }
 
+# Serve api/schema/ from memory; refresh API_SCHEMA_FILE with `manage.py spectacular --file openapi-schema.yml`
+API_SCHEMA_CACHE = env.bool("API_SCHEMA_CACHE", default=False)
+API_SCHEMA_FILE = BASE_DIR / "openapi-schema.yml"
+API_SCHEMA_MAX_AGE = 60 * 60  # seconds clients may reuse the schema before revalidating
+
+# Statement timeouts in milliseconds per endpoint class; see apps.core.decorators.statement_timeout
+STATEMENT_TIMEOUTS = {
+    "read": 2_000,
+    "write": 5_000,
+    "bulk": 30_000,
+    "job": 10 * 60_000,
+}
+STATEMENT_TIMEOUT_RETRY_AFTER = 5  # seconds clients are asked to wait after a cancelled request
+
+# Concurrent requests per process and endpoint class; see apps.core.decorators.admission_control
+ADMISSION_LIMITS = {
+    "export": 2,
+    "bulk": 2,
+    "search": 8,
+    "crud": 32,
+}
+ADMISSION_QUEUE_TIMEOUT = 2.0  # seconds a request waits for a slot before it is shed
+ADMISSION_RETRY_AFTER = 5
+
+# Cache shared by all processes; point CACHE_URL at redis or memcached when running more than one process
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+RECORD_CACHE_TIMEOUT = 60  # seconds an artist or artist's music list stays cached
+SINGLE_FLIGHT_WAIT = 2.0  # seconds a request waits for another to fill a missing key
+SINGLE_FLIGHT_LOCK_TIMEOUT = 10  # seconds before an abandoned recompute lock expires
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+LIST_CACHE_FRESH = 30  # seconds a cached list page is served without a refresh
+LIST_CACHE_MAX_AGE = 10 * 60  # seconds a stale list page may still be served while it refreshes
+LIST_CACHE_REFRESH_WORKERS = 2  # background refresh threads per process
+DISCOGRAPHY_CACHE_TIMEOUT = 10 * 60  # seconds; keys also change with the generations of the tables read
+# Broadcast invalidations with Postgres LISTEN/NOTIFY; needed when each process has its own cache (locmem)
+CACHE_INVALIDATION_BUS = env.bool("CACHE_INVALIDATION_BUS", default=False)
+CACHE_INVALIDATION_CHANNEL = "cache_invalidation"
+CACHE_INVALIDATION_RECONNECT_DELAY = 1.0  # seconds between listener reconnect attempts
+
+# Background Jobs
+JOB_POLL_INTERVAL = 1.0  # seconds a worker sleeps when the queue is empty
+JOB_HEARTBEAT_INTERVAL = 30  # seconds between a running job's heartbeats
+JOB_STALE_AFTER = 300  # seconds without a heartbeat before a running job is requeued
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_DELAY = 60  # seconds before a failed job runs again, times the attempts so far
+PERIODIC_JOBS = {
+    # job kind: interval in seconds
+    "purge_tokens": 60 * 60,
+    "purge_tombstones": 24 * 60 * 60,
+}
+EXPORTS_DIR = BASE_DIR / "exports"
+
+# Change feeds (musics/changes/, artists/changes/); see apps.core.changes
+CHANGE_FEED_PAGE_SIZE = 500
+CHANGE_FEED_MAX_PAGE_SIZE = 5_000
+TOMBSTONE_RETENTION_DAYS = 30  # cursors older than this must sync again from the start
+
+# Server-sent catalog change events, served by config/asgi.py; see apps.core.events
+EVENTS_PATH = "/events/catalog/"
+EVENTS_CLIENT_BUFFER = 100  # events buffered per client before it is told to resync
+EVENTS_MAX_CLIENTS = 1_000  # streams per process
+EVENTS_HEARTBEAT = 15  # seconds between keep-alive comments on an idle stream
+EVENTS_RECONNECT_DELAY = 1.0  # seconds between listener reconnect attempts
+
+# Admin changelists above this many rows show an estimated count
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 100_000
+
 # Set Custom User as Default Auth User
 AUTH_USER_MODEL = "core.User"
 
@@ -200,6 +316,16 @@ ACCOUNT_EMAIL_CONFIRMATION_AUTHENTICATED_REDIRECT_URL = "/?verification=1"
 SITE_ID = 1
 
 # Logger Configuration
+# LOG_QUEUE writes JSON lines from a background thread instead of the request thread
+LOG_QUEUE = env.bool("LOG_QUEUE", default=False)
+LOG_QUEUE_SIZE = 10_000  # records buffered before new ones are dropped
+LOG_HANDLERS = ["queue"] if LOG_QUEUE else ["console", "file"]
+
+# Log statements slower than SLOW_QUERY_MS (0 disables) with their plan; see `manage.py slow_queries`
+SLOW_QUERY_MS = env.float("SLOW_QUERY_MS", default=0)
+SLOW_QUERY_EXPLAIN = True
+SLOW_QUERY_LOG = BASE_DIR / "logs" / "slow_queries.log"
+
 logging.config.dictConfig(
     {
         "version": 1,
@@ -211,6 +337,9 @@ logging.config.dictConfig(
             "file": {
                 "format": "%(asctime)s %(name)-12a %(levelname)-8s %(message)s",
             },
+            "json": {
+                "()": "apps.core.log.JSONFormatter",
+            },
             "django.server": DEFAULT_LOGGING["formatters"]["django.server"],
         },
         "handlers": {
@@ -224,11 +353,40 @@ logging.config.dictConfig(
                 "formatter": "file",
                 "filename": "logs/artist_management.log",
             },
+            "slow_queries": (
+                {
+                    "()": "apps.core.log.QueuedHandler",
+                    "filename": SLOW_QUERY_LOG,
+                    "maxsize": LOG_QUEUE_SIZE,
+                    "console": False,
+                }
+                if LOG_QUEUE
+                else {
+                    "class": "logging.FileHandler",
+                    "formatter": "json",
+                    "filename": SLOW_QUERY_LOG,
+                    "delay": True,
+                }
+            ),
             "django.server": DEFAULT_LOGGING["handlers"]["django.server"],
+            # The queue handler starts a listener thread, so it is only configured when used.
+            **(
+                {
+                    "queue": {
+                        "level": "INFO",
+                        "()": "apps.core.log.QueuedHandler",
+                        "filename": "logs/artist_management.log",
+                        "maxsize": LOG_QUEUE_SIZE,
+                    },
+                }
+                if LOG_QUEUE
+                else {}
+            ),
         },
         "loggers": {
-            "": {"level": "INFO", "handlers": ["console", "file"], "propagate": False},
-            "apps": {"level": "INFO", "handlers": ["console"], "propagate": False},
+            "": {"level": "INFO", "handlers": LOG_HANDLERS, "propagate": False},
+            "apps": {"level": "INFO", "handlers": ["queue"] if LOG_QUEUE else ["console"], "propagate": False},
+            "apps.core.slow_queries": {"level": "WARNING", "handlers": ["slow_queries"], "propagate": False},
             "django.server": DEFAULT_LOGGING["loggers"]["django.server"],
         },
     }
@@ -18,11 +18,14 @@ Including another URLconf
 from django.conf import settings
 from django.contrib import admin
 from django.urls import include, path
-from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
+from drf_spectacular.views import SpectacularSwaggerView
+
+from apps.core.views import CachedSpectacularAPIView, download_profile, metrics
 
 urlpatterns = [
     path("admin/", admin.site.urls),
-    path("api/schema/", SpectacularAPIView.as_view(), name="api_schema"),
+    path("profiles/<str:name>", download_profile, name="download_profile"),
+    path("api/schema/", CachedSpectacularAPIView.as_view(), name="api_schema"),
     path(
         "api/docs/",
         SpectacularSwaggerView.as_view(url_name="api_schema"),
@@ -32,8 +35,13 @@ urlpatterns = [
     path("user_profiles/", include("apps.profiles.urls")),
     path("artists/", include("apps.artists.urls")),
     path("musics/", include("apps.musics.urls")),
+    path("albums/", include("apps.albums.urls")),
+    path("jobs/", include("apps.jobs.urls")),
 ]
 
+if settings.METRICS_ENABLED:
+    urlpatterns.append(path("metrics", metrics, name="metrics"))
+
 if settings.DEBUG and ("debug_toolbar" in settings.INSTALLED_APPS):
     import debug_toolbar
 